@@ -7,187 +7,96 @@ Generates a comprehensive report every Sunday with:
 - Completed tasks
 - Pending approvals
 - Issues summary
+Data comes from a single vault_scanner snapshot; this module only renders it.
 """
 
-import os
 import sys
 import datetime
-import re
 from pathlib import Path
 
+from briefing_history import BriefingHistoryStore
+from vault_scanner import briefing_window, render_output, scan_vault
 
-def read_done_folder():
-    """Read all files in the Done folder and extract relevant information"""
-    done_path = Path("AI_Employee_Vault/Done")
-    if not done_path.exists():
-        return []
-
-    completed_tasks = []
-    for file_path in done_path.iterdir():
-        if file_path.is_file():
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    completed_tasks.append({
-                        'filename': file_path.name,
-                        'content': content[:500],  # First 500 chars for summary
-                        'size': file_path.stat().st_size,
-                        'modified': datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                    })
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-
-    return completed_tasks
-
-
-def read_accounting_data():
-    """Read accounting data to extract revenue information"""
-    # Look for accounting files in various locations
-    accounting_paths = [
-        Path("AI_Employee_Vault/Accounting"),
-        Path("AI_Employee_Vault/Finance"),
-        Path("AI_Employee_Vault/Revenue"),
-        Path("AI_Employee_Vault/logs/business.log")
-    ]
-
-    revenue_data = {
-        'total_revenue': 0,
-        'revenue_sources': [],
-        'expenses': [],
-        'net_profit': 0,
-        'transaction_count': 0
-    }
-
-    # Check business log for financial transactions
-    business_log = Path("AI_Employee_Vault/logs/business.log")
-    if business_log.exists():
-        try:
-            with open(business_log, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Look for revenue-related patterns (these are examples - adjust based on actual data format)
-                revenue_matches = re.findall(r'\$(\d+\.?\d*)', content)  # Find dollar amounts
-                for match in revenue_matches:
-                    revenue_data['total_revenue'] += float(match)
-
-                # Look for specific transaction types
-                revenue_sources = re.findall(r'(Payment|Revenue|Sale|Invoice) .* \$(\d+\.?\d*)', content)
-                revenue_data['revenue_sources'] = revenue_sources
-                revenue_data['transaction_count'] = len(revenue_matches)
-        except Exception as e:
-            print(f"Error reading business log: {e}")
-
-    # Look for other accounting files
-    for path in accounting_paths:
-        if path.exists():
-            for file_path in path.iterdir():
-                if file_path.is_file() and file_path.suffix in ['.csv', '.txt', '.json', '.md']:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            # Extract financial data based on common patterns
-                            numbers = re.findall(r'\$(\d+\.?\d*)', content)
-                            for num in numbers:
-                                revenue_data['total_revenue'] += float(num)
-                    except Exception as e:
-                        print(f"Error reading {file_path}: {e}")
-
-    return revenue_data
-
-
-def read_pending_approvals():
-    """Read pending approvals from the Need_Approval folder"""
-    approval_path = Path("AI_Employee_Vault/Need_Approval")
-    if not approval_path.exists():
-        return []
-
-    pending_approvals = []
-    for file_path in approval_path.iterdir():
-        if file_path.is_file():
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    pending_approvals.append({
-                        'filename': file_path.name,
-                        'content': content[:300],  # First 300 chars for summary
-                        'size': file_path.stat().st_size,
-                        'modified': datetime.datetime.fromtimestamp(file_path.stat().st_mtime)
-                    })
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-
-    return pending_approvals
-
-
-def read_issues():
-    """Read issues from error logs and other sources"""
-    issues = []
-
-    # Check error logs
-    error_log = Path("logs/errors.log")
-    if error_log.exists():
-        try:
-            with open(error_log, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Extract recent errors (last 10)
-                lines = content.split('\n')
-                recent_errors = lines[-10:] if len(lines) > 10 else lines
-                for line in recent_errors:
-                    if line.strip() and 'ERROR' in line.upper():
-                        issues.append(f"Error: {line.strip()}")
-        except Exception as e:
-            print(f"Error reading error log: {e}")
-
-    # Check system health logs
-    health_log = Path("AI_Employee_Vault/logs/system_health.md")
-    if health_log.exists():
-        try:
-            with open(health_log, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Look for issues in recent entries
-                if "❌" in content or "error" in content.lower() or "failed" in content.lower():
-                    # Just count recent issues
-                    issues.append("System health issues detected in recent monitoring")
-        except Exception as e:
-            print(f"Error reading health log: {e}")
-
-    return issues
-
-
-def generate_ceo_briefing():
-    """Generate the automated weekly CEO briefing"""
-    # Get current date for filename
-    current_date = datetime.date.today()
-    filename = f"{current_date.strftime('%Y-%m-%d')}_CEO_Briefing.md"
-    output_path = Path("AI_Employee_Vault/Briefings") / filename
 
-    # Gather data
-    print("Gathering data for CEO briefing...")
-    completed_tasks = read_done_folder()
-    revenue_data = read_accounting_data()
-    pending_approvals = read_pending_approvals()
-    issues = read_issues()
+# Series name for this generator's rows in the briefing history store
+HISTORY_SOURCE = "automated_briefing"
+OUTPUT_FORMATS = ("md", "json", "html")
+
+
+def money(cents):
+    return f"${cents / 100:,.2f}"
+
+
+def record_history(snapshot, source=HISTORY_SOURCE):
+    """Store this week's headline metrics under `source` and return the history store (None on failure)"""
+    try:
+        history = BriefingHistoryStore()
+        history.record(
+            source, snapshot.window_end,
+            tasks_completed=len(snapshot.tasks),
+            approvals_pending=len(snapshot.approvals),
+            revenue_cents=snapshot.financials.revenue_cents,
+            issues=snapshot.issues.count,
+            social_posts=snapshot.communications.social_posts,
+            emails_sent=snapshot.communications.emails_sent
+        )
+        return history
+    except Exception as e:
+        print(f"Error updating briefing history: {e}")
+        return None
+
+
+def render_markdown(snapshot, trend_lines=None):
+    """Render the briefing for a VaultSnapshot as Markdown"""
+    current_date = snapshot.window_end.date()
+    window_start, window_end = snapshot.window_start, snapshot.window_end
+    completed_tasks = snapshot.tasks
+    pending_approvals = snapshot.approvals
+    financials = snapshot.financials
+    communications = snapshot.communications
+    issues = snapshot.issues
 
     # Generate report content
     report_lines = []
     report_lines.append(f"# Weekly CEO Briefing - {current_date.strftime('%B %d, %Y')}")
     report_lines.append("")
     report_lines.append(f"*Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+    report_lines.append(f"*Covering: {window_start.strftime('%Y-%m-%d')} to {window_end.strftime('%Y-%m-%d')}*")
     report_lines.append("=" * 60)
     report_lines.append("")
 
+    if snapshot.warnings:
+        report_lines.append("## Collection Warnings")
+        report_lines.append("-" * 20)
+        report_lines.append("*This briefing is partial; the following sources could not be read:*")
+        for warning in snapshot.warnings:
+            report_lines.append(f"- {warning}")
+        report_lines.append("")
+
     # Revenue section
     report_lines.append("## Revenue Summary")
     report_lines.append("-" * 20)
-    report_lines.append(f"**Total Revenue**: ${revenue_data['total_revenue']:,.2f}")
-    report_lines.append(f"**Transaction Count**: {revenue_data['transaction_count']}")
+    report_lines.append(f"**Total Revenue**: {money(financials.revenue_cents)}")
+    report_lines.append(f"**Transaction Count**: {financials.transaction_count}")
+    if financials.expense_sources:
+        report_lines.append(f"**Total Expenses**: {money(financials.expense_cents)}")
+        report_lines.append(f"**Net Profit**: {money(financials.net_cents)}")
 
-    if revenue_data['revenue_sources']:
+    if financials.revenue_sources:
         report_lines.append("**Revenue Sources**:")
-        for source, amount in revenue_data['revenue_sources'][:5]:  # Show top 5
-            report_lines.append(f"  - {source}: ${amount}")
+        for source, cents in financials.revenue_sources[:5]:  # Show top 5
+            report_lines.append(f"  - {source}: {money(cents)}")
     else:
         report_lines.append("*No detailed revenue sources available*")
 
+    if financials.expense_sources:
+        report_lines.append("**Top Expenses**:")
+        for source, cents in financials.expense_sources[:5]:
+            report_lines.append(f"  - {source}: {money(cents)}")
+
+    if financials.data_source:
+        report_lines.append(f"*Source: {financials.data_source}*")
+
     report_lines.append("")
 
     # Completed Tasks section
@@ -197,11 +106,11 @@ def generate_ceo_briefing():
         report_lines.append(f"**Total Completed**: {len(completed_tasks)}")
         report_lines.append("")
         for i, task in enumerate(completed_tasks[:10]):  # Show top 10
-            report_lines.append(f"### {task['filename']}")
+            report_lines.append(f"### {task.filename}")
             # Show a snippet of the content if available
-            if task['content'].strip():
+            if task.summary.strip():
                 # Extract key information from content
-                lines = task['content'][:200].split('\n')
+                lines = task.summary[:200].split('\n')
                 for line in lines:
                     if line.strip() and not line.startswith('#'):
                         report_lines.append(f"  - {line.strip()}")
@@ -217,10 +126,10 @@ def generate_ceo_briefing():
         report_lines.append(f"**Total Pending**: {len(pending_approvals)}")
         report_lines.append("")
         for i, approval in enumerate(pending_approvals):
-            report_lines.append(f"### {approval['filename']}")
+            report_lines.append(f"### {approval.filename}")
             # Show a snippet of the content
-            if approval['content'].strip():
-                lines = approval['content'][:200].split('\n')
+            if approval.summary.strip():
+                lines = approval.summary[:200].split('\n')
                 for line in lines:
                     if line.strip() and not line.startswith('#'):
                         report_lines.append(f"  - {line.strip()}")
@@ -232,10 +141,10 @@ def generate_ceo_briefing():
     # Issues section
     report_lines.append("## Issues Summary")
     report_lines.append("-" * 20)
-    if issues:
-        report_lines.append(f"**Total Issues Detected**: {len(issues)}")
+    if issues.lines:
+        report_lines.append(f"**Total Issues Detected**: {issues.count}")
         report_lines.append("")
-        for issue in issues:
+        for issue in issues.lines:
             report_lines.append(f"- {issue}")
     else:
         report_lines.append("*No issues detected this week*")
@@ -246,15 +155,51 @@ def generate_ceo_briefing():
     report_lines.append("-" * 20)
     report_lines.append(f"- **Tasks Completed**: {len(completed_tasks)}")
     report_lines.append(f"- **Pending Approvals**: {len(pending_approvals)}")
-    report_lines.append(f"- **Revenue**: ${revenue_data['total_revenue']:,.2f}")
-    report_lines.append(f"- **Issues Found**: {len(issues)}")
+    report_lines.append(f"- **Revenue**: {money(financials.revenue_cents)}")
+    report_lines.append(f"- **Issues Found**: {issues.count}")
+    report_lines.append(f"- **Emails Sent**: {communications.emails_sent}")
+    report_lines.append(f"- **Social Posts**: {communications.social_posts}")
+    report_lines.append("- **Data Collection**: " + ", ".join(
+        f"{name} {seconds:.2f}s" for name, seconds in sorted(snapshot.timings.items())))
     report_lines.append(f"- **Report Generated**: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     report_lines.append("")
 
+    if trend_lines:
+        report_lines.append("## Trends")
+        report_lines.append("-" * 20)
+        report_lines.extend(trend_lines)
+        report_lines.append("")
+
+    return '\n'.join(report_lines)
+
+
+def generate_ceo_briefing(output_format="md"):
+    """Generate the automated weekly CEO briefing in the given format (md, json or html)"""
+    current_date = datetime.date.today()
+    filename = f"{current_date.strftime('%Y-%m-%d')}_CEO_Briefing.{output_format}"
+    output_path = Path("AI_Employee_Vault/Briefings") / filename
+
+    # Gather data
+    print("Gathering data for CEO briefing...")
+    snapshot = scan_vault(*briefing_window())
+    for name, seconds in sorted(snapshot.timings.items()):
+        print(f"  {name}: {seconds:.2f}s")
+
+    # Trends: persist this week's metrics, then read the series back from the store
+    history = record_history(snapshot)
+    trend_lines = history.render_trends(HISTORY_SOURCE, snapshot.window_end) if history else None
+    trend_series = history.series(HISTORY_SOURCE, snapshot.window_end) if history else []
+
+    content = render_output(
+        render_markdown(snapshot, trend_lines), snapshot, output_format,
+        title=f"Weekly CEO Briefing - {current_date.strftime('%B %d, %Y')}",
+        extra={'trends': trend_series}
+    )
+
     # Write the report
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report_lines))
+        f.write(content)
 
     print(f"Weekly CEO Briefing generated: {output_path}")
     return str(output_path)
@@ -262,8 +207,14 @@ def generate_ceo_briefing():
 
 def main():
     """Main function to run the briefing generator"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the weekly CEO briefing')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='md', help='Output format')
+    args = parser.parse_args()
+
     try:
-        output_file = generate_ceo_briefing()
+        output_file = generate_ceo_briefing(args.format)
         print(f"Successfully generated CEO briefing: {output_file}")
     except Exception as e:
         print(f"Error generating CEO briefing: {e}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+"""
+Briefing History Store for AI Employee System
+Persists one row of headline metrics per briefing source and week in SQLite,
+so briefings can render week-over-week and 12-week trends without
+re-scanning the vault.
+"""
+
+import time
+import sqlite3
+import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+
+DEFAULT_DB_PATH = Path("AI_Employee_Vault/.briefing_history.db")
+TREND_WEEKS = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weekly_metrics (
+    source TEXT NOT NULL,
+    week TEXT NOT NULL,
+    tasks_completed INTEGER,
+    approvals_pending INTEGER,
+    revenue_cents INTEGER,
+    issues INTEGER,
+    social_posts INTEGER,
+    emails_sent INTEGER,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (source, week)
+);
+"""
+
+# (column, label, formatter)
+METRICS = (
+    ("tasks_completed", "Tasks Completed", lambda v: f"{v:,}"),
+    ("approvals_pending", "Pending Approvals", lambda v: f"{v:,}"),
+    ("revenue_cents", "Revenue", lambda v: f"${v / 100:,.2f}"),
+    ("issues", "Issues", lambda v: f"{v:,}"),
+    ("social_posts", "Social Posts", lambda v: f"{v:,}"),
+    ("emails_sent", "Emails Sent", lambda v: f"{v:,}"),
+)
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def week_start(day):
+    """Monday of the ISO week containing a date or datetime"""
+    if isinstance(day, datetime.datetime):
+        day = day.date()
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def sparkline(values):
+    """Render a sequence of numbers as a unicode sparkline; None becomes a gap"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return ""
+    low, high = min(present), max(present)
+    span = high - low
+    chars = []
+    for value in values:
+        if value is None:
+            chars.append(" ")
+        elif span == 0:
+            chars.append(SPARK_CHARS[len(SPARK_CHARS) // 2])
+        else:
+            chars.append(SPARK_CHARS[round((value - low) / span * (len(SPARK_CHARS) - 1))])
+    return "".join(chars)
+
+
+def format_change(current, previous):
+    """Week-over-week change as an absolute delta and percentage"""
+    if current is None or previous is None:
+        return "—"
+    delta = current - previous
+    if previous == 0:
+        return "new" if delta else "0"
+    sign = "+" if delta >= 0 else ""
+    return f"{sign}{delta / abs(previous) * 100:.0f}%"
+
+
+class BriefingHistoryStore:
+    """
+    Weekly metrics per briefing source. Re-running a briefing within the same
+    week replaces that week's row; metrics a source does not track are NULL.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before a metric was added lack its column
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(weekly_metrics)")}
+            for column, _, _ in METRICS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE weekly_metrics ADD COLUMN {column} INTEGER")
+
+    @contextmanager
+    def connect(self):
+        """Open a connection; commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record(self, source, week, **metrics):
+        """Store (or replace) the metrics for a source's week"""
+        columns = [column for column, _, _ in METRICS]
+        values = [metrics.get(column) for column in columns]
+        with self.connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO weekly_metrics (source, week, {', '.join(columns)}, recorded_at)"
+                f" VALUES (?, ?, {', '.join('?' for _ in columns)}, ?)",
+                [source, week_start(week).isoformat(), *values, time.time()]
+            )
+
+    def series(self, source, until_week, weeks=TREND_WEEKS):
+        """
+        Metrics for the `weeks` weeks ending at `until_week`, oldest first.
+        Weeks with no recorded briefing are returned with every metric None.
+        """
+        last = week_start(until_week)
+        first = last - datetime.timedelta(weeks=weeks - 1)
+        with self.connect() as conn:
+            rows = {
+                row["week"]: dict(row)
+                for row in conn.execute(
+                    "SELECT * FROM weekly_metrics WHERE source = ? AND week >= ? AND week <= ?",
+                    (source, first.isoformat(), last.isoformat())
+                )
+            }
+
+        result = []
+        for offset in range(weeks):
+            week = (first + datetime.timedelta(weeks=offset)).isoformat()
+            row = rows.get(week, {})
+            result.append({"week": week, **{column: row.get(column) for column, _, _ in METRICS}})
+        return result
+
+    def render_trends(self, source, until_week, weeks=TREND_WEEKS):
+        """Markdown lines with week-over-week and multi-week trend tables"""
+        series = self.series(source, until_week, weeks)
+        current, previous = series[-1], series[-2] if len(series) > 1 else {}
+        tracked = [
+            (column, label, fmt) for column, label, fmt in METRICS
+            if any(week[column] is not None for week in series)
+        ]
+
+        lines = ["### Week over Week", "", "| Metric | This Week | Last Week | Change |", "|---|---|---|---|"]
+        for column, label, fmt in tracked:
+            this_week, last_week = current.get(column), previous.get(column)
+            lines.append(
+                f"| {label} | {fmt(this_week) if this_week is not None else '—'} "
+                f"| {fmt(last_week) if last_week is not None else '—'} | {format_change(this_week, last_week)} |"
+            )
+
+        lines += ["", f"### {weeks}-Week Trend", "", "| Metric | Trend | Low | High |", "|---|---|---|---|"]
+        for column, label, fmt in tracked:
+            values = [week[column] for week in series]
+            present = [v for v in values if v is not None]
+            lines.append(f"| {label} | `{sparkline(values)}` | {fmt(min(present))} | {fmt(max(present))} |")
+
+        lines += ["", "| Week | " + " | ".join(label for _, label, _ in tracked) + " |",
+                  "|---|" + "---|" * len(tracked)]
+        for week in series:
+            if all(week[column] is None for column, _, _ in tracked):
+                continue
+            cells = [fmt(week[column]) if week[column] is not None else "—" for column, _, fmt in tracked]
+            lines.append(f"| {week['week']} | " + " | ".join(cells) + " |")
+        return lines
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show briefing metric trends')
+    parser.add_argument('--db', default=str(DEFAULT_DB_PATH), help='Path to the briefing history database')
+    parser.add_argument('--source', default='automated_briefing', help='Briefing source to show')
+    parser.add_argument('--weeks', type=int, default=TREND_WEEKS, help='Number of weeks to show')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"No briefing history found at {args.db}")
+        return
+
+    store = BriefingHistoryStore(args.db)
+    print("\n".join(store.render_trends(args.source, datetime.date.today(), args.weeks)))
+
+
+if __name__ == "__main__":
+    main()
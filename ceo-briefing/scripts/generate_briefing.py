@@ -1,53 +1,46 @@
 import os
-import datetime
+import sys
 
-def generate_ceo_briefing():
+# Shared modules live at the project root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from automated_briefing import record_history
+from vault_scanner import briefing_window, render_output, scan_vault
+
+# Series name for this generator's rows in the briefing history store
+HISTORY_SOURCE = "ceo_weekly"
+
+def money(cents):
+    return f"${cents / 100:,.2f}"
+
+def render_markdown(snapshot, trend_lines=None):
     """
-    Generates a weekly CEO briefing report.
+    Renders the CEO weekly briefing for a vault snapshot as Markdown.
     """
-    report_path = os.path.join("AI_Employee_Vault", "Reports", "CEO_Weekly.md")
-    
-    # --- Gather Data ---
-    
-    # 1. Tasks Completed
-    tasks_completed = []
-    done_tasks_dir = os.path.join("Bronze", "Done")
-    if os.path.exists(done_tasks_dir):
-        tasks_completed = [f for f in os.listdir(done_tasks_dir) if f.endswith(".md")]
-
-    # 2. Emails Sent and LinkedIn Posts (from business.log)
-    emails_sent = []
-    linkedin_posts = []
-    business_log_path = os.path.join("AI_Employee_Vault", "logs", "business.log")
-    if os.path.exists(business_log_path):
-        with open(business_log_path, "r") as f:
-            for line in f:
-                if "--- EMAIL SENT ---" in line:
-                    emails_sent.append(line.strip()) # Capture the full log entry for email
-                elif "--- LINKEDIN POST ---" in line:
-                    linkedin_posts.append(line.strip()) # Capture the full log entry for linkedin
-
-    # 3. Pending Approvals
-    pending_approvals = []
-    need_approval_dir = os.path.join("AI_Employee_Vault", "Need_Approval")
-    if os.path.exists(need_approval_dir):
-        pending_approvals = os.listdir(need_approval_dir)
-
-    # --- Generate Report Content ---
-    
+    communications = snapshot.communications
+    emails_sent = [line for _, kind, line in communications.entries if kind == "email"]
+    social_posts = [line for _, kind, line in communications.entries if kind == "social"]
+    financials = snapshot.financials
+
     report_content = []
-    report_content.append(f"# CEO Weekly Briefing - {datetime.date.today().strftime('%Y-%m-%d')}\n")
-    
+    report_content.append(f"# CEO Weekly Briefing - {snapshot.window_end.strftime('%Y-%m-%d')}\n")
+
+    if snapshot.warnings:
+        report_content.append("> Partial report; these sources could not be read:\n")
+        for warning in snapshot.warnings:
+            report_content.append(f"> - {warning}\n")
+        report_content.append("\n")
+
     report_content.append("## 1. Tasks Completed\n")
-    if tasks_completed:
-        for task in tasks_completed:
-            report_content.append(f"- {task}\n")
+    if snapshot.tasks:
+        for task in snapshot.tasks:
+            report_content.append(f"- {task.filename}\n")
     else:
         report_content.append("- No tasks completed this week.\n")
     report_content.append("\n")
 
     report_content.append("## 2. Communications\n")
-    report_content.append("### Emails Sent\n")
+    report_content.append(f"### Emails Sent ({communications.emails_sent})\n")
     if emails_sent:
         for email in emails_sent:
             report_content.append(f"- {email}\n")
@@ -55,33 +48,79 @@ def generate_ceo_briefing():
         report_content.append("- No emails sent this week.\n")
     report_content.append("\n")
 
-    report_content.append("### LinkedIn Posts\n")
-    if linkedin_posts:
-        for post in linkedin_posts:
+    report_content.append(f"### Social Posts ({communications.social_posts})\n")
+    if social_posts:
+        for post in social_posts:
             report_content.append(f"- {post}\n")
     else:
-        report_content.append("- No LinkedIn posts made this week.\n")
+        report_content.append("- No social posts made this week.\n")
     report_content.append("\n")
 
     report_content.append("## 3. Pending Approvals\n")
-    if pending_approvals:
-        for approval in pending_approvals:
-            report_content.append(f"- {approval}\n")
+    if snapshot.approvals:
+        for approval in snapshot.approvals:
+            report_content.append(f"- {approval.filename}\n")
     else:
         report_content.append("- No pending approvals.\n")
     report_content.append("\n")
 
     report_content.append("## 4. Income/Expense Summary\n")
-    report_content.append("- *Placeholder: Financial data integration needed.*\n\n")
+    report_content.append(f"- Revenue: {money(financials.revenue_cents)}\n")
+    report_content.append(f"- Expenses: {money(financials.expense_cents)}\n")
+    report_content.append(f"- Net: {money(financials.net_cents)}\n")
+    for source, cents in financials.revenue_sources[:5]:
+        report_content.append(f"  - {source}: {money(cents)}\n")
+    if financials.data_source:
+        report_content.append(f"- *Source: {financials.data_source}*\n")
+    report_content.append("\n")
 
     report_content.append("## 5. System Health\n")
-    report_content.append("- *Placeholder: System health monitoring integration needed.*\n\n")
+    if snapshot.issues.lines:
+        for issue in snapshot.issues.lines:
+            report_content.append(f"- {issue}\n")
+    else:
+        report_content.append("- No issues detected this week.\n")
+    report_content.append("\n")
+
+    if trend_lines:
+        report_content.append("## 6. Trends\n\n")
+        for line in trend_lines:
+            report_content.append(f"{line}\n")
+        report_content.append("\n")
+
+    return "".join(report_content)
+
+def generate_ceo_briefing(output_format="md"):
+    """
+    Generates a weekly CEO briefing report in the given format (md, json or html).
+    """
+    report_path = os.path.join("AI_Employee_Vault", "Reports", f"CEO_Weekly.{output_format}")
+
+    # --- Gather Data ---
+    snapshot = scan_vault(*briefing_window())
+
+    # Persist this week's metrics and read the trend back from the store
+    history = record_history(snapshot, HISTORY_SOURCE)
+    trend_lines = history.render_trends(HISTORY_SOURCE, snapshot.window_end) if history else None
+    trend_series = history.series(HISTORY_SOURCE, snapshot.window_end) if history else []
 
     # --- Write Report ---
-    with open(report_path, "w") as f:
-        f.writelines(report_content)
-    
+    content = render_output(
+        render_markdown(snapshot, trend_lines), snapshot, output_format,
+        title=f"CEO Weekly Briefing - {snapshot.window_end.strftime('%Y-%m-%d')}",
+        extra={"trends": trend_series}
+    )
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
     print(f"CEO Weekly Briefing generated at: {report_path}")
 
 if __name__ == "__main__":
-    generate_ceo_briefing()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the CEO weekly briefing")
+    parser.add_argument("--format", choices=("md", "json", "html"), default="md", help="Output format")
+    args = parser.parse_args()
+
+    generate_ceo_briefing(args.format)
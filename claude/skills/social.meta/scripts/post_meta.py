@@ -1,46 +1,54 @@
 import os
+import sys
 import argparse
 import datetime
 import requests
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from social_scheduler import SocialScheduler, RateLimited, retry_after_seconds
+
+
 def log_social(platform, content, status):
     log_path = os.path.join("logs", "social", "log")
     os.makedirs(os.path.dirname(log_path), exist_ok=True)
     timestamp = datetime.datetime.now().isoformat()
     with open(log_path, "a") as f:
-        f.write(f"[{timestamp}] Platform: {platform}, Status: {status}, Content: {content}
-")
+        f.write(f"[{timestamp}] Platform: {platform}, Status: {status}, Content: {content}\n")
 
 def post_facebook(content):
+    """Returns a Success/Error message; raises RateLimited if Facebook answers 429."""
     page_id = os.getenv("FACEBOOK_PAGE_ID")
     access_token = os.getenv("FACEBOOK_PAGE_ACCESS_TOKEN")
-    
+
     if not all([page_id, access_token]):
-        print("Error: FACEBOOK_PAGE_ID and FACEBOOK_PAGE_ACCESS_TOKEN must be set.")
-        return
+        return "Error: FACEBOOK_PAGE_ID and FACEBOOK_PAGE_ACCESS_TOKEN must be set."
 
     url = f"https://graph.facebook.com/v18.0/{page_id}/feed"
     payload = {"message": content, "access_token": access_token}
-    
+
     try:
         response = requests.post(url, data=payload)
-        if response.status_code == 200:
-            log_social("Facebook", content, "Success")
-            print("Success: Facebook post created.")
-        else:
-            log_social("Facebook", content, f"Error: {response.text}")
-            print(f"Error: Failed to post to Facebook. Status code: {response.status_code}, Response: {response.text}")
     except Exception as e:
         log_social("Facebook", content, f"Exception: {str(e)}")
-        print(f"Error: Failed to post to Facebook. {e}")
+        return f"Error: Failed to post to Facebook. {e}"
+
+    if response.status_code == 200:
+        log_social("Facebook", content, "Success")
+        return "Success: Facebook post created."
+    log_social("Facebook", content, f"Error: {response.text}")
+    if response.status_code == 429:
+        raise RateLimited(retry_after_seconds(response), f"Facebook rate limit: {response.text}")
+    return f"Error: Failed to post to Facebook. Status code: {response.status_code}, Response: {response.text}"
 
 def post_instagram(content, image_url):
+    """Returns a Success/Error message; raises RateLimited if Instagram answers 429."""
     account_id = os.getenv("INSTAGRAM_ACCOUNT_ID")
     access_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
-    
+
     if not all([account_id, access_token, image_url]):
-        print("Error: INSTAGRAM_ACCOUNT_ID, INSTAGRAM_ACCESS_TOKEN, and image_url must be set.")
-        return
+        return "Error: INSTAGRAM_ACCOUNT_ID, INSTAGRAM_ACCESS_TOKEN, and image_url must be set."
 
     # 1. Create Media Container
     media_url = f"https://graph.facebook.com/v18.0/{account_id}/media"
@@ -49,12 +57,14 @@ def post_instagram(content, image_url):
         "caption": content,
         "access_token": access_token
     }
-    
+
     try:
         res = requests.post(media_url, data=payload)
+        if res.status_code == 429:
+            raise RateLimited(retry_after_seconds(res), f"Instagram rate limit: {res.text}")
         res.raise_for_status()
         container_id = res.json().get("id")
-        
+
         # 2. Publish Media
         publish_url = f"https://graph.facebook.com/v18.0/{account_id}/media_publish"
         publish_payload = {
@@ -62,27 +72,57 @@ def post_instagram(content, image_url):
             "access_token": access_token
         }
         res_publish = requests.post(publish_url, data=publish_payload)
-        if res_publish.status_code == 200:
-            log_social("Instagram", content, "Success")
-            print("Success: Instagram post created.")
-        else:
-            log_social("Instagram", content, f"Error Publish: {res_publish.text}")
-            print(f"Error: Failed to publish to Instagram. Status code: {res_publish.status_code}, Response: {res_publish.text}")
+    except RateLimited:
+        log_social("Instagram", content, "Rate limited")
+        raise
     except Exception as e:
         log_social("Instagram", content, f"Exception: {str(e)}")
-        print(f"Error: Failed to post to Instagram. {e}")
+        return f"Error: Failed to post to Instagram. {e}"
+
+    if res_publish.status_code == 200:
+        log_social("Instagram", content, "Success")
+        return "Success: Instagram post created."
+    log_social("Instagram", content, f"Error Publish: {res_publish.text}")
+    if res_publish.status_code == 429:
+        raise RateLimited(retry_after_seconds(res_publish), f"Instagram rate limit: {res_publish.text}")
+    return f"Error: Failed to publish to Instagram. Status code: {res_publish.status_code}, Response: {res_publish.text}"
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Post to Meta platforms (Facebook/Instagram).")
     parser.add_argument("--platform", required=True, choices=["facebook", "instagram"], help="Target platform.")
     parser.add_argument("--content", required=True, help="Post content/caption.")
     parser.add_argument("--image_url", help="Image URL for Instagram.")
+    parser.add_argument("--schedule_at", help="Queue the post for this time (ISO format) instead of posting now.")
+    parser.add_argument("--priority", type=int, default=0, help="Priority of a scheduled post (higher goes first).")
+    parser.add_argument("--max_wait", type=float, default=60, help="Longest wait for the rate limit before the post is queued instead.")
     args = parser.parse_args()
 
-    if args.platform == "facebook":
-        post_facebook(args.content)
-    elif args.platform == "instagram":
-        if not args.image_url:
-            print("Error: --image_url is required for Instagram posts.")
+    if args.platform == "instagram" and not args.image_url:
+        print("Error: --image_url is required for Instagram posts.")
+        sys.exit(1)
+
+    scheduler = SocialScheduler()
+    extra = {"image_url": args.image_url} if args.image_url else {}
+
+    if args.schedule_at:
+        at = datetime.datetime.fromisoformat(args.schedule_at)
+        post_id = scheduler.schedule(args.platform, args.content, at=at, priority=args.priority, **extra)
+        print(f"Success: {args.platform} post scheduled for {at.isoformat()} (ID {post_id}).")
+        sys.exit(0)
+
+    try:
+        scheduler.acquire(args.platform, max_wait=args.max_wait)
+    except RateLimited as e:
+        post_id = scheduler.schedule(args.platform, args.content, priority=args.priority, **extra)
+        print(f"Success: {args.platform} rate limit reached; post queued (ID {post_id}), "
+              f"due in about {e.retry_after:.0f}s.")
+        sys.exit(0)
+
+    try:
+        if args.platform == "facebook":
+            print(post_facebook(args.content))
         else:
-            post_instagram(args.content, args.image_url)
+            print(post_instagram(args.content, args.image_url))
+    except RateLimited as e:
+        scheduler.penalize(args.platform, retry_after=e.retry_after)
+        print(f"Error: {e}")
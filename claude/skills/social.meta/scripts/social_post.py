@@ -5,6 +5,11 @@ import datetime
 import logging
 import requests
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from social_scheduler import SocialScheduler, RateLimited
+
 
 def setup_logging():
     """Setup logging for the social media post skill."""
@@ -134,9 +139,18 @@ def main():
     parser.add_argument("--platform", choices=["facebook", "instagram"], required=True,
                         help="Platform to post to (facebook or instagram)")
     parser.add_argument("--content", required=True, help="The content to post")
+    parser.add_argument("--max-wait", type=float, default=60,
+                        help="Longest wait in seconds for the platform rate limit")
 
     args = parser.parse_args()
 
+    try:
+        SocialScheduler().acquire(args.platform, max_wait=args.max_wait)
+    except RateLimited as e:
+        print(f"Error: {args.platform} rate limit reached. Retry in {e.retry_after:.0f}s "
+              f"or schedule the post with scripts/social_scheduler.py.")
+        sys.exit(1)
+
     if args.platform == "facebook":
         result = post_facebook(args.content)
     elif args.platform == "instagram":
@@ -10,7 +10,170 @@ import time
 import datetime
 import json
 import fcntl
+import threading
 from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class DashboardMetrics:
+    """
+    Lock and write instrumentation for the dashboard.
+    Measurements are accumulated in-process and merged into a shared JSON
+    file (under flock) so every writer process contributes to one view.
+    """
+
+    SECONDS_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+    BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+    COUNTERS = (
+        "lock_attempts_total",
+        "lock_acquired_total",
+        "lock_failures_total",
+        "updates_total",
+        "update_errors_total",
+        "bytes_written_total",
+    )
+    HISTOGRAMS = {
+        "lock_wait_seconds": SECONDS_BUCKETS,
+        "lock_hold_seconds": SECONDS_BUCKETS,
+        "update_duration_seconds": SECONDS_BUCKETS,
+        "write_bytes": BYTES_BUCKETS,
+    }
+    MAX_RECENT_CLAIMS = 50
+
+    def __init__(self, metrics_path):
+        self.metrics_path = Path(metrics_path)
+        self._lock = threading.Lock()
+        self._pending = self._empty()
+
+    @classmethod
+    def _empty(cls):
+        return {
+            "counters": {name: 0 for name in cls.COUNTERS},
+            "histograms": {
+                name: {"buckets": list(buckets), "counts": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+                for name, buckets in cls.HISTOGRAMS.items()
+            },
+            "contention_by_holder": {},
+            "recent_claims": [],
+        }
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._pending["counters"][name] += amount
+
+    def observe(self, name, value):
+        with self._lock:
+            hist = self._pending["histograms"][name]
+            index = len(hist["buckets"])
+            for i, bound in enumerate(hist["buckets"]):
+                if value <= bound:
+                    index = i
+                    break
+            hist["counts"][index] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    def record_contention(self, holder):
+        with self._lock:
+            holders = self._pending["contention_by_holder"]
+            holders[holder] = holders.get(holder, 0) + 1
+
+    def record_claim(self, claim_info):
+        with self._lock:
+            self._pending["recent_claims"].append(claim_info)
+
+    @classmethod
+    def _merge(cls, base, delta):
+        """Merge a delta into base (both in the persisted format)"""
+        for name in cls.COUNTERS:
+            base["counters"][name] = base["counters"].get(name, 0) + delta["counters"].get(name, 0)
+        for name, hist in delta["histograms"].items():
+            target = base["histograms"].get(name)
+            if target is None or target["buckets"] != hist["buckets"]:
+                base["histograms"][name] = hist
+                continue
+            target["counts"] = [a + b for a, b in zip(target["counts"], hist["counts"])]
+            target["sum"] += hist["sum"]
+            target["count"] += hist["count"]
+        for holder, count in delta["contention_by_holder"].items():
+            base["contention_by_holder"][holder] = base["contention_by_holder"].get(holder, 0) + count
+        base["recent_claims"] = (base["recent_claims"] + delta["recent_claims"])[-cls.MAX_RECENT_CLAIMS:]
+        return base
+
+    def _load(self, handle):
+        handle.seek(0)
+        raw = handle.read()
+        if not raw.strip():
+            return self._empty()
+        try:
+            return self._merge(self._empty(), json.loads(raw))
+        except (ValueError, KeyError, TypeError):
+            return self._empty()
+
+    def flush(self):
+        """Merge pending measurements into the shared metrics file"""
+        with self._lock:
+            delta = self._pending
+            self._pending = self._empty()
+
+        try:
+            with open(self.metrics_path, "a+") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    merged = self._merge(self._load(handle), delta)
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(json.dumps(merged))
+                    handle.flush()
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        except OSError as e:
+            print(f"Error writing dashboard metrics: {e}")
+
+    def snapshot(self):
+        """Return the persisted metrics merged with anything not yet flushed"""
+        if self.metrics_path.exists():
+            with open(self.metrics_path, "r") as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
+                try:
+                    data = self._load(handle)
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            data = self._empty()
+        with self._lock:
+            return self._merge(data, json.loads(json.dumps(self._pending)))
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Render the metrics in Prometheus text exposition format"""
+        data = self.snapshot()
+        lines = []
+        for name in self.COUNTERS:
+            metric = f"dashboard_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {data['counters'][name]}")
+
+        for name, hist in data["histograms"].items():
+            metric = f"dashboard_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(hist["buckets"], hist["counts"]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {hist["count"]}')
+            lines.append(f"{metric}_sum {hist['sum']}")
+            lines.append(f"{metric}_count {hist['count']}")
+
+        lines.append("# TYPE dashboard_lock_contention_total counter")
+        for holder, count in sorted(data["contention_by_holder"].items()):
+            escaped = str(holder).replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'dashboard_lock_contention_total{{holder="{escaped}"}} {count}')
+
+        return "\n".join(lines) + "\n"
 
 
 class DashboardManager:
@@ -19,6 +182,15 @@ class DashboardManager:
         self.dashboard_path = self.vault_path / "Dashboard.md"
         self.dashboard_lock_path = self.vault_path / ".dashboard.lock"
         self.dashboard_claim_path = self.vault_path / ".dashboard_claim.json"
+        self.metrics = DashboardMetrics(self.vault_path / ".dashboard_metrics.json")
+
+        # Lock files currently held by this process: id(lock_file) -> (acquired_at, claim_info)
+        self._held_locks = {}
+
+        # In-process read cache, validated against the file's (mtime_ns, size)
+        self._cache_lock = threading.Lock()
+        self._cache_signature = None
+        self._cache_content = None
 
         # Ensure dashboard exists
         if not self.dashboard_path.exists():
@@ -40,6 +212,7 @@ class DashboardManager:
 Last updated: """ + datetime.datetime.now().isoformat()
 
         self.dashboard_path.write_text(initial_content)
+        self.invalidate_cache()
         print(f"Initialized dashboard at {self.dashboard_path}")
 
     def claim_by_move(self, task_path, destination_folder):
@@ -63,37 +236,74 @@ Last updated: """ + datetime.datetime.now().isoformat()
         print(f"Claimed task by moving to {destination_path}")
         return destination_path
 
-    def lock_dashboard(self, writer_id=None):
+    def lock_dashboard(self, writer_id=None, wait_timeout=0):
         """
         Acquire exclusive write lock on the dashboard
         Implements single-writer rule
+
+        With wait_timeout > 0 the lock is retried until the timeout expires
+        instead of failing on the first attempt.
         """
         if writer_id is None:
             writer_id = f"process_{os.getpid()}_{int(time.time())}"
 
+        self.metrics.inc("lock_attempts_total")
+        started = time.monotonic()
+
         # Try to acquire file lock
         lock_file = open(self.dashboard_lock_path, 'w')
+        while True:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except IOError:
+                if time.monotonic() - started >= wait_timeout:
+                    # Could not acquire lock
+                    lock_file.close()
+                    self.metrics.observe("lock_wait_seconds", time.monotonic() - started)
+                    self.metrics.inc("lock_failures_total")
+                    self.metrics.record_contention(self._current_holder())
+                    self.metrics.flush()
+                    return None
+                time.sleep(0.05)
+
+        acquired_at = time.monotonic()
+        self.metrics.observe("lock_wait_seconds", acquired_at - started)
+        self.metrics.inc("lock_acquired_total")
+
+        # Record the claim
+        claim_info = {
+            "writer_id": writer_id,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "pid": os.getpid()
+        }
         try:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-            # Record the claim
-            claim_info = {
-                "writer_id": writer_id,
-                "timestamp": datetime.datetime.now().isoformat(),
-                "pid": os.getpid()
-            }
             self.dashboard_claim_path.write_text(json.dumps(claim_info))
-
-            print(f"Dashboard locked for writer: {writer_id}")
-            return lock_file
-        except IOError:
-            # Could not acquire lock
+        except Exception as e:
+            # Don't leave the lock held by a writer that won't go on to use it
+            print(f"Error recording dashboard claim: {e}")
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
             lock_file.close()
+            self.metrics.inc("lock_failures_total")
+            self.metrics.flush()
             return None
+        self._held_locks[id(lock_file)] = (acquired_at, claim_info)
+
+        print(f"Dashboard locked for writer: {writer_id}")
+        return lock_file
+
+    def _current_holder(self):
+        """Best-effort identification of whoever holds the lock right now"""
+        try:
+            claim_info = json.loads(self.dashboard_claim_path.read_text())
+            return f"{claim_info.get('writer_id', 'unknown')} (pid {claim_info.get('pid', '?')})"
+        except (OSError, ValueError):
+            return "unknown"
 
     def unlock_dashboard(self, lock_file):
         """Release the dashboard lock"""
         if lock_file:
+            held = self._held_locks.pop(id(lock_file), None)
             try:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
                 lock_file.close()
@@ -103,11 +313,18 @@ Last updated: """ + datetime.datetime.now().isoformat()
             except Exception as e:
                 print(f"Error releasing dashboard lock: {e}")
 
-    def update_dashboard(self, update_function, writer_id=None):
+            if held is not None:
+                acquired_at, claim_info = held
+                hold_seconds = time.monotonic() - acquired_at
+                self.metrics.observe("lock_hold_seconds", hold_seconds)
+                self.metrics.record_claim(dict(claim_info, hold_seconds=round(hold_seconds, 6)))
+            self.metrics.flush()
+
+    def update_dashboard(self, update_function, writer_id=None, wait_timeout=0):
         """
         Safely update the dashboard using single-writer rule
         """
-        lock_file = self.lock_dashboard(writer_id)
+        lock_file = self.lock_dashboard(writer_id, wait_timeout=wait_timeout)
         if not lock_file:
             print("Could not acquire dashboard lock, another process is writing")
             return False
@@ -120,7 +337,9 @@ Last updated: """ + datetime.datetime.now().isoformat()
                 current_content = "# AI Employee Dashboard\n\n"
 
             # Apply update function
+            update_started = time.monotonic()
             new_content = update_function(current_content)
+            self.metrics.observe("update_duration_seconds", time.monotonic() - update_started)
 
             # Write updated content
             self.dashboard_path.write_text(new_content)
@@ -128,22 +347,141 @@ Last updated: """ + datetime.datetime.now().isoformat()
             # Update timestamp
             timestamp_content = new_content + f"\n\nLast updated: {datetime.datetime.now().isoformat()}"
             self.dashboard_path.write_text(timestamp_content)
+            self.invalidate_cache()
+
+            bytes_written = len(new_content.encode("utf-8")) + len(timestamp_content.encode("utf-8"))
+            self.metrics.inc("bytes_written_total", bytes_written)
+            self.metrics.observe("write_bytes", bytes_written)
+            self.metrics.inc("updates_total")
 
             print(f"Dashboard updated by {writer_id or 'unknown'}")
             return True
 
         except Exception as e:
+            self.metrics.inc("update_errors_total")
             print(f"Error updating dashboard: {e}")
             return False
         finally:
             self.unlock_dashboard(lock_file)
 
+    def _stat_signature(self):
+        """Return (mtime_ns, size) of the dashboard file, or None if it is missing"""
+        try:
+            st = os.stat(self.dashboard_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _version_for(signature):
+        """Build an ETag-style version string from a stat signature"""
+        if signature is None:
+            return "missing"
+        return f"{signature[0]:x}-{signature[1]:x}"
+
+    def invalidate_cache(self):
+        """Drop the cached dashboard content so the next read hits the file"""
+        with self._cache_lock:
+            self._cache_signature = None
+            self._cache_content = None
+
+    def read_dashboard(self):
+        """
+        Read the dashboard through the in-process cache.
+        Returns (version, content); the file is only re-read when its
+        mtime_ns or size changed since the last read.
+        """
+        signature = self._stat_signature()
+        with self._cache_lock:
+            if signature is not None and signature == self._cache_signature:
+                return self._version_for(signature), self._cache_content
+
+        if signature is None:
+            return self._version_for(None), "# AI Employee Dashboard\n\nNo content available"
+
+        try:
+            content = self.dashboard_path.read_text()
+        except FileNotFoundError:
+            return self._version_for(None), "# AI Employee Dashboard\n\nNo content available"
+
+        # Re-stat after reading so a concurrent write is not cached under a stale signature
+        signature_after = self._stat_signature()
+        if signature_after == signature:
+            with self._cache_lock:
+                self._cache_signature = signature
+                self._cache_content = content
+        return self._version_for(signature_after), content
+
+    def dashboard_version(self):
+        """Current dashboard version (ETag) without reading the file"""
+        return self._version_for(self._stat_signature())
+
+    def read_if_changed(self, version):
+        """
+        Conditional read for pollers.
+        Returns (version, None) immediately if the dashboard still matches
+        the given version, otherwise (new_version, content).
+        """
+        current = self.dashboard_version()
+        if version is not None and current == version:
+            return current, None
+        return self.read_dashboard()
+
     def get_dashboard_content(self):
         """Read dashboard content safely"""
-        if self.dashboard_path.exists():
-            return self.dashboard_path.read_text()
-        else:
-            return "# AI Employee Dashboard\n\nNo content available"
+        return self.read_dashboard()[1]
+
+    def serve(self, host="127.0.0.1", port=8765):
+        """
+        Serve the dashboard over HTTP with conditional GET support.
+        Clients sending If-None-Match with the current ETag get a 304.
+        Lock metrics are exposed at /metrics in Prometheus text format.
+        """
+        manager = self
+
+        class DashboardRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = manager.metrics.to_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                if self.path not in ("/", "/dashboard", "/Dashboard.md"):
+                    self.send_error(404)
+                    return
+
+                etag = f'"{manager.dashboard_version()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                version, content = manager.read_dashboard()
+                body = content.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/markdown; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", f'"{version}"')
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), DashboardRequestHandler)
+        print(f"Serving dashboard on http://{host}:{port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
 
     def dashboard_status(self):
         """Check dashboard status and lock information"""
@@ -186,7 +524,7 @@ if __name__ == "__main__":
     manager = DashboardManager()
 
     if len(sys.argv) < 2:
-        print("Usage: dashboard_manager.py {status|update|claim|lock_status}")
+        print("Usage: dashboard_manager.py {status|update|claim|lock_status|serve|stats}")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -220,6 +558,17 @@ if __name__ == "__main__":
         status = manager.dashboard_status()
         print(json.dumps(status, indent=2))
 
+    elif command == "stats":
+        output_format = sys.argv[2] if len(sys.argv) > 2 else "json"
+        if output_format == "prometheus":
+            print(manager.metrics.to_prometheus(), end="")
+        else:
+            print(manager.metrics.to_json())
+
+    elif command == "serve":
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+        manager.serve(port=port)
+
     else:
         print(f"Unknown command: {command}")
-        print("Usage: dashboard_manager.py {status|update|claim|lock_status}")
\ No newline at end of file
+        print("Usage: dashboard_manager.py {status|update|claim|lock_status|serve|stats}")
\ No newline at end of file
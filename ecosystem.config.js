@@ -69,6 +69,24 @@ module.exports = {
       error_file: 'logs/pm2-watchdog-err.log',
       out_file: 'logs/pm2-watchdog-out.log',
       log_file: 'logs/pm2-watchdog-combined.log'
+    },
+    {
+      name: 'ai-employee-social-scheduler',
+      script: 'scripts/social_scheduler.py',
+      interpreter: './venv/bin/python',
+      cwd: '.',
+      args: 'run',
+      instances: 1,
+      autorestart: true,
+      watch: false,
+      max_memory_restart: '1G',
+      env: {
+        NODE_ENV: 'production',
+        PYTHONPATH: '.'
+      },
+      error_file: 'logs/pm2-social-scheduler-err.log',
+      out_file: 'logs/pm2-social-scheduler-out.log',
+      log_file: 'logs/pm2-social-scheduler-combined.log'
     }
   ]
 };
\ No newline at end of file
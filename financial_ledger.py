@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+"""
+Financial Ledger Aggregation for AI Employee System
+Parses CSV and JSON ledgers by column into compact typed columns
+(integer cents, ordinal dates) and computes grouped totals for briefings.
+NumPy is used for the aggregations when available.
+"""
+
+import os
+import csv
+import sys
+import json
+import datetime
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pure-Python aggregation is used instead
+    np = None
+
+
+REVENUE = 1
+EXPENSE = -1
+
+# Recognised column names, in order of preference
+AMOUNT_COLUMNS = ("amount", "amount_total", "total", "value", "sum", "price")
+DATE_COLUMNS = ("date", "transaction_date", "invoice_date", "payment_date", "created", "timestamp")
+TYPE_COLUMNS = ("type", "kind", "transaction_type", "direction", "category")
+SOURCE_COLUMNS = ("source", "customer", "client", "partner", "vendor", "payee", "name", "description", "memo")
+ID_COLUMNS = ("id", "transaction_id", "reference", "ref", "invoice_id", "invoice", "number")
+
+EXPENSE_TYPES = {"expense", "expenses", "debit", "cost", "bill", "purchase", "refund", "out", "outflow"}
+REVENUE_TYPES = {"revenue", "income", "sale", "sales", "credit", "payment", "invoice", "in", "inflow"}
+
+JSON_ROW_KEYS = ("transactions", "entries", "rows", "ledger", "records", "invoices", "payments")
+
+
+# Largest amount the int64 amounts array can hold
+MAX_CENTS = 2 ** 63 - 1
+
+
+def parse_cents(value):
+    """Parse an amount such as '1,234.50', '$99', '(12.00)' or 12.5 into integer cents"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    text = str(value).strip()
+    if not text:
+        return None
+
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()").replace(",", "").replace(" ", "")
+    for symbol in ("$", "€", "£", "USD", "EUR", "GBP"):
+        text = text.replace(symbol, "")
+    if text.startswith("-"):
+        negative = not negative
+        text = text[1:]
+
+    try:
+        amount = Decimal(text)
+        # NaN/Infinity, and huge exponents that overflow quantize or the int64 amounts array
+        if not amount.is_finite():
+            return None
+        cents = int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ArithmeticError, ValueError):
+        return None
+    if abs(cents) > MAX_CENTS:
+        return None
+    return -cents if negative else cents
+
+
+def parse_date_ordinal(value):
+    """Parse ISO (YYYY-MM-DD...) or US (MM/DD/YYYY) dates into a proleptic ordinal, or None"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return datetime.date.fromisoformat(text[:10]).toordinal()
+    except ValueError:
+        pass
+    try:
+        return datetime.datetime.strptime(text.split()[0], "%m/%d/%Y").date().toordinal()
+    except (ValueError, IndexError):
+        return None
+
+
+def pick_column(columns, candidates):
+    """Find the first candidate column name present (case-insensitive)"""
+    lookup = {str(column).strip().lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate in lookup:
+            return lookup[candidate]
+    return None
+
+
+class Ledger:
+    """
+    Column-oriented transaction store.
+    Amounts are integer cents (array 'q'), dates are date ordinals
+    (array 'l'), the kind is +1 revenue / -1 expense (array 'b'), and
+    sources are interned into integer codes (array 'l').
+    """
+
+    def __init__(self):
+        self.dates = array('l')
+        self.amounts = array('q')
+        self.kinds = array('b')
+        self.sources = array('l')
+        self.source_names = []
+        self._source_codes = {}
+        self._seen_ids = set()
+        self.files_loaded = 0
+        self.rows_skipped = 0
+        self.duplicates_skipped = 0
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def _source_code(self, name):
+        name = (str(name).strip() if name is not None else "") or "Unspecified"
+        code = self._source_codes.get(name)
+        if code is None:
+            code = len(self.source_names)
+            self._source_codes[name] = code
+            self.source_names.append(name)
+        return code
+
+    def append(self, date_ordinal, cents, kind, source, transaction_id=None):
+        """
+        Add one transaction. A row repeating a known transaction id with the
+        same date, amount and kind (e.g. the same export saved twice) is skipped.
+        """
+        if transaction_id not in (None, ""):
+            key = (str(transaction_id).strip(), date_ordinal, abs(cents), kind)
+            if key in self._seen_ids:
+                self.duplicates_skipped += 1
+                return False
+            self._seen_ids.add(key)
+
+        self.dates.append(date_ordinal)
+        self.amounts.append(abs(cents))
+        self.kinds.append(kind)
+        self.sources.append(self._source_code(source))
+        return True
+
+    def _load_rows(self, rows, columns, default_ordinal):
+        amount_col = pick_column(columns, AMOUNT_COLUMNS)
+        if amount_col is None:
+            return 0
+        date_col = pick_column(columns, DATE_COLUMNS)
+        type_col = pick_column(columns, TYPE_COLUMNS)
+        source_cols = [column for column in (pick_column(columns, (name,)) for name in SOURCE_COLUMNS) if column]
+        id_col = pick_column(columns, ID_COLUMNS)
+
+        loaded = 0
+        for row in rows:
+            cents = parse_cents(row.get(amount_col))
+            if cents is None:
+                self.rows_skipped += 1
+                continue
+
+            kind = EXPENSE if cents < 0 else REVENUE
+            if type_col is not None:
+                row_type = str(row.get(type_col) or "").strip().lower()
+                if row_type in EXPENSE_TYPES:
+                    kind = EXPENSE
+                elif row_type in REVENUE_TYPES:
+                    kind = REVENUE
+
+            date_ordinal = parse_date_ordinal(row.get(date_col)) if date_col is not None else None
+            if self.append(
+                date_ordinal if date_ordinal is not None else default_ordinal,
+                cents,
+                kind,
+                next((row[column] for column in source_cols if row.get(column)), None),
+                row.get(id_col) if id_col is not None else None
+            ):
+                loaded += 1
+        return loaded
+
+    def load_csv(self, path):
+        """Load a CSV ledger with a header row"""
+        default_ordinal = datetime.date.fromtimestamp(os.stat(path).st_mtime).toordinal()
+        with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                return 0
+            return self._load_rows(reader, reader.fieldnames, default_ordinal)
+
+    def load_json(self, path):
+        """Load a JSON ledger: a list of objects, or an object holding one under a known key"""
+        default_ordinal = datetime.date.fromtimestamp(os.stat(path).st_mtime).toordinal()
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = next((data[key] for key in JSON_ROW_KEYS if isinstance(data.get(key), list)), [])
+        rows = [row for row in data if isinstance(row, dict)] if isinstance(data, list) else []
+        if not rows:
+            return 0
+        columns = {key for row in rows for key in row}
+        return self._load_rows(rows, columns, default_ordinal)
+
+    def load_folder(self, folder):
+        """Load every .csv and .json ledger directly inside a folder"""
+        folder = Path(folder)
+        if not folder.is_dir():
+            return 0
+        loaded = 0
+        with os.scandir(folder) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not entry.is_file():
+                    continue
+                suffix = Path(entry.name).suffix.lower()
+                try:
+                    if suffix == '.csv':
+                        loaded += self.load_csv(entry.path)
+                    elif suffix == '.json':
+                        loaded += self.load_json(entry.path)
+                    else:
+                        continue
+                    self.files_loaded += 1
+                except (OSError, ValueError) as e:
+                    print(f"Error reading {entry.path}: {e}")
+        return loaded
+
+    def _window_bounds(self, since, until):
+        low = since.toordinal() if since else -sys.maxsize
+        high = until.toordinal() if until else sys.maxsize
+        return low, high
+
+    def summary(self, since=None, until=None, top=5):
+        """
+        Totals for transactions dated within [since, until] (dates or datetimes).
+        Returns integer cents: revenue, expenses, net profit, and the top
+        revenue and expense sources.
+        """
+        low, high = self._window_bounds(since, until)
+        n_sources = len(self.source_names)
+
+        if np is not None and len(self):
+            dates = np.frombuffer(self.dates, dtype=np.dtype(self.dates.typecode))
+            amounts = np.frombuffer(self.amounts, dtype=np.int64)
+            kinds = np.frombuffer(self.kinds, dtype=np.int8)
+            sources = np.frombuffer(self.sources, dtype=np.dtype(self.sources.typecode))
+
+            in_window = (dates >= low) & (dates <= high)
+            revenue_mask = in_window & (kinds == REVENUE)
+            expense_mask = in_window & (kinds == EXPENSE)
+
+            revenue_by_source = np.zeros(n_sources, dtype=np.int64)
+            expense_by_source = np.zeros(n_sources, dtype=np.int64)
+            np.add.at(revenue_by_source, sources[revenue_mask], amounts[revenue_mask])
+            np.add.at(expense_by_source, sources[expense_mask], amounts[expense_mask])
+
+            count = int(in_window.sum())
+            revenue_by_source = revenue_by_source.tolist()
+            expense_by_source = expense_by_source.tolist()
+        else:
+            revenue_by_source = [0] * n_sources
+            expense_by_source = [0] * n_sources
+            count = 0
+            for date, amount, kind, source in zip(self.dates, self.amounts, self.kinds, self.sources):
+                if low <= date <= high:
+                    count += 1
+                    if kind == REVENUE:
+                        revenue_by_source[source] += amount
+                    else:
+                        expense_by_source[source] += amount
+
+        def top_sources(totals):
+            ranked = sorted(
+                ((self.source_names[code], cents) for code, cents in enumerate(totals) if cents),
+                key=lambda item: item[1],
+                reverse=True
+            )
+            return ranked[:top]
+
+        revenue = sum(revenue_by_source)
+        expenses = sum(expense_by_source)
+        return {
+            'revenue_cents': revenue,
+            'expense_cents': expenses,
+            'net_cents': revenue - expenses,
+            'transaction_count': count,
+            'top_revenue_sources': top_sources(revenue_by_source),
+            'top_expense_sources': top_sources(expense_by_source)
+        }
+
+
+def load_ledgers(folders):
+    """Build one Ledger from every ledger file in the given folders"""
+    ledger = Ledger()
+    for folder in folders:
+        ledger.load_folder(folder)
+    return ledger
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Summarize CSV/JSON ledgers')
+    parser.add_argument('folders', nargs='*', default=[
+        "AI_Employee_Vault/Accounting", "AI_Employee_Vault/Finance", "AI_Employee_Vault/Revenue"
+    ], help='Folders containing ledger files')
+    parser.add_argument('--days', type=int, help='Only include the last N days')
+    args = parser.parse_args()
+
+    ledger = load_ledgers(args.folders)
+    since = datetime.date.today() - datetime.timedelta(days=args.days) if args.days else None
+    summary = ledger.summary(since=since)
+
+    print(f"Ledger rows: {len(ledger)} from {ledger.files_loaded} files "
+          f"({ledger.duplicates_skipped} duplicates, {ledger.rows_skipped} unparseable rows skipped)")
+    print(f"Revenue: ${summary['revenue_cents'] / 100:,.2f}")
+    print(f"Expenses: ${summary['expense_cents'] / 100:,.2f}")
+    print(f"Net Profit: ${summary['net_cents'] / 100:,.2f}")
+    for source, cents in summary['top_revenue_sources']:
+        print(f"  + {source}: ${cents / 100:,.2f}")
+    for source, cents in summary['top_expense_sources']:
+        print(f"  - {source}: ${cents / 100:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
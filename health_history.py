@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+
+"""
+Health History Store for AI Employee System
+Keeps watchdog health check results in a bounded SQLite store and renders
+the Markdown view (system_health.md) from the latest entries on demand
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    checked_at REAL NOT NULL,
+    cpu_percent REAL,
+    memory_percent REAL,
+    disk_percent REAL,
+    stats_json TEXT,
+    actions_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_checks_checked_at ON checks (checked_at);
+
+CREATE TABLE IF NOT EXISTS process_checks (
+    check_id INTEGER NOT NULL REFERENCES checks (id) ON DELETE CASCADE,
+    process TEXT NOT NULL,
+    name TEXT NOT NULL,
+    running INTEGER NOT NULL,
+    pid INTEGER,
+    state TEXT,
+    probe_ok INTEGER,
+    probe_latency_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_process_checks_check ON process_checks (check_id);
+CREATE INDEX IF NOT EXISTS idx_process_checks_process ON process_checks (process, check_id);
+"""
+
+
+def format_health_check(entry):
+    """Render one health check entry as the Markdown section used in system_health.md"""
+    timestamp = entry["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
+
+    section = f"\n## Health Check - {timestamp}\n\n"
+
+    # Add process status
+    section += "### Process Status\n\n"
+    for info in entry["processes"].values():
+        status = "✅ Running" if info["running"] else "❌ Stopped"
+        if info.get("state") == "backoff":
+            status += " (restart pending)"
+        elif info.get("state") == "crash_loop":
+            status += " (crash loop, restarts suspended)"
+        probe = info.get("probe")
+        if probe:
+            status += f" — probe {probe['latency'] * 1000:.1f} ms" if probe["ok"] else " — probe failed"
+        section += f"- **{info['name']}**: {status}\n"
+
+    # Add system stats if available
+    stats = entry.get("system_stats")
+    if stats:
+        section += "\n### System Stats\n\n"
+        if "cpu_peak" in stats:
+            section += f"- CPU Usage: {stats['cpu_percent']:.1f}% avg, {stats['cpu_peak']:.1f}% peak\n"
+            section += f"- Memory Usage: {stats['memory_percent']:.1f}% avg, {stats['memory_peak']:.1f}% peak\n"
+            section += f"- Disk Usage: {stats['disk_percent']:.1f}%\n"
+            section += f"- Load Average: {' / '.join(f'{load:.2f}' for load in stats['load_avg'])}\n"
+            section += f"- Window: {stats['sample_count']} samples over {stats['window_seconds']:.0f}s\n"
+        else:
+            section += f"- CPU Usage: {stats['cpu_percent']:.1f}%\n"
+            section += f"- Memory Usage: {stats['memory_percent']:.1f}%\n"
+            section += f"- Disk Usage: {stats['disk_percent']:.1f}%\n"
+
+    # Add actions taken
+    if entry.get("actions_taken"):
+        section += "\n### Actions Taken\n\n"
+        for action in entry["actions_taken"]:
+            section += f"- {action}\n"
+
+    section += "\n" + "-"*50 + "\n"  # Separator
+    return section
+
+
+class HealthHistoryStore:
+    def __init__(self, db_path, retention_days=30, max_checks=100000):
+        self.db_path = Path(db_path)
+        self.retention_days = retention_days
+        self.max_checks = max_checks
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+            # Databases created before supervisor states and probes were recorded
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(process_checks)")}
+            for column, column_type in (("state", "TEXT"), ("probe_ok", "INTEGER"), ("probe_latency_ms", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE process_checks ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def connect(self):
+        """Open a connection with foreign keys enabled; commits on success"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record(self, status_report):
+        """Store one watchdog status report and apply retention"""
+        checked_at = status_report["timestamp"].timestamp()
+        stats = status_report.get("system_stats") or {}
+
+        with self.connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO checks (checked_at, cpu_percent, memory_percent, disk_percent, stats_json, actions_json)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    checked_at,
+                    stats.get("cpu_percent"),
+                    stats.get("memory_percent"),
+                    stats.get("disk_percent"),
+                    json.dumps(stats) if stats else None,
+                    json.dumps(status_report.get("actions_taken", [])),
+                )
+            )
+            check_id = cursor.lastrowid
+            rows = []
+            for process, info in status_report["processes"].items():
+                probe = info.get("probe")
+                rows.append((
+                    check_id, process, info["name"], int(bool(info["running"])), info.get("pid"), info.get("state"),
+                    int(probe["ok"]) if probe else None,
+                    probe["latency"] * 1000 if probe and probe["ok"] else None
+                ))
+            conn.executemany(
+                "INSERT INTO process_checks (check_id, process, name, running, pid, state, probe_ok, probe_latency_ms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            # Retention: both deletes are index range scans, independent of history size
+            cutoff = checked_at - self.retention_days * 86400
+            conn.execute("DELETE FROM checks WHERE checked_at < ?", (cutoff,))
+            conn.execute("DELETE FROM checks WHERE id <= ?", (check_id - self.max_checks,))
+        return check_id
+
+    def latest(self, limit=10):
+        """Return the latest health checks, oldest first, in status report format"""
+        with self.connect() as conn:
+            checks = conn.execute(
+                "SELECT * FROM checks ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            if not checks:
+                return []
+
+            ids = [row["id"] for row in checks]
+            placeholders = ",".join("?" * len(ids))
+            process_rows = conn.execute(
+                f"SELECT * FROM process_checks WHERE check_id IN ({placeholders}) ORDER BY rowid", ids
+            ).fetchall()
+
+        processes = {}
+        for row in process_rows:
+            processes.setdefault(row["check_id"], {})[row["process"]] = {
+                "name": row["name"],
+                "running": bool(row["running"]),
+                "pid": row["pid"],
+                "state": row["state"]
+            }
+            if row["probe_ok"] is not None:
+                processes[row["check_id"]][row["process"]]["probe"] = {
+                    "ok": bool(row["probe_ok"]),
+                    "latency": row["probe_latency_ms"] / 1000 if row["probe_latency_ms"] is not None else None
+                }
+
+        entries = []
+        for row in reversed(checks):
+            entries.append({
+                "id": row["id"],
+                "timestamp": datetime.datetime.fromtimestamp(row["checked_at"]),
+                "processes": processes.get(row["id"], {}),
+                "system_stats": json.loads(row["stats_json"]) if row["stats_json"] else None,
+                "actions_taken": json.loads(row["actions_json"]) if row["actions_json"] else []
+            })
+        return entries
+
+    def render_markdown(self, limit=10):
+        """Render the Markdown health report from the latest entries"""
+        content = "# System Health Report\n\n"
+        for entry in self.latest(limit):
+            content += format_health_check(entry)
+        return content
+
+    def uptime(self, since, until=None, process=None):
+        """
+        Per-process uptime between two timestamps (epoch seconds), measured as
+        the share of health checks in which the process was running.
+        `process` may be a process key or display name.
+        """
+        until = until if until is not None else time.time()
+        query = (
+            "SELECT p.process, p.name, COUNT(*) AS checks, SUM(p.running) AS running,"
+            " MAX(CASE WHEN p.running = 0 THEN c.checked_at END) AS last_down"
+            " FROM process_checks p JOIN checks c ON c.id = p.check_id"
+            " WHERE c.checked_at >= ? AND c.checked_at <= ?"
+        )
+        params = [since, until]
+        if process:
+            query += " AND (p.process = ? OR p.name = ?)"
+            params += [process, process]
+        query += " GROUP BY p.process, p.name ORDER BY p.name"
+
+        with self.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            {
+                "process": row["process"],
+                "name": row["name"],
+                "checks": row["checks"],
+                "running_checks": row["running"],
+                "uptime_percent": (row["running"] / row["checks"]) * 100 if row["checks"] else 0.0,
+                "last_down": datetime.datetime.fromtimestamp(row["last_down"]).isoformat() if row["last_down"] else None
+            }
+            for row in rows
+        ]
+
+    def failures(self, since, until=None):
+        """
+        Per-process counts of failed health checks between two timestamps
+        (process not running, or its probe failing), worst first.
+        """
+        until = until if until is not None else time.time()
+        query = (
+            "SELECT p.name, COUNT(*) AS failed_checks, SUM(p.running = 0) AS down_checks,"
+            " SUM(p.probe_ok = 0) AS probe_failures, MAX(c.checked_at) AS last_failure"
+            " FROM process_checks p JOIN checks c ON c.id = p.check_id"
+            " WHERE c.checked_at >= ? AND c.checked_at <= ? AND (p.running = 0 OR p.probe_ok = 0)"
+            " GROUP BY p.name ORDER BY COUNT(*) DESC"
+        )
+        with self.connect() as conn:
+            rows = conn.execute(query, (since, until)).fetchall()
+
+        return [
+            {
+                "name": row["name"],
+                "failed_checks": row["failed_checks"],
+                "down_checks": row["down_checks"] or 0,
+                "probe_failures": row["probe_failures"] or 0,
+                "last_failure": datetime.datetime.fromtimestamp(row["last_failure"]).isoformat()
+            }
+            for row in rows
+        ]
+
+    def probe_latency(self, since, until=None, process=None):
+        """
+        Daily probe latency percentiles (ms) and failure counts per process,
+        to spot services that are degrading before they fail outright.
+        """
+        until = until if until is not None else time.time()
+        query = (
+            "SELECT p.process, p.name, c.checked_at, p.probe_ok, p.probe_latency_ms"
+            " FROM process_checks p JOIN checks c ON c.id = p.check_id"
+            " WHERE c.checked_at >= ? AND c.checked_at <= ? AND p.probe_ok IS NOT NULL"
+        )
+        params = [since, until]
+        if process:
+            query += " AND (p.process = ? OR p.name = ?)"
+            params += [process, process]
+
+        days = {}
+        with self.connect() as conn:
+            for row in conn.execute(query, params):
+                day = datetime.date.fromtimestamp(row["checked_at"]).isoformat()
+                bucket = days.setdefault((row["name"], day), {"latencies": [], "failures": 0})
+                if row["probe_ok"]:
+                    bucket["latencies"].append(row["probe_latency_ms"])
+                else:
+                    bucket["failures"] += 1
+
+        results = []
+        for (name, day), bucket in sorted(days.items()):
+            latencies = sorted(bucket["latencies"])
+
+            def pick(q):
+                return latencies[min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))] if latencies else None
+
+            results.append({
+                "name": name,
+                "day": day,
+                "probes": len(latencies) + bucket["failures"],
+                "failures": bucket["failures"],
+                "p50_ms": pick(0.50),
+                "p95_ms": pick(0.95),
+                "max_ms": latencies[-1] if latencies else None
+            })
+        return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Query the AI Employee health history')
+    parser.add_argument('--db', default='AI_Employee_Vault/logs/health_history.db', help='Path to the health history database')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    uptime_parser = subparsers.add_parser('uptime', help='Uptime per process over a time window')
+    uptime_parser.add_argument('process', nargs='?', help='Process key or name (default: all processes)')
+    uptime_parser.add_argument('--days', type=float, default=7, help='Window size in days (default: 7)')
+    uptime_parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+
+    latency_parser = subparsers.add_parser('latency', help='Daily probe latency percentiles per process')
+    latency_parser.add_argument('process', nargs='?', help='Process key or name (default: all probed processes)')
+    latency_parser.add_argument('--days', type=float, default=7, help='Window size in days (default: 7)')
+    latency_parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+
+    render_parser = subparsers.add_parser('render', help='Render the Markdown report from the latest checks')
+    render_parser.add_argument('--limit', type=int, default=10, help='Number of checks to include (default: 10)')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"No health history found at {args.db}")
+        sys.exit(1)
+
+    store = HealthHistoryStore(args.db)
+
+    if args.command == 'uptime':
+        results = store.uptime(time.time() - args.days * 86400, process=args.process)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        elif not results:
+            print(f"No health checks recorded in the last {args.days:g} days")
+        else:
+            print(f"Uptime over the last {args.days:g} days:")
+            for result in results:
+                last_down = f", last down {result['last_down']}" if result['last_down'] else ""
+                print(f"  {result['name']}: {result['uptime_percent']:.2f}% "
+                      f"({result['running_checks']}/{result['checks']} checks{last_down})")
+
+    elif args.command == 'latency':
+        results = store.probe_latency(time.time() - args.days * 86400, process=args.process)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        elif not results:
+            print(f"No probe results recorded in the last {args.days:g} days")
+        else:
+            def ms(value):
+                return f"{value:.1f}" if value is not None else "-"
+
+            print(f"Probe latency over the last {args.days:g} days (ms):")
+            for result in results:
+                print(f"  {result['day']} {result['name']}: p50 {ms(result['p50_ms'])}, p95 {ms(result['p95_ms'])}, "
+                      f"max {ms(result['max_ms'])}, {result['failures']}/{result['probes']} failed")
+
+    elif args.command == 'render':
+        print(store.render_markdown(args.limit), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Log Tail Utilities for AI Employee System
+Reads log files backwards from EOF in fixed-size blocks, so recent entries
+can be scanned without loading multi-gigabyte logs into memory.
+"""
+
+import os
+import re
+import sys
+import datetime
+from collections import Counter
+
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# "2025-01-31 12:00:00,123 - name - ERROR - message", "[2025-01-31T12:00:00] ERROR ..."
+TIMESTAMP_PATTERN = re.compile(r'^\[?(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})')
+LEVEL_PATTERN = re.compile(r'\b(CRITICAL|FATAL|ERROR|EXCEPTION)\b', re.IGNORECASE)
+VOLATILE_PATTERN = re.compile(r"0x[0-9a-fA-F]+|\d+(?:\.\d+)?|'[^']*'|\"[^\"]*\"")
+
+
+def iter_lines_reverse(path, block_size=DEFAULT_BLOCK_SIZE, encoding='utf-8'):
+    """
+    Yield the lines of a file from last to first, without line endings.
+    Only one block (plus any partial line carried across a block boundary)
+    is held in memory at a time.
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        first_block = True
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+
+            lines = block.split(b'\n')
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0)
+            if first_block:
+                first_block = False
+                if lines and lines[-1] == b'':
+                    lines.pop()  # Trailing newline at EOF
+            for line in reversed(lines):
+                yield line.rstrip(b'\r').decode(encoding, errors='replace')
+
+        if remainder or not first_block:
+            yield remainder.rstrip(b'\r').decode(encoding, errors='replace')
+
+
+def parse_line_timestamp(line):
+    """Timestamp at the start of a log line, or None for untimestamped lines"""
+    match = TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(f"{match.group(1)} {match.group(2)}")
+    except ValueError:
+        return None
+
+
+def iter_lines_since(path, since, until=None, max_lines=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yield (timestamp, line) for timestamped lines within [since, until],
+    newest first. Stops at the first line older than `since`, or after
+    `max_lines` lines have been read as a safeguard for logs without
+    usable timestamps.
+    """
+    for scanned, line in enumerate(iter_lines_reverse(path, block_size), start=1):
+        if max_lines is not None and scanned > max_lines:
+            break
+        timestamp = parse_line_timestamp(line)
+        if timestamp is None:
+            continue
+        if timestamp < since:
+            break
+        if until is not None and timestamp > until:
+            continue
+        yield timestamp, line
+
+
+def error_signature(line):
+    """
+    Group key for an error line: the text after the level with numbers,
+    addresses and quoted values masked, so repeats of one error count together.
+    """
+    match = LEVEL_PATTERN.search(line)
+    message = line[match.end():] if match else line
+    message = VOLATILE_PATTERN.sub('#', message.strip(' -:|]'))
+    return message[:120] or line.strip()[:120]
+
+
+def summarize_errors(path, since, until=None, max_lines=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Count error lines in a log within [since, until], grouped by signature.
+    Returns (total, [(signature, count, last_seen), ...]) ordered by count.
+    """
+    counts = Counter()
+    last_seen = {}
+    total = 0
+    for timestamp, line in iter_lines_since(path, since, until, max_lines, block_size):
+        if not LEVEL_PATTERN.search(line):
+            continue
+        signature = error_signature(line)
+        counts[signature] += 1
+        # Lines arrive newest first, so the first sighting is the latest
+        last_seen.setdefault(signature, timestamp)
+        total += 1
+    return total, [(signature, count, last_seen[signature]) for signature, count in counts.most_common()]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Summarize recent errors in a log file')
+    parser.add_argument('path', help='Log file to scan')
+    parser.add_argument('--days', type=float, default=7, help='How far back to look')
+    parser.add_argument('--max-lines', type=int, help='Stop after reading this many lines')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Log file not found: {args.path}")
+        sys.exit(1)
+
+    since = datetime.datetime.now() - datetime.timedelta(days=args.days)
+    total, groups = summarize_errors(args.path, since, max_lines=args.max_lines)
+    print(f"{total} error(s) since {since.strftime('%Y-%m-%d %H:%M:%S')}")
+    for signature, count, last_seen in groups:
+        print(f"  {count:>6}x  {signature}  (last {last_seen.strftime('%Y-%m-%d %H:%M:%S')})")
+
+
+if __name__ == "__main__":
+    main()
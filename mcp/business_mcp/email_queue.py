@@ -0,0 +1,470 @@
+"""
+Outbound email queue for the Business MCP.
+
+Messages are stored in a SQLite outbox and delivered by background worker
+threads, so `send_email` returns a message ID without waiting on SMTP.
+Each worker keeps its SMTP session open and sends a batch of messages over
+it. Temporary failures are retried with exponential backoff, and every
+message's status is recorded in the outbox.
+
+Configuration (environment):
+    SMTP_HOST               SMTP server; when unset, delivery is simulated (printed)
+    SMTP_PORT               Port (default 587, or 465 with SMTP_SSL)
+    SMTP_USERNAME           Login, if the server requires authentication
+    SMTP_PASSWORD           Password
+    SMTP_FROM               Sender address (default SMTP_USERNAME)
+    SMTP_STARTTLS           Upgrade the connection with STARTTLS (default true)
+    SMTP_SSL                Connect with implicit TLS (default false)
+    SMTP_POOL_SIZE          Concurrent SMTP sessions / delivery workers (default 2)
+    SMTP_MAX_PER_SESSION    Messages sent before a session is recycled (default 100)
+    EMAIL_MAX_ATTEMPTS      Delivery attempts before a message is marked failed (default 5)
+    EMAIL_OUTBOX_DB         Outbox database path
+"""
+
+import os
+import ssl
+import json
+import time
+import uuid
+import random
+import sqlite3
+import smtplib
+import threading
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUTBOX_DB = os.path.join(PROJECT_ROOT, "AI_Employee_Vault", ".email_outbox.db")
+
+# Messages claimed by a worker per SMTP session round
+BATCH_SIZE = 20
+# Retry delay is BACKOFF_BASE * 2 ** (attempt - 1) seconds, capped and jittered
+BACKOFF_BASE = 30
+BACKOFF_MAX = 30 * 60
+# Idle sessions older than this are checked with NOOP before reuse
+SESSION_IDLE_CHECK = 30
+# Seconds a worker pauses after an outbox error (e.g. "database is locked")
+ERROR_BACKOFF = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id TEXT PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    sender TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def env_flag(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class PermanentDeliveryError(Exception):
+    """The server rejected the message outright; retrying will not help."""
+
+
+class EmailOutbox:
+    """
+    SQLite-backed message store. Status moves queued -> sending -> sent,
+    or back to queued with a later next_attempt_at on a temporary failure,
+    or to failed once attempts run out or the server rejects the message.
+    """
+
+    def __init__(self, db_path=DEFAULT_OUTBOX_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            # WAL lets status reads proceed while a worker is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def connect(self, write=True):
+        """Open a connection in a transaction; commits on success. Writes take the lock up front."""
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, recipient, subject, body, sender=None):
+        """Store a message for delivery and return its ID"""
+        message_id = uuid.uuid4().hex
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT INTO outbox (id, recipient, subject, body, sender, status, next_attempt_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (message_id, recipient, subject, body, sender, now, now, now)
+            )
+        return message_id
+
+    def claim(self, limit=BATCH_SIZE):
+        """Mark up to `limit` due messages as sending and return them, oldest first"""
+        now = time.time()
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE status = 'queued' AND next_attempt_at <= ?"
+                " ORDER BY next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(now, row["id"]) for row in rows]
+            )
+        return [dict(row, attempts=row["attempts"] + 1) for row in rows]
+
+    def mark_sent(self, message_id):
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'sent', last_error = NULL, sent_at = ?, updated_at = ? WHERE id = ?",
+                (now, now, message_id)
+            )
+
+    def mark_retry(self, message_id, error, delay):
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'queued', last_error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (error, now + delay, now, message_id)
+            )
+
+    def mark_failed(self, message_id, error):
+        with self.connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'failed', last_error = ?, updated_at = ? WHERE id = ?",
+                (error, time.time(), message_id)
+            )
+
+    def recover(self):
+        """Requeue messages a previous process was still sending when it stopped"""
+        with self.connect() as conn:
+            return conn.execute(
+                "UPDATE outbox SET status = 'queued', updated_at = ? WHERE status = 'sending'", (time.time(),)
+            ).rowcount
+
+    def release(self, message_ids):
+        """Return claimed messages to the queue without using up an attempt"""
+        with self.connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET status = 'queued', attempts = attempts - 1, updated_at = ? WHERE id = ? AND status = 'sending'",
+                [(time.time(), message_id) for message_id in message_ids]
+            )
+
+    def status(self, message_id):
+        """The message's delivery record (without the body), or None"""
+        with self.connect(write=False) as conn:
+            row = conn.execute(
+                "SELECT id, recipient, subject, status, attempts, last_error, created_at, sent_at, next_attempt_at"
+                " FROM outbox WHERE id = ?",
+                (message_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def counts(self):
+        """Number of messages in each status"""
+        with self.connect(write=False) as conn:
+            return {row["status"]: row["n"] for row in conn.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status")}
+
+    def next_due(self):
+        """Seconds until the next queued message is due (0 if one is due now), or None"""
+        with self.connect(write=False) as conn:
+            row = conn.execute("SELECT MIN(next_attempt_at) AS due FROM outbox WHERE status = 'queued'").fetchone()
+        return None if row["due"] is None else max(0.0, row["due"] - time.time())
+
+
+class SMTPSession:
+    """One SMTP connection, reused for many messages."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.smtp = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def open(self):
+        s = self.settings
+        if s["ssl"]:
+            self.smtp = smtplib.SMTP_SSL(s["host"], s["port"], timeout=s["timeout"], context=ssl.create_default_context())
+        else:
+            self.smtp = smtplib.SMTP(s["host"], s["port"], timeout=s["timeout"])
+            if s["starttls"]:
+                self.smtp.starttls(context=ssl.create_default_context())
+        if s["username"]:
+            self.smtp.login(s["username"], s["password"] or "")
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def ensure_open(self):
+        """Connect, or reconnect if the session is worn out or the server dropped it"""
+        if self.smtp is not None:
+            if self.sent >= self.settings["max_per_session"]:
+                self.close()
+            elif time.monotonic() - self.last_used > SESSION_IDLE_CHECK:
+                try:
+                    if self.smtp.noop()[0] != 250:
+                        self.close()
+                except (smtplib.SMTPException, OSError):
+                    self.close()
+        if self.smtp is None:
+            self.open()
+
+    def send(self, message):
+        self.ensure_open()
+        self.smtp.send_message(message)
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self.smtp.close()
+            self.smtp = None
+
+
+class SimulatedSession:
+    """Stands in for SMTP when no server is configured: delivery is printed."""
+
+    def send(self, message):
+        print("--- EMAIL SENT ---")
+        print(f"To: {message['To']}")
+        print(f"Subject: {message['Subject']}")
+        print(f"Message-ID: {message['Message-ID']}")
+        print(f"Body: {message.get_content().rstrip()}")
+        print("------------------")
+
+    def close(self):
+        pass
+
+
+class EmailQueue:
+    """
+    Outbox plus a pool of delivery workers, one SMTP session each.
+    Call `start()` once; `send()` only writes to the outbox and wakes a worker.
+    """
+
+    def __init__(self, outbox=None, settings=None, workers=None, max_attempts=None, batch_size=BATCH_SIZE):
+        self.outbox = outbox or EmailOutbox(os.getenv("EMAIL_OUTBOX_DB", DEFAULT_OUTBOX_DB))
+        self.settings = settings or self.settings_from_env()
+        self.workers = workers or int(os.getenv("SMTP_POOL_SIZE", "2"))
+        self.max_attempts = max_attempts or int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+        self.batch_size = batch_size
+        self.error_backoff = ERROR_BACKOFF
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def settings_from_env():
+        use_ssl = env_flag("SMTP_SSL", False)
+        return {
+            "host": os.getenv("SMTP_HOST"),
+            "port": int(os.getenv("SMTP_PORT", "465" if use_ssl else "587")),
+            "username": os.getenv("SMTP_USERNAME"),
+            "password": os.getenv("SMTP_PASSWORD"),
+            "sender": os.getenv("SMTP_FROM") or os.getenv("SMTP_USERNAME"),
+            "ssl": use_ssl,
+            "starttls": env_flag("SMTP_STARTTLS", True) and not use_ssl,
+            "timeout": float(os.getenv("SMTP_TIMEOUT", "30")),
+            "max_per_session": int(os.getenv("SMTP_MAX_PER_SESSION", "100")),
+        }
+
+    @property
+    def simulated(self):
+        return not self.settings["host"]
+
+    def start(self):
+        """Start the delivery workers (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            # A message interrupted mid-send may go out twice; losing it would be worse
+            recovered = self.outbox.recover()
+            if recovered:
+                print(f"Requeued {recovered} email(s) left in sending state")
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"email-delivery-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=10):
+        """Stop the workers after their current batch; undelivered messages stay in the outbox"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def send(self, to, subject, body):
+        """Queue a message and return its ID"""
+        message_id = self.outbox.enqueue(to, subject, body, self.settings["sender"])
+        self._wake.set()
+        return message_id
+
+    def status(self, message_id):
+        return self.outbox.status(message_id)
+
+    def wait_idle(self, timeout=30):
+        """Block until nothing is queued or sending (for scripts and tests); True if that happened"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            counts = self.outbox.counts()
+            if not counts.get("queued") and not counts.get("sending"):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def build_message(self, row):
+        message = EmailMessage()
+        message["From"] = row["sender"] or "ai-employee@localhost"
+        message["To"] = row["recipient"]
+        message["Subject"] = row["subject"]
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = make_msgid(idstring=row["id"])
+        message.set_content(row["body"])
+        return message
+
+    def backoff(self, attempts):
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _run(self):
+        session = SimulatedSession() if self.simulated else SMTPSession(self.settings)
+        try:
+            while not self._stop.is_set():
+                batch = []
+                try:
+                    batch = self.outbox.claim(self.batch_size)
+                    if not batch:
+                        # Sleep until woken by send() or until the next retry is due
+                        due = self.outbox.next_due()
+                        self._wake.wait(timeout=min(5.0, due) if due is not None else 5.0)
+                        self._wake.clear()
+                        continue
+                    self._deliver(session, batch)
+                except Exception as e:
+                    # The outbox can be briefly unavailable (locked by another process);
+                    # a worker that died here would leave queued mail undelivered for good
+                    print(f"Error in email delivery worker: {type(e).__name__}: {e}")
+                    self._release_after_error(batch)
+                    self._stop.wait(self.error_backoff)
+        finally:
+            session.close()
+
+    def _release_after_error(self, batch):
+        """Return a batch interrupted by an outbox error to the queue (rows already marked are untouched)"""
+        if not batch:
+            return
+        try:
+            self.outbox.release([row["id"] for row in batch])
+        except Exception as e:
+            print(f"Error releasing claimed emails: {type(e).__name__}: {e}")
+
+    def _deliver(self, session, batch):
+        for index, row in enumerate(batch):
+            if self._stop.is_set():
+                self.outbox.release([pending["id"] for pending in batch[index:]])
+                return
+            try:
+                session.send(self.build_message(row))
+                self.outbox.mark_sent(row["id"])
+            except Exception as e:
+                error = self._describe(e)
+                permanent = self._is_permanent(e)
+                if permanent or row["attempts"] >= self.max_attempts:
+                    self.outbox.mark_failed(row["id"], error)
+                    print(f"Email {row['id']} to {row['recipient']} failed: {error}")
+                else:
+                    self.outbox.mark_retry(row["id"], error, self.backoff(row["attempts"]))
+                if self._connection_lost(e):
+                    # Send the rest of the batch over a fresh session
+                    session.close()
+
+    @staticmethod
+    def _is_permanent(error):
+        """5xx replies for this message's sender, recipient or content won't succeed on retry"""
+        if isinstance(error, PermanentDeliveryError):
+            return True
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(500 <= code < 600 for code, _ in error.recipients.values())
+        if isinstance(error, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+            return 500 <= error.smtp_code < 600
+        return False
+
+    @staticmethod
+    def _connection_lost(error):
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPException):
+            # 421: the server is closing the session
+            return getattr(error, "smtp_code", None) == 421
+        return isinstance(error, OSError)
+
+    @staticmethod
+    def _describe(error):
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return "Recipient refused: " + "; ".join(
+                f"{code} {message.decode(errors='replace') if isinstance(message, bytes) else message}"
+                for code, message in error.recipients.values()
+            )
+        if isinstance(error, smtplib.SMTPResponseException):
+            message = error.smtp_error.decode(errors="replace") if isinstance(error.smtp_error, bytes) else error.smtp_error
+            return f"{error.smtp_code} {message}"
+        return f"{type(error).__name__}: {error}"
+
+    def stats(self):
+        return {"mode": "simulated" if self.simulated else "smtp", "workers": self.workers,
+                "messages": self.outbox.counts()}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the outbound email queue")
+    parser.add_argument("message_id", nargs="?", help="Show one message's delivery status")
+    parser.add_argument("--db", default=os.getenv("EMAIL_OUTBOX_DB", DEFAULT_OUTBOX_DB), help="Outbox database path")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"No outbox found at {args.db}")
+        return
+    outbox = EmailOutbox(args.db)
+    if args.message_id:
+        print(json.dumps(outbox.status(args.message_id), indent=2))
+    else:
+        print(json.dumps(outbox.counts(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Minimal SMTP server for testing the Business MCP email queue offline.
+
+Speaks enough SMTP for smtplib (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT; no AUTH or TLS, so run the queue with SMTP_STARTTLS=false and no
+SMTP_USERNAME). Messages are counted, not delivered. Recipients whose
+address starts with "bounce" are refused with 550 and those starting with
+"tempfail" with 451, so retry and failure handling can be exercised.
+
+    python fake_smtp.py --port 2525 --latency 20
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_STARTTLS=false python mcp/business_mcp/server.py
+"""
+
+import time
+import argparse
+import threading
+import socketserver
+from collections import Counter
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    # Replies are single small writes; don't let Nagle hold them back
+    disable_nagle_algorithm = True
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        server.count("sessions")
+        self.reply("220 fake-smtp ESMTP ready")
+        sender, recipients = None, []
+
+        for raw in self.rfile:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            command, _, argument = line.partition(" ")
+            command = command.upper()
+            server.delay()
+
+            if command in ("EHLO", "HELO"):
+                if command == "EHLO":
+                    self.reply("250-fake-smtp")
+                    self.reply("250-8BITMIME")
+                    self.reply("250 SIZE 10485760")
+                else:
+                    self.reply("250 fake-smtp")
+            elif command == "MAIL":
+                sender, recipients = argument, []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = argument.partition(":")[2].strip().strip("<>").lower()
+                if address.startswith("bounce"):
+                    server.count("refused")
+                    self.reply("550 5.1.1 No such user")
+                elif address.startswith("tempfail"):
+                    server.count("deferred")
+                    self.reply("451 4.3.0 Try again later")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif command == "DATA":
+                if not (sender and recipients):
+                    self.reply("503 Need MAIL and RCPT first")
+                    continue
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for data in self.rfile:
+                    if data in (b".\r\n", b".\n"):
+                        break
+                    size += len(data)
+                server.count("messages")
+                server.count("bytes", size)
+                self.reply("250 OK queued")
+                sender, recipients = None, []
+            elif command == "RSET":
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif command == "NOOP":
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, latency=0.0):
+        super().__init__(address, FakeSMTPHandler)
+        self.latency = latency
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def delay(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def start_fake_smtp(host="127.0.0.1", port=0, latency=0.0):
+    """Start the fake in a background thread; returns the server (see .server_address, .stats)."""
+    server = FakeSMTPServer((host, port), latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake SMTP server that counts messages")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=2525, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every SMTP command")
+    args = parser.parse_args()
+
+    server = FakeSMTPServer((args.host, args.port), args.latency / 1000)
+    print(f"Fake SMTP listening on {args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
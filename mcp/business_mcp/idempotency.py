@@ -0,0 +1,209 @@
+"""
+Idempotency keys for Business MCP tools.
+
+Agents retry tool calls after timeouts. A tool wrapped with `idempotent`
+that is called again with the same `idempotency_key` returns the stored
+result of the first call instead of sending, posting or logging twice.
+Results are kept in a bounded LRU with a TTL and written through to SQLite,
+so keys survive a server restart.
+
+Configuration (environment):
+    IDEMPOTENCY_TTL           Seconds a key is remembered (default 86400)
+    IDEMPOTENCY_MAX_ENTRIES   Keys kept (default 10000)
+    IDEMPOTENCY_DB            Store path
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_IDEMPOTENCY_DB = os.path.join(PROJECT_ROOT, "AI_Employee_Vault", ".idempotency.db")
+
+# Expired and surplus rows are pruned from the database every this many stores
+PRUNE_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+CREATE INDEX IF NOT EXISTS idempotency_created ON idempotency_keys (created_at);
+"""
+
+
+def fingerprint(arguments):
+    """Stable hash of a call's arguments"""
+    return hashlib.sha256(json.dumps(arguments, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Recent (scope, key) -> (fingerprint, result) records: an in-memory LRU
+    in front of a SQLite table. Entries expire `ttl` seconds after they were
+    stored; at most `max_entries` are kept in each.
+    """
+
+    def __init__(self, db_path=DEFAULT_IDEMPOTENCY_DB, ttl=86400, max_entries=10000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per key being executed, so a retry waits for the original call
+        self._in_flight = {}
+        self._stores = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self.connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("IDEMPOTENCY_DB", DEFAULT_IDEMPOTENCY_DB),
+            ttl=float(os.getenv("IDEMPOTENCY_TTL", "86400")),
+            max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")),
+        )
+
+    def connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, scope, key):
+        """The stored (fingerprint, result) for a key, or None if unknown or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None:
+                if entry[0] + self.ttl >= now:
+                    self._entries.move_to_end((scope, key))
+                    return entry[1], entry[2]
+                del self._entries[(scope, key)]
+
+        conn = self.connect()
+        try:
+            row = conn.execute(
+                "SELECT created_at, fingerprint, result FROM idempotency_keys WHERE scope = ? AND key = ?",
+                (scope, key)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or row[0] + self.ttl < now:
+            return None
+        self._remember(scope, key, row[0], row[1], json.loads(row[2]))
+        return row[1], json.loads(row[2])
+
+    def put(self, scope, key, call_fingerprint, result):
+        now = time.time()
+        self._remember(scope, key, now, call_fingerprint, result)
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (scope, key, fingerprint, result, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (scope, key, call_fingerprint, json.dumps(result), now)
+                )
+                self._stores += 1
+                if self._stores % PRUNE_EVERY == 0:
+                    self._prune(conn, now)
+        finally:
+            conn.close()
+
+    def _remember(self, scope, key, created_at, call_fingerprint, result):
+        with self._lock:
+            self._entries[(scope, key)] = (created_at, call_fingerprint, result)
+            self._entries.move_to_end((scope, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _prune(self, conn, now):
+        conn.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM idempotency_keys WHERE rowid NOT IN"
+            " (SELECT rowid FROM idempotency_keys ORDER BY created_at DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def run(self, scope, key, arguments, call):
+        """
+        Return the stored result for this key, or run `call()` and store its
+        result. Error results (strings starting with "Error") are not stored,
+        so a retry after a failure does the work again. Reusing a key with
+        different arguments is refused.
+        """
+        call_fingerprint = fingerprint(arguments)
+        with self._lock:
+            key_lock = self._in_flight.setdefault((scope, key), [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                stored = self.get(scope, key)
+                if stored is not None:
+                    stored_fingerprint, result = stored
+                    if stored_fingerprint != call_fingerprint:
+                        return (f"Error: idempotency key {key!r} was already used for a {scope} call "
+                                f"with different arguments.")
+                    with self._lock:
+                        self.hits += 1
+                    return result
+
+                with self._lock:
+                    self.misses += 1
+                result = call()
+                if not (isinstance(result, str) and result.startswith("Error")):
+                    self.put(scope, key, call_fingerprint, result)
+                return result
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._in_flight[(scope, key)]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "ttl_seconds": self.ttl}
+
+
+def idempotent(store, scope=None):
+    """
+    Decorator for tools that take an optional `idempotency_key` parameter.
+    Calls without a key run normally; calls with a key go through
+    `store.run`, keyed by tool name (or `scope`) and key.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        if "idempotency_key" not in signature.parameters:
+            raise TypeError(f"{func.__name__} must accept an idempotency_key parameter")
+        name = scope or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = bound.arguments.get("idempotency_key")
+            if not key:
+                return func(*args, **kwargs)
+            arguments = {k: v for k, v in bound.arguments.items() if k != "idempotency_key"}
+            return store.run(name, key, arguments, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
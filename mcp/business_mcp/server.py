@@ -1,51 +1,128 @@
 import os
-import subprocess
-import datetime # Added for timestamp
+import sys
+import json
+import datetime
 from mcp.server.fastmcp import FastMCP
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# The social summary skill's logger runs in-process
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "social-summary", "scripts"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "mcp"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+from log_social_post import SocialLogSink
+from instrumentation import instrument
+from email_queue import EmailQueue
+from idempotency import IdempotencyStore, idempotent
+from social_scheduler import SocialScheduler
+
 app = FastMCP(
     name="BusinessMCP",
 )
 
-# Path to the social summary script (relative to project root)
-LOG_SOCIAL_POST_SCRIPT = os.path.join(
-    os.path.dirname(__file__), "..", "..", "social-summary", "scripts", "log_social_post.py"
+# Time every tool below; adds the `metrics` tool and a Prometheus endpoint on port 9102
+tool_metrics = instrument(app, "business", metrics_port=9102)
+
+# Posts are queued here and written to the social log by a background thread
+social_log = SocialLogSink(
+    log_file=os.path.join(PROJECT_ROOT, "AI_Employee_Vault", "Reports", "Social_Log.md"),
+    jsonl_file=os.path.join(PROJECT_ROOT, "AI_Employee_Vault", "Reports", "Social_Log.jsonl"),
 )
 
+# Outbound email goes through a persistent outbox; workers deliver over pooled SMTP sessions
+email_queue = EmailQueue()
+email_queue.start()
+
+# Results of calls made with an idempotency_key, so agent retries don't repeat the work
+idempotency_store = IdempotencyStore.from_env()
+
+# Rate limits shared with the social skills; posts that would have to wait
+# go to the scheduler queue instead
+social_scheduler = SocialScheduler()
+
 @app.tool()
-def send_email(to: str, subject: str, body: str) -> str:
+@idempotent(idempotency_store)
+def send_email(to: str, subject: str, body: str, idempotency_key: str = None) -> str:
     """
-    Sends an email to a specified recipient.
+    Queues an email to a specified recipient for delivery.
 
     Args:
         to: The recipient's email address.
         subject: The subject of the email.
         body: The content of the email.
+        idempotency_key: Optional unique key for this email. Retrying with the
+                         same key returns the original result instead of
+                         sending again.
 
     Returns:
-        A confirmation message.
+        A confirmation message with the message ID; pass it to email_status
+        to follow delivery.
+    """
+    try:
+        message_id = email_queue.send(to, subject, body)
+    except Exception as e:
+        return f"Error queueing email: {str(e)}"
+    mode = " (simulated)" if email_queue.simulated else ""
+    return f"Email queued for delivery{mode}. Message ID: {message_id}"
+
+@app.tool()
+def email_status(message_id: str = None) -> str:
     """
-    # In a real-world scenario, you would integrate with an email service
-    # like SendGrid, AWS SES, or use Python's smtplib.
-    # For this example, we will just log the action.
-    print(f"--- EMAIL SENT ---")
-    print(f"To: {to}")
-    print(f"Subject: {subject}")
-    print(f"Body: {body}")
-    print(f"------------------")
-    return "Email successfully sent (simulated)."
+    Reports the delivery status of a queued email.
+
+    Args:
+        message_id: The ID returned by send_email. If omitted, returns the
+                    number of messages in each status.
+
+    Returns:
+        JSON with the message's status (queued, sending, sent or failed),
+        attempts and last error.
+    """
+    try:
+        if message_id is None:
+            return json.dumps(email_queue.stats(), indent=2)
+        status = email_queue.status(message_id)
+    except Exception as e:
+        return f"Error reading email status: {str(e)}"
+    if status is None:
+        return f"No email found with message ID {message_id}."
+    return json.dumps(status, indent=2)
 
 @app.tool()
-def post_linkedin(content: str) -> str:
+@idempotent(idempotency_store)
+def post_linkedin(content: str, idempotency_key: str = None, schedule_at: str = None, priority: int = 0) -> str:
     """
-    Creates a new post on LinkedIn.
+    Creates a new post on LinkedIn. If the LinkedIn rate limit is used up,
+    the post is queued and published by the social scheduler once it allows.
 
     Args:
         content: The text content of the LinkedIn post.
+        idempotency_key: Optional unique key for this post. Retrying with the
+                         same key returns the original result instead of
+                         posting again.
+        schedule_at: Optional ISO date/time to publish the post at instead of now.
+        priority: Order among scheduled posts that are due (higher goes first).
 
     Returns:
-        A confirmation message.
+        A confirmation message, or the scheduled post's ID and time.
     """
+    if schedule_at:
+        try:
+            at = datetime.datetime.fromisoformat(schedule_at)
+        except ValueError:
+            return f"Error: schedule_at must be an ISO date/time, got {schedule_at!r}."
+        post_id = social_scheduler.schedule("linkedin", content, at=at, priority=priority)
+        return f"LinkedIn post scheduled for {at.isoformat(timespec='seconds')} (scheduled post ID {post_id})."
+
+    # Never sleep here: a blocked tool call stalls the server for every client
+    wait = social_scheduler.reserve("linkedin")
+    if wait > 0:
+        social_scheduler.refund("linkedin")
+        post_id = social_scheduler.schedule("linkedin", content, priority=priority)
+        due = datetime.datetime.now() + datetime.timedelta(seconds=wait)
+        return (f"LinkedIn rate limit reached; post queued as scheduled post ID {post_id}, "
+                f"expected around {due.isoformat(timespec='seconds')}.")
+
     # Real-world implementation would require using the LinkedIn API.
     # This requires setting up an app on the LinkedIn Developer portal,
     # handling OAuth 2.0 authentication, and using a library like 'requests'.
@@ -54,40 +131,30 @@ def post_linkedin(content: str) -> str:
     print(f"Content: {content}")
     print(f"---------------------")
 
-    # Call the social summary script after a successful LinkedIn post
+    # Log the post for the social summary; this only queues the entry
     try:
-        current_time = datetime.datetime.now().isoformat()
-        # Use sys.executable to ensure the correct Python interpreter is used
-        subprocess.run(
-            [sys.executable, LOG_SOCIAL_POST_SCRIPT, "LinkedIn", content, current_time],
-            check=True, # Raise CalledProcessError if the script returns a non-zero exit code
-            capture_output=True,
-            text=True
-        )
-        print(f"Social post logged by {os.path.basename(LOG_SOCIAL_POST_SCRIPT)}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error logging social post: {e.stderr}")
-    except FileNotFoundError:
-        print(f"Error: Social logging script not found at {LOG_SOCIAL_POST_SCRIPT}")
+        social_log.log("LinkedIn", content)
     except Exception as e:
-        print(f"An unexpected error occurred while calling social logging script: {e}")
+        print(f"Error logging social post: {e}")
 
     return "LinkedIn post successfully created (simulated)."
 
 @app.tool()
-def log_activity(message: str) -> str:
+@idempotent(idempotency_store)
+def log_activity(message: str, idempotency_key: str = None) -> str:
     """
     Logs a business activity message to the vault.
 
     Args:
         message: The message to log.
+        idempotency_key: Optional unique key for this entry. Retrying with the
+                         same key returns the original result instead of
+                         logging the line again.
 
     Returns:
         A confirmation message.
     """
-    log_file_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "AI_Employee_Vault", "logs", "business.log"
-    )
+    log_file_path = os.path.join(PROJECT_ROOT, "AI_Employee_Vault", "logs", "business.log")
     
     # Ensure the directory exists
     os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
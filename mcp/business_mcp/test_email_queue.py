@@ -0,0 +1,166 @@
+"""
+EmailQueue delivery against the local SMTP stand-in (fake_smtp.py).
+
+    python -m pytest mcp/business_mcp/test_email_queue.py
+"""
+
+import os
+import sys
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from email_queue import EmailOutbox, EmailQueue, BACKOFF_BASE, BACKOFF_MAX
+from fake_smtp import start_fake_smtp
+
+
+@pytest.fixture
+def smtp_server():
+    server = start_fake_smtp()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_queue(tmp_path, server, workers=2, max_attempts=3):
+    settings = {
+        "host": server.server_address[0],
+        "port": server.server_address[1],
+        "username": None,
+        "password": None,
+        "sender": "ai-employee@example.com",
+        "ssl": False,
+        "starttls": False,
+        "timeout": 5,
+        "max_per_session": 100,
+    }
+    queue = EmailQueue(EmailOutbox(str(tmp_path / "outbox.db")), settings=settings,
+                       workers=workers, max_attempts=max_attempts)
+    # Retry within the test instead of after 30s
+    queue.backoff = lambda attempts: 0.05
+    return queue
+
+
+def test_delivers_over_reused_sessions(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server)
+    queue.start()
+    try:
+        ids = [queue.send(f"user{i}@example.com", f"Subject {i}", "Body") for i in range(50)]
+        assert queue.wait_idle(timeout=20)
+    finally:
+        queue.stop()
+
+    assert all(queue.status(message_id)["status"] == "sent" for message_id in ids)
+    assert queue.status(ids[0])["attempts"] == 1
+    assert smtp_server.stats["messages"] == 50
+    # One session per worker, not one per message
+    assert smtp_server.stats["sessions"] <= 2
+
+
+def test_permanent_rejection_fails_without_retry(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server)
+    queue.start()
+    try:
+        bounced = queue.send("bounce@example.com", "Hello", "Body")
+        delivered = queue.send("ok@example.com", "Hello", "Body")
+        assert queue.wait_idle(timeout=20)
+    finally:
+        queue.stop()
+
+    status = queue.status(bounced)
+    assert status["status"] == "failed"
+    assert status["attempts"] == 1
+    assert status["last_error"].startswith("Recipient refused: 550")
+    # A refused recipient doesn't cost the session the rest of the batch
+    assert queue.status(delivered)["status"] == "sent"
+    assert smtp_server.stats["refused"] == 1
+
+
+def test_temporary_failure_is_retried_then_failed(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server, max_attempts=3)
+    queue.start()
+    try:
+        deferred = queue.send("tempfail@example.com", "Hello", "Body")
+        assert queue.wait_idle(timeout=20)
+    finally:
+        queue.stop()
+
+    status = queue.status(deferred)
+    assert status["status"] == "failed"
+    assert status["attempts"] == 3
+    assert "451" in status["last_error"]
+    assert smtp_server.stats["deferred"] == 3
+
+
+def test_retry_is_scheduled_with_backoff(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server)
+    queue.backoff = lambda attempts: 60
+    queue.start()
+    try:
+        deferred = queue.send("tempfail@example.com", "Hello", "Body")
+        queue.wait_idle(timeout=0.5)
+        status = queue.status(deferred)
+    finally:
+        queue.stop()
+
+    assert status["status"] == "queued"
+    assert status["attempts"] == 1
+    assert status["next_attempt_at"] - status["created_at"] >= 55
+    assert queue.outbox.next_due() > 55
+
+
+def fail_once(queue, method_name):
+    """Make one outbox method raise "database is locked" on its first call"""
+    method = getattr(queue.outbox, method_name)
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return method(*args, **kwargs)
+
+    setattr(queue.outbox, method_name, flaky)
+    return calls
+
+
+def test_worker_recovers_from_outbox_error(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server, workers=1)
+    queue.error_backoff = 0.05
+    calls = fail_once(queue, "claim")
+    queue.start()
+    try:
+        message_id = queue.send("ok@example.com", "Hello", "Body")
+        assert queue.wait_idle(timeout=20)
+        assert all(thread.is_alive() for thread in queue._threads)
+    finally:
+        queue.stop()
+
+    assert len(calls) > 1
+    assert queue.status(message_id)["status"] == "sent"
+
+
+def test_batch_interrupted_by_outbox_error_is_requeued(tmp_path, smtp_server):
+    queue = make_queue(tmp_path, smtp_server, workers=1)
+    queue.error_backoff = 0.05
+    ids = [queue.send(f"user{i}@example.com", "Hello", "Body") for i in range(5)]
+    # Recording the first delivery fails, and so does recording it as a retry,
+    # so the error escapes _deliver with the batch still claimed
+    fail_once(queue, "mark_sent")
+    fail_once(queue, "mark_retry")
+    queue.start()
+    try:
+        assert queue.wait_idle(timeout=20)
+    finally:
+        queue.stop()
+
+    assert all(queue.status(message_id)["status"] == "sent" for message_id in ids)
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(tmp_path):
+    queue = EmailQueue(EmailOutbox(str(tmp_path / "outbox.db")), settings={"host": None, "sender": None})
+    assert BACKOFF_BASE * 0.8 <= queue.backoff(1) <= BACKOFF_BASE * 1.2
+    assert BACKOFF_BASE * 4 * 0.8 <= queue.backoff(3) <= BACKOFF_BASE * 4 * 1.2
+    assert queue.backoff(20) <= BACKOFF_MAX * 1.2
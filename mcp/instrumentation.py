@@ -0,0 +1,299 @@
+"""
+Per-tool instrumentation shared by the FastMCP servers.
+
+`instrument(app, "business")` must be called before the server's tools are
+defined. From then on every `@app.tool()` function, sync or async, is
+wrapped to record:
+
+- call counts and a latency histogram,
+- errors (raised exceptions, and results starting with "Error", which is
+  how the tools report failures),
+- the number of calls in flight.
+
+Optionally, a sample of calls is traced to a JSONL file. A `metrics` tool
+is added to the server, and the same numbers are served in Prometheus text
+format on a small HTTP endpoint.
+
+Configuration (environment):
+    MCP_METRICS_PORT          Prometheus endpoint port (server default; 0 disables)
+    MCP_METRICS_HOST          Address the endpoint binds to (default 127.0.0.1)
+    MCP_TRACE_SAMPLE_RATE     Fraction of calls written to the trace file (default 0)
+    MCP_TRACE_FILE            Trace file (default AI_Employee_Vault/logs/mcp_traces.jsonl)
+"""
+
+import os
+import json
+import time
+import random
+import inspect
+import datetime
+import functools
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_TRACE_FILE = os.path.join(PROJECT_ROOT, "AI_Employee_Vault", "logs", "mcp_traces.jsonl")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Recent calls kept per tool for percentiles and the last-minute rate
+RECENT_SAMPLES = 1024
+
+
+class ToolStats:
+    """Counters, histogram and recent samples for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.exceptions = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        # (finished at, seconds)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds, error, exception):
+        self.calls += 1
+        self.errors += error
+        self.exceptions += exception
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+        self.recent.append((time.time(), seconds))
+
+    def to_dict(self):
+        durations = sorted(seconds for _, seconds in self.recent)
+        minute_ago = time.time() - 60
+
+        def pick(q):
+            return round(durations[min(len(durations) - 1, int(q * len(durations)))] * 1000, 2) if durations else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "exceptions": self.exceptions,
+            "in_flight": self.in_flight,
+            "calls_last_minute": sum(1 for finished, _ in self.recent if finished >= minute_ago),
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else None,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "p99_ms": pick(0.99),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+class ToolMetrics:
+    """Registry of ToolStats for one server, plus the optional call tracer."""
+
+    def __init__(self, server, trace_file=None, sample_rate=0.0):
+        self.server = server
+        self.trace_file = trace_file
+        self.sample_rate = sample_rate
+        self.started = time.time()
+        self._tools = {}
+        self._lock = threading.Lock()
+        self._trace_lock = threading.Lock()
+
+    def _stats(self, tool):
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools.setdefault(tool, ToolStats())
+        return stats
+
+    def begin(self, tool):
+        with self._lock:
+            self._stats(tool).in_flight += 1
+        return time.perf_counter()
+
+    def end(self, tool, started, result=None, exception=None, arguments=None):
+        seconds = time.perf_counter() - started
+        error = exception is not None or (isinstance(result, str) and result.startswith("Error"))
+        with self._lock:
+            stats = self._stats(tool)
+            stats.in_flight -= 1
+            stats.observe(seconds, error, exception is not None)
+        if self.sample_rate and random.random() < self.sample_rate:
+            self.trace(tool, seconds, error, result, exception, arguments)
+
+    def trace(self, tool, seconds, error, result, exception, arguments):
+        """Append one call to the trace file. Argument values are not recorded, only their sizes."""
+        entry = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "server": self.server,
+            "tool": tool,
+            "duration_ms": round(seconds * 1000, 3),
+            "ok": not error,
+            "arguments": {name: len(value) if hasattr(value, "__len__") else type(value).__name__
+                          for name, value in (arguments or {}).items()},
+        }
+        if exception is not None:
+            entry["error"] = f"{type(exception).__name__}: {exception}"[:500]
+        elif error:
+            entry["error"] = result[:500]
+        try:
+            with self._trace_lock:
+                os.makedirs(os.path.dirname(self.trace_file), exist_ok=True)
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Error writing MCP trace: {e}")
+
+    def snapshot(self):
+        """Per-tool statistics, as returned by the metrics tool"""
+        with self._lock:
+            tools = {tool: stats.to_dict() for tool, stats in sorted(self._tools.items())}
+        return {
+            "server": self.server,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "trace_sample_rate": self.sample_rate,
+            "tools": tools,
+        }
+
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            tools = sorted((tool, stats) for tool, stats in self._tools.items())
+            labels = {tool: f'server="{self.server}",tool="{tool}"' for tool, _ in tools}
+
+            family("mcp_tool_calls_total", "counter", "Tool calls completed.")
+            lines += [f"mcp_tool_calls_total{{{labels[tool]}}} {stats.calls}" for tool, stats in tools]
+            family("mcp_tool_errors_total", "counter", "Tool calls that raised or returned an error.")
+            lines += [f"mcp_tool_errors_total{{{labels[tool]}}} {stats.errors}" for tool, stats in tools]
+            family("mcp_tool_exceptions_total", "counter", "Tool calls that raised an exception.")
+            lines += [f"mcp_tool_exceptions_total{{{labels[tool]}}} {stats.exceptions}" for tool, stats in tools]
+            family("mcp_tool_in_flight", "gauge", "Tool calls currently running.")
+            lines += [f"mcp_tool_in_flight{{{labels[tool]}}} {stats.in_flight}" for tool, stats in tools]
+
+            family("mcp_tool_duration_seconds", "histogram", "Tool call duration.")
+            for tool, stats in tools:
+                cumulative = 0
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'mcp_tool_duration_seconds_bucket{{{labels[tool]},le="{bound}"}} {cumulative}')
+                lines.append(f'mcp_tool_duration_seconds_bucket{{{labels[tool]},le="+Inf"}} {stats.calls}')
+                lines.append(f"mcp_tool_duration_seconds_sum{{{labels[tool]}}} {stats.total_seconds:.6f}")
+                lines.append(f"mcp_tool_duration_seconds_count{{{labels[tool]}}} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+    def wrap(self, func, tool):
+        """Instrumented version of a tool function, keeping its signature and sync/async kind"""
+        signature = inspect.signature(func)
+        with self._lock:
+            # Listed with zero calls until first used
+            self._stats(tool)
+
+        def arguments(args, kwargs):
+            if not self.sample_rate:
+                return None
+            try:
+                return signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                return kwargs
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = self.begin(tool)
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as e:
+                    self.end(tool, started, exception=e, arguments=arguments(args, kwargs))
+                    raise
+                self.end(tool, started, result=result, arguments=arguments(args, kwargs))
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = self.begin(tool)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                self.end(tool, started, exception=e, arguments=arguments(args, kwargs))
+                raise
+            self.end(tool, started, result=result, arguments=arguments(args, kwargs))
+            return result
+        return wrapper
+
+
+def serve_prometheus(metrics, host, port):
+    """Serve GET /metrics from a daemon thread; returns the server, or None if the port is unavailable"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"Error starting metrics endpoint on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"{metrics.server}-metrics", daemon=True).start()
+    return server
+
+
+def instrument(app, server, metrics_port=0):
+    """
+    Wrap every tool registered on `app` from now on, add a `metrics` tool,
+    and start the Prometheus endpoint (MCP_METRICS_PORT overrides
+    `metrics_port`; 0 disables it). Returns the ToolMetrics registry.
+    """
+    metrics = ToolMetrics(
+        server,
+        trace_file=os.getenv("MCP_TRACE_FILE", DEFAULT_TRACE_FILE),
+        sample_rate=float(os.getenv("MCP_TRACE_SAMPLE_RATE", "0")),
+    )
+    register = app.tool
+    register_signature = inspect.signature(register)
+
+    @functools.wraps(register)
+    def tool(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        # The registered name may be passed positionally, as in app.tool("x")
+        name = register_signature.bind(*args, **kwargs).arguments.get("name")
+
+        def wrap(func):
+            instrumented = metrics.wrap(func, name or func.__name__)
+            decorator(instrumented)
+            return instrumented
+        return wrap
+
+    app.tool = tool
+
+    @register(name="metrics")
+    def metrics_tool() -> str:
+        """
+        Returns per-tool call statistics for this server: calls, errors,
+        calls in flight, calls in the last minute, and avg/p50/p95/p99/max
+        latency in milliseconds.
+        """
+        return json.dumps(metrics.snapshot(), indent=2)
+
+    port = int(os.getenv("MCP_METRICS_PORT", str(metrics_port)))
+    if port:
+        serve_prometheus(metrics, os.getenv("MCP_METRICS_HOST", "127.0.0.1"), port)
+    return metrics
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+"""
+Load benchmark for the Odoo MCP tools.
+
+Starts fake_odoo.py in a separate process (or uses --url), points the MCP
+server at it and calls the real tool functions at increasing concurrency,
+reporting throughput, latency percentiles and how many JSON-RPC requests
+and connections each level needed.
+
+    python benchmark.py --scenario list --concurrency 1,4,16,64 --latency 50
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+
+
+HERE = Path(__file__).resolve().parent
+
+SCENARIOS = ("list", "create", "payment", "bulk-create", "mixed")
+# Share of each tool in the mixed scenario, per 10 calls
+MIXED_CYCLE = ("list",) * 7 + ("create",) * 2 + ("payment",)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fetch_stats(url):
+    """The fake server's counters, or None when the target is not a fake Odoo."""
+    try:
+        with urllib.request.urlopen(f"{url}/stats", timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def start_fake(args):
+    """Run fake_odoo.py in its own process, so it does not compete with the client for the GIL."""
+    port = free_port()
+    command = [
+        sys.executable, str(HERE / "fake_odoo.py"), "--port", str(port),
+        "--db", args.db, "--username", args.username, "--api-key", args.api_key,
+        "--invoices", str(args.invoices), "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--record-latency", str(args.record_latency), "--error-rate", str(args.error_rate),
+        "--workers", str(args.workers),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while fetch_stats(url) is None:
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("Fake Odoo server did not start")
+        time.sleep(0.1)
+    return process, url
+
+
+def make_call(server, scenario, index, args):
+    """The tool coroutine for the index-th call of a scenario."""
+    if scenario == "mixed":
+        scenario = MIXED_CYCLE[index % len(MIXED_CYCLE)]
+    partner_id = index % args.partners + 1
+    line = [[0, 0, {"product_id": 1, "quantity": 1, "price_unit": 100 + index % 50}]]
+    if scenario == "list":
+        # Cycles through --distinct-queries pages, so a cache TTL can be measured
+        page = index % args.distinct_queries
+        return server.list_invoices(limit=args.page_size, offset=page * args.page_size, order="invoice_date desc, id desc")
+    if scenario == "create":
+        return server.create_invoice(partner_id, line)
+    if scenario == "payment":
+        return server.record_payment(index % args.invoices + 1, 10.0)
+    if scenario == "bulk-create":
+        invoices = [{"partner_id": (index + n) % args.partners + 1, "invoice_line_ids": line}
+                    for n in range(args.batch_size)]
+        return server.create_invoices_bulk(invoices)
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+def is_error(result):
+    """Tools report failures as strings starting with 'Error' (or a bulk summary with failures)."""
+    if not isinstance(result, str):
+        return False
+    if result.startswith("Error") or result.startswith("Network error"):
+        return True
+    if result.startswith("{") and '"failed"' in result:
+        try:
+            return json.loads(result).get("failed", 0) > 0
+        except ValueError:
+            return False
+    return False
+
+
+async def run_level(server, scenario, concurrency, calls, args):
+    """Make `calls` tool calls with at most `concurrency` in flight; returns the level's results."""
+    latencies = []
+    errors = 0
+    samples = []
+    indexes = iter(range(calls))
+
+    async def worker():
+        nonlocal errors
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                result = await make_call(server, scenario, index, args)
+                failed = is_error(result)
+            except Exception as e:
+                result, failed = f"{type(e).__name__}: {e}", True
+            latencies.append(time.perf_counter() - started)
+            if failed:
+                errors += 1
+                if len(samples) < 3:
+                    samples.append(str(result)[:200])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "calls": calls,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(calls / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "error_samples": samples,
+    }
+
+
+async def run_benchmark(server, url, levels, args):
+    results = []
+    for concurrency in levels:
+        # Every level starts with an empty query cache
+        server.client.cache.clear()
+        before = fetch_stats(url)
+        result = await run_level(server, args.scenario, concurrency, args.calls, args)
+        after = fetch_stats(url)
+        if before and after:
+            requests = after.get("requests", 0) - before.get("requests", 0)
+            result["rpc_requests"] = requests
+            result["rpc_per_call"] = round(requests / args.calls, 2)
+            result["connections"] = after.get("connections", 0) - before.get("connections", 0)
+        results.append(result)
+        print_row(result)
+    metrics = server.client.metrics()
+    await server.client.aclose()
+    return results, metrics
+
+
+HEADER = f"{'conc':>5} {'calls':>6} {'errors':>6} {'secs':>7} {'calls/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rpc/call':>8} {'conns':>6}"
+
+
+def print_row(result):
+    print(
+        f"{result['concurrency']:>5} {result['calls']:>6} {result['errors']:>6} {result['seconds']:>7.2f} "
+        f"{result['calls_per_second']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+        f"{result.get('rpc_per_call', '-'):>8} {result.get('connections', '-'):>6}",
+        flush=True
+    )
+    for sample in result["error_samples"]:
+        print(f"        e.g. {sample}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Odoo MCP tools against a fake (or real) Odoo")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="list", help="Tool workload to run")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--calls", type=int, default=200, help="Tool calls per concurrency level")
+    parser.add_argument("--url", help="Benchmark an existing Odoo instead of starting fake_odoo.py")
+    parser.add_argument("--db", default="odoo", help="Database name")
+    parser.add_argument("--username", default="admin", help="Login")
+    parser.add_argument("--api-key", default="admin", help="API key")
+    parser.add_argument("--max-concurrency", type=int, default=10, help="Client connection limit (ODOO_MAX_CONCURRENCY)")
+    parser.add_argument("--cache-ttl", type=float, default=0, help="Query cache TTL in seconds (ODOO_CACHE_TTL; 0 disables)")
+    parser.add_argument("--deadline", type=float, default=30, help="Per-call deadline in seconds (ODOO_CALL_DEADLINE)")
+    parser.add_argument("--page-size", type=int, default=20, help="Invoices per list_invoices call")
+    parser.add_argument("--distinct-queries", type=int, default=50, help="Distinct list_invoices pages to cycle through")
+    parser.add_argument("--batch-size", type=int, default=50, help="Invoices per create_invoices_bulk call")
+    parser.add_argument("--partners", type=int, default=50, help="Partner IDs to use (the fake seeds 50)")
+    parser.add_argument("--invoices", type=int, default=1000, help="Invoices the fake seeds")
+    parser.add_argument("--latency", type=float, default=20, help="Fake server latency per call in ms")
+    parser.add_argument("--jitter", type=float, default=5, help="Fake server latency jitter in ms")
+    parser.add_argument("--record-latency", type=float, default=0.2, help="Fake server latency per record in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake server calls that fail")
+    parser.add_argument("--workers", type=int, default=0, help="Fake server requests served at once (0 = unlimited)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    process = None
+    if args.url:
+        url = args.url.rstrip("/")
+    else:
+        process, url = start_fake(args)
+
+    # The server module builds its client from the environment at import time
+    os.environ.update({
+        "ODOO_URL": url,
+        "ODOO_DATABASE": args.db,
+        "ODOO_USERNAME": args.username,
+        "ODOO_API_KEY": args.api_key,
+        "ODOO_MAX_CONCURRENCY": str(args.max_concurrency),
+        "ODOO_CACHE_TTL": str(args.cache_ttl),
+        "ODOO_CALL_DEADLINE": str(args.deadline),
+    })
+    sys.path.insert(0, str(HERE))
+    import server
+
+    try:
+        print(f"Scenario '{args.scenario}' against {url}: {args.calls} calls per level, "
+              f"client max concurrency {args.max_concurrency}, cache TTL {args.cache_ttl}s")
+        if process:
+            print(f"Fake Odoo: {args.latency}ms +/- {args.jitter}ms per call, {args.record_latency}ms per record, "
+                  f"error rate {args.error_rate}, workers {args.workers or 'unlimited'}")
+        print(HEADER)
+        results, metrics = asyncio.run(run_benchmark(server, url, levels, args))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    print(f"Client: {metrics['authentications']} authentication(s), cache {metrics['cache']}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results, "client": metrics}, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
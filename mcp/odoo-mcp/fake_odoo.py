@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+
+"""
+Fake Odoo JSON-RPC server for offline testing and benchmarking of the Odoo MCP.
+
+Implements `common.authenticate` and `object.execute_kw` with `create`, `read`,
+`search_read` and `action_post` on account.move and account.payment (plus
+`read`/`search_read` on res.partner), backed by an in-memory store. Latency,
+server capacity and failures can be injected, and GET /stats reports the
+calls received so pooling, batching and caching can be measured.
+
+    python fake_odoo.py --port 8069 --latency 50 --error-rate 0.01
+"""
+
+import json
+import time
+import random
+import datetime
+import argparse
+import itertools
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+MODELS = ("res.partner", "account.move", "account.payment")
+
+# Many2one fields and the model they point to; read back as [id, display_name]
+MANY2ONE = {
+    "partner_id": "res.partner",
+    "journal_id": "account.journal",
+    "currency_id": "res.currency",
+}
+
+JOURNALS = {1: "Customer Invoices", 2: "Bank"}
+CURRENCIES = {1: "USD"}
+
+OPERATORS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+    "like": lambda a, b: str(b) in str(a or ""),
+    "ilike": lambda a, b: str(b).lower() in str(a or "").lower(),
+    "not ilike": lambda a, b: str(b).lower() not in str(a or "").lower(),
+}
+
+
+def sort_key(value):
+    # Unset fields (None/False) sort last, as in PostgreSQL's default ordering
+    unset = value is None or value is False
+    return (unset, 0 if unset else value)
+
+
+class FakeOdooError(Exception):
+    """Raised inside a call; becomes a JSON-RPC error response."""
+
+    def __init__(self, name, message):
+        super().__init__(message)
+        self.name = name
+
+
+def validation_error(message):
+    return FakeOdooError("odoo.exceptions.ValidationError", message)
+
+
+def user_error(message):
+    return FakeOdooError("odoo.exceptions.UserError", message)
+
+
+class FakeOdoo:
+    """
+    In-memory Odoo database. Every write is all-or-nothing like an Odoo
+    transaction: a multi-record create or action_post with one invalid record
+    changes nothing.
+    """
+
+    def __init__(self, db="odoo", username="admin", api_key="admin", partners=50, invoices=1000,
+                 latency=0.0, jitter=0.0, record_latency=0.0, error_rate=0.0, http_error_rate=0.0,
+                 auth_error_rate=0.0, workers=0, seed=1):
+        self.db = db
+        self.username = username
+        self.api_key = api_key
+        self.uid = 2
+        # Latencies in seconds
+        self.latency = latency
+        self.jitter = jitter
+        self.record_latency = record_latency
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.auth_error_rate = auth_error_rate
+        # Like Odoo's worker count: requests beyond it wait for a free worker
+        self.workers = threading.BoundedSemaphore(workers) if workers else None
+        self.random = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.records = {model: {} for model in MODELS}
+        self.ids = {model: itertools.count(1) for model in MODELS}
+        self.stats = Counter()
+        self.calls = Counter()
+        self.started = time.time()
+
+        for _ in range(partners):
+            partner_id = next(self.ids["res.partner"])
+            self.records["res.partner"][partner_id] = {"id": partner_id, "name": f"Partner {partner_id}"}
+        today = datetime.date.today()
+        for index in range(invoices):
+            self._insert("account.move", self._invoice_vals({
+                "partner_id": self.random.randint(1, partners) if partners else 0,
+                "invoice_date": (today - datetime.timedelta(days=index % 365)).isoformat(),
+                "invoice_line_ids": [[0, 0, {"quantity": 1, "price_unit": self.random.randint(50, 5000)}]],
+            }), state=self.random.choice(("draft", "posted", "posted")))
+
+    # --- Request handling ---
+
+    def handle(self, body):
+        """Answer one JSON-RPC request body; returns (http_status, response dict or None)."""
+        self.count("requests")
+        if self.http_error_rate and self.random.random() < self.http_error_rate:
+            self.count("injected_http_errors")
+            return 503, None
+
+        params = body.get("params") or {}
+        try:
+            result = self.dispatch(params.get("service"), params.get("method"), params.get("args") or [])
+            response = {"result": result}
+        except (FakeOdooError, TypeError, ValueError, KeyError) as e:
+            # Failed calls still cost a round trip on a real server
+            self.delay()
+            self.count("errors")
+            name = getattr(e, "name", f"builtins.{type(e).__name__}")
+            response = {"error": {"code": 200, "message": "Odoo Server Error",
+                                  "data": {"name": name, "message": str(e)}}}
+        return 200, {"jsonrpc": "2.0", "id": body.get("id"), **response}
+
+    def dispatch(self, service, method, args):
+        if service == "common" and method == "authenticate":
+            self.count_call("common.authenticate")
+            db, login, password = args[:3]
+            self.delay()
+            return self.uid if (db, login, password) == (self.db, self.username, self.api_key) else False
+        if service == "common" and method == "version":
+            return {"server_version": "17.0", "server_serie": "17.0"}
+        if service != "object" or method != "execute_kw":
+            raise FakeOdooError("builtins.KeyError", f"Unsupported call {service}.{method}")
+
+        db, uid, password, model, model_method = args[:5]
+        call_args = args[5] if len(args) > 5 else []
+        kwargs = args[6] if len(args) > 6 else {}
+        self.count_call(f"{model}.{model_method}")
+
+        if (db, uid, password) != (self.db, self.uid, self.api_key):
+            raise FakeOdooError("odoo.exceptions.AccessDenied", "Access Denied")
+        if self.auth_error_rate and self.random.random() < self.auth_error_rate:
+            self.count("injected_auth_errors")
+            raise FakeOdooError("odoo.http.SessionExpiredException", "Session expired")
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.count("injected_errors")
+            raise user_error("Injected failure")
+        if model not in self.records:
+            raise FakeOdooError("builtins.KeyError", f"Model {model} does not exist")
+
+        handler = getattr(self, f"rpc_{model_method}", None)
+        if handler is None:
+            raise FakeOdooError("builtins.AttributeError", f"The method '{model_method}' does not exist on the model '{model}'")
+        return handler(model, *call_args, **kwargs)
+
+    def count(self, key, amount=1):
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def count_call(self, key):
+        with self.stats_lock:
+            self.calls[key] += 1
+
+    def delay(self, records=0):
+        """Sleep for the configured call latency plus a per-record cost."""
+        seconds = self.latency + records * self.record_latency
+        if self.jitter:
+            seconds += self.random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    # --- Model methods ---
+
+    def rpc_create(self, model, vals_list):
+        many = isinstance(vals_list, list)
+        rows = vals_list if many else [vals_list]
+        if model == "res.partner":
+            raise user_error("Creating partners is not supported by the fake server")
+        with self.lock:
+            prepared = [self._prepare(model, vals) for vals in rows]
+            ids = [self._insert(model, vals) for vals in prepared]
+        self.count("records_created", len(ids))
+        self.delay(len(ids))
+        return ids if many else ids[0]
+
+    def rpc_read(self, model, ids, fields=None):
+        with self.lock:
+            records = [self._render(model, self.records[model][record_id], fields)
+                       for record_id in ids if record_id in self.records[model]]
+        self.delay(len(records))
+        return records
+
+    def rpc_search_read(self, model, domain=None, fields=None, offset=0, limit=None, order=None):
+        with self.lock:
+            matches = [record for record in self.records[model].values() if self._match(domain or [], record)]
+            for term in reversed((order or "id").split(",")):
+                field, _, direction = term.strip().partition(" ")
+                matches.sort(key=lambda record: sort_key(record.get(field)),
+                             reverse=direction.strip().lower() == "desc")
+            page = matches[offset:offset + limit if limit else None]
+            records = [self._render(model, record, fields) for record in page]
+        self.delay(len(records))
+        return records
+
+    def rpc_action_post(self, model, ids):
+        if model not in ("account.move", "account.payment"):
+            raise FakeOdooError("builtins.AttributeError", f"The method 'action_post' does not exist on the model '{model}'")
+        with self.lock:
+            records = []
+            for record_id in ids:
+                record = self.records[model].get(record_id)
+                if record is None:
+                    raise user_error(f"Record {model}({record_id},) does not exist or has been deleted.")
+                if record["state"] != "draft":
+                    raise user_error(f"Only draft entries can be posted ({record['name']} is {record['state']}).")
+                if model == "account.payment" and record["amount"] <= 0:
+                    raise validation_error("The payment amount must be strictly positive.")
+                records.append(record)
+            for record in records:
+                record["state"] = "posted"
+        self.delay(len(records))
+        return True
+
+    # --- Store helpers ---
+
+    def _prepare(self, model, vals):
+        """Validate create values and fill in computed fields; raises on invalid input."""
+        if not isinstance(vals, dict):
+            raise validation_error(f"Invalid values {vals!r}")
+        if vals.get("partner_id") not in self.records["res.partner"]:
+            raise validation_error(f"Record res.partner({vals.get('partner_id')},) does not exist or has been deleted.")
+        if model == "account.move":
+            return self._invoice_vals(vals)
+        if vals.get("journal_id") not in JOURNALS:
+            raise validation_error(f"Record account.journal({vals.get('journal_id')},) does not exist or has been deleted.")
+        return {
+            "payment_type": "inbound",
+            "partner_type": "customer",
+            "currency_id": 1,
+            "date": datetime.date.today().isoformat(),
+            **vals,
+        }
+
+    def _invoice_vals(self, vals):
+        lines = vals.get("invoice_line_ids") or []
+        amount = 0.0
+        for line in lines:
+            if not (isinstance(line, (list, tuple)) and len(line) == 3 and line[0] == 0 and isinstance(line[2], dict)):
+                raise validation_error(f"Invalid invoice line command {line!r}")
+            amount += float(line[2].get("quantity", 1)) * float(line[2].get("price_unit", 0))
+        if vals.get("move_type", "out_invoice") == "out_invoice" and not lines:
+            raise user_error("An invoice needs at least one line.")
+        return {
+            "move_type": "out_invoice",
+            "journal_id": 1,
+            "currency_id": 1,
+            "invoice_date": datetime.date.today().isoformat(),
+            "ref": False,
+            **vals,
+            "invoice_line_ids": list(range(1, len(lines) + 1)),
+            "amount_total": round(amount, 2),
+        }
+
+    def _insert(self, model, vals, state="draft"):
+        record_id = next(self.ids[model])
+        prefix = "INV" if model == "account.move" else "PBNK"
+        self.records[model][record_id] = {
+            "state": state, **vals, "id": record_id,
+            "name": f"{prefix}/{datetime.date.today().year}/{record_id:05d}",
+        }
+        return record_id
+
+    def _render(self, model, record, fields):
+        fields = fields or list(record)
+        rendered = {"id": record["id"]}
+        for field in fields:
+            value = record.get(field, False)
+            target = MANY2ONE.get(field)
+            if target and value:
+                rendered[field] = [value, self._display_name(target, value)]
+            else:
+                rendered[field] = value
+        return rendered
+
+    def _display_name(self, model, record_id):
+        if model == "account.journal":
+            return JOURNALS.get(record_id, str(record_id))
+        if model == "res.currency":
+            return CURRENCIES.get(record_id, str(record_id))
+        return self.records[model].get(record_id, {}).get("name", str(record_id))
+
+    def _match(self, domain, record):
+        """Evaluate an Odoo domain (prefix '&', '|', '!' and [field, operator, value] terms)."""
+        stack = []
+        for term in reversed(domain):
+            if term == "&":
+                stack.append(stack.pop() & stack.pop())
+            elif term == "|":
+                stack.append(stack.pop() | stack.pop())
+            elif term == "!":
+                stack.append(not stack.pop())
+            else:
+                field, operator, value = term
+                if operator not in OPERATORS:
+                    raise validation_error(f"Invalid domain operator {operator!r}")
+                stack.append(bool(OPERATORS[operator](record.get(field), value)))
+        return all(stack)
+
+    def snapshot(self):
+        """Counters for GET /stats."""
+        with self.lock, self.stats_lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                **dict(self.stats),
+                "calls": dict(self.calls),
+                "records": {model: len(records) for model, records in self.records.items()},
+            }
+
+
+class FakeOdooHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so connection pooling in the client is visible in the stats
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle on, delayed ACKs add ~40ms per call
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.fake.count("connections")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self.send_json(200, self.server.fake.snapshot())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/jsonrpc":
+            self.send_json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+
+        fake = self.server.fake
+        if fake.workers:
+            with fake.workers:
+                status, response = fake.handle(body)
+        else:
+            status, response = fake.handle(body)
+        self.send_json(status, response)
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeOdooServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, fake, verbose=False):
+        super().__init__(address, FakeOdooHandler)
+        self.fake = fake
+        self.verbose = verbose
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_fake_odoo(host="127.0.0.1", port=0, **options):
+    """Start a fake Odoo in a background thread; returns the server (see .url, .fake, .shutdown())."""
+    server = FakeOdooServer((host, port), FakeOdoo(**options))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Odoo JSON-RPC server")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8069, help="Port to listen on (0 picks a free port)")
+    parser.add_argument("--db", default="odoo", help="Database name clients must use")
+    parser.add_argument("--username", default="admin", help="Login clients must use")
+    parser.add_argument("--api-key", default="admin", help="API key clients must use")
+    parser.add_argument("--partners", type=int, default=50, help="Partners to seed")
+    parser.add_argument("--invoices", type=int, default=1000, help="Customer invoices to seed")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- milliseconds added to the latency")
+    parser.add_argument("--record-latency", type=float, default=0.0, help="Milliseconds added per record created, read or posted")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of model calls failing with a UserError")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--auth-error-rate", type=float, default=0.0, help="Fraction of model calls failing with an expired session")
+    parser.add_argument("--workers", type=int, default=0, help="Requests served at once (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for seeding data and injected failures")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    fake = FakeOdoo(
+        db=args.db, username=args.username, api_key=args.api_key,
+        partners=args.partners, invoices=args.invoices,
+        latency=args.latency / 1000, jitter=args.jitter / 1000, record_latency=args.record_latency / 1000,
+        error_rate=args.error_rate, http_error_rate=args.http_error_rate, auth_error_rate=args.auth_error_rate,
+        workers=args.workers, seed=args.seed,
+    )
+    server = FakeOdooServer((args.host, args.port), fake, verbose=args.verbose)
+    print(f"Fake Odoo listening on {server.url} (db={args.db}, user={args.username}); stats at {server.url}/stats",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+import os
+import json
+import asyncio
+import time
+import itertools
+import threading
+from collections import deque, OrderedDict
+
+import httpx
+
+
+# Odoo exception names that mean the cached uid/credentials are no longer valid
+AUTH_ERROR_NAMES = {
+    "odoo.exceptions.AccessDenied",
+    "odoo.http.SessionExpiredException",
+}
+
+
+# Methods that never modify data; results of these may be cached
+READ_METHODS = {"search", "search_read", "search_count", "read", "read_group", "name_search", "fields_get"}
+
+
+class OdooError(Exception):
+    """An error returned in a JSON-RPC response from Odoo."""
+
+    def __init__(self, message, code=None, name=None, data=None):
+        super().__init__(message)
+        self.code = code
+        self.name = name
+        self.data = data
+
+
+class OdooAuthError(OdooError):
+    """Authentication failed or the cached session is no longer accepted."""
+
+
+class CallStats:
+    """Latency statistics for one kind of Odoo call."""
+
+    def __init__(self, samples=256):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent = deque(maxlen=samples)
+
+    def observe(self, seconds, ok):
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.recent.append(seconds)
+
+    def to_dict(self):
+        recent = sorted(self.recent)
+
+        def pick(q):
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 2) if recent else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else None,
+            "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+class QueryCache:
+    """
+    TTL cache for read results, bounded to `max_entries` (least recently
+    used entries are evicted first).
+    """
+
+    def __init__(self, ttl=30, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every clear, so reads that started before a write aren't cached
+        self.generation = 0
+
+    @staticmethod
+    def key(model, method, args, kwargs):
+        return json.dumps([model, method, args, kwargs], sort_keys=True, default=str)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, generation):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl}
+
+
+class AsyncOdooClient:
+    """
+    Non-blocking JSON-RPC client for Odoo on `httpx.AsyncClient`.
+
+    At most `max_concurrency` calls are in flight per Odoo host (further
+    calls wait on a semaphore rather than opening more connections), and
+    every `execute_kw` runs under a deadline that covers queueing,
+    re-authentication and the request itself.
+
+    The uid from `common.authenticate` is cached and reused for every
+    `execute_kw`; it is only refreshed when Odoo answers with an auth error.
+    Read calls made with `cache=True` are served from a TTL cache. Any
+    other call is treated as a write and clears the whole cache, since a
+    write to one model (e.g. posting a payment) can change reads of another
+    (the invoice's payment state).
+    """
+
+    def __init__(self, url, db, username, api_key, timeout=10, max_concurrency=10, deadline=15, cache_ttl=30):
+        self.url = (url or "").rstrip("/")
+        self.db = db
+        self.username = username
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+
+        self._uid = None
+        self._ids = itertools.count(1)
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self.authentications = 0
+        self.cache = QueryCache(ttl=cache_ttl)
+
+        self._client = None
+        self._semaphores = {}
+        self._auth_lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Build a client from the ODOO_* environment variables."""
+        kwargs.setdefault("cache_ttl", float(os.getenv("ODOO_CACHE_TTL", "30")))
+        kwargs.setdefault("max_concurrency", int(os.getenv("ODOO_MAX_CONCURRENCY", "10")))
+        kwargs.setdefault("deadline", float(os.getenv("ODOO_CALL_DEADLINE", "15")))
+        return cls(
+            os.getenv("ODOO_URL"),
+            os.getenv("ODOO_DATABASE"),
+            os.getenv("ODOO_USERNAME"),
+            os.getenv("ODOO_API_KEY"),
+            **kwargs,
+        )
+
+    def _payload(self, service, method, args):
+        return {
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": args},
+            "id": next(self._ids),
+        }
+
+    @staticmethod
+    def _result(body):
+        """Return the result of a JSON-RPC response body, raising OdooError on an error response."""
+        error = body.get("error")
+        if error:
+            data = error.get("data") or {}
+            name = data.get("name")
+            message = data.get("message") or error.get("message") or str(error)
+            error_class = OdooAuthError if name in AUTH_ERROR_NAMES or "Access Denied" in message else OdooError
+            raise error_class(message, code=error.get("code"), name=name, data=data)
+        return body.get("result")
+
+    def _authenticated(self, uid):
+        if not uid:
+            raise OdooAuthError("Authentication failed: invalid database, username or API key")
+        self._uid = uid
+        self.authentications += 1
+        return uid
+
+    def _execute_args(self, uid, model, method, args, kwargs):
+        return [self.db, uid, self.api_key, model, method, args, kwargs or {}]
+
+    def _cache_lookup(self, model, method, args, kwargs, cache):
+        """Returns (key, cached result); key is None when the call may not be cached."""
+        if not (cache and method in READ_METHODS):
+            return None, None
+        key = QueryCache.key(model, method, args, kwargs)
+        return key, self.cache.get(key)
+
+    def _record(self, key, started, ok):
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._stats.setdefault(key, CallStats()).observe(elapsed, ok)
+
+    @staticmethod
+    def _page_domain(domain, last_id, descending):
+        page_domain = list(domain)
+        if last_id is not None:
+            page_domain.append(["id", "<" if descending else ">", last_id])
+        return page_domain
+
+    @staticmethod
+    def _page_kwargs(fields, page_size, descending):
+        fields = list(fields)
+        if "id" not in fields:
+            fields.append("id")
+        return {"fields": fields, "limit": page_size, "order": "id desc" if descending else "id asc"}
+
+    def metrics(self):
+        """Per-call latency statistics plus how often the client authenticated."""
+        with self._stats_lock:
+            calls = {key: stats.to_dict() for key, stats in sorted(self._stats.items())}
+        return {"authentications": self.authentications, "cache": self.cache.stats(), "calls": calls}
+
+    def _http(self):
+        # Created lazily so the connection pool belongs to the running event loop
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(
+                # Only connection failures are retried: a POST that reached Odoo may have had effects
+                transport=httpx.AsyncHTTPTransport(retries=2, limits=limits),
+                timeout=self.timeout,
+            )
+        return self._client
+
+    def _semaphore(self):
+        host = httpx.URL(self.url).host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[host]
+
+    async def call(self, service, method, args, stats_key=None):
+        """Send one JSON-RPC call and return its result, raising OdooError on an error response."""
+        payload = self._payload(service, method, args)
+        async with self._semaphore():
+            started = time.perf_counter()
+            ok = False
+            try:
+                response = await self._http().post(f"{self.url}/jsonrpc", json=payload)
+                response.raise_for_status()
+                result = self._result(response.json())
+                ok = True
+                return result
+            finally:
+                self._record(stats_key or f"{service}.{method}", started, ok)
+
+    async def authenticate(self):
+        """Authenticate and cache the uid."""
+        return self._authenticated(await self.call("common", "authenticate", [self.db, self.username, self.api_key, {}]))
+
+    async def get_uid(self):
+        """The cached uid, authenticating on first use."""
+        if self._uid is None:
+            async with self._auth_lock:
+                if self._uid is None:
+                    await self.authenticate()
+        return self._uid
+
+    async def invalidate(self, uid):
+        """Drop the cached uid if it is still the one that was rejected."""
+        async with self._auth_lock:
+            if self._uid == uid:
+                self._uid = None
+
+    async def execute_kw(self, model, method, args, kwargs=None, cache=False, deadline=None):
+        """
+        Call a model method, re-authenticating once if the cached uid is rejected.
+        With `cache=True`, read methods are answered from the query cache when possible.
+        Raises asyncio.TimeoutError if the call does not finish within the deadline.
+        """
+        key, cached = self._cache_lookup(model, method, args, kwargs, cache)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+
+        try:
+            result = await asyncio.wait_for(self._execute_with_reauth(model, method, args, kwargs),
+                                            deadline or self.deadline)
+        finally:
+            if method not in READ_METHODS:
+                # Even a failed or timed-out write may have changed data
+                self.cache.clear()
+
+        if key is not None:
+            self.cache.put(key, result, generation)
+        return result
+
+    async def _execute_with_reauth(self, model, method, args, kwargs):
+        uid = await self.get_uid()
+        try:
+            return await self._execute(uid, model, method, args, kwargs)
+        except OdooAuthError:
+            await self.invalidate(uid)
+            return await self._execute(await self.get_uid(), model, method, args, kwargs)
+
+    async def _execute(self, uid, model, method, args, kwargs):
+        return await self.call("object", "execute_kw", self._execute_args(uid, model, method, args, kwargs),
+                               stats_key=f"{model}.{method}")
+
+    async def iter_search_read(self, model, domain, fields, page_size=500, descending=False):
+        """
+        Yield pages of records matching `domain`, paginating on id (keyset)
+        rather than offset so each page is a cheap indexed range scan.
+        Pages are not cached.
+        """
+        last_id = None
+        kwargs = self._page_kwargs(fields, page_size, descending)
+        while True:
+            records = await self.execute_kw(model, "search_read", [self._page_domain(domain, last_id, descending)], kwargs)
+            if not records:
+                return
+            yield records
+            if len(records) < page_size:
+                return
+            last_id = records[-1]["id"]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
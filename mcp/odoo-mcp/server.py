@@ -1,67 +1,64 @@
 import os
-import requests
+import re
+import sys
 import json
+import asyncio
+import logging
 import datetime
+import httpx
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
 
+from odoo_client import AsyncOdooClient, OdooError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from instrumentation import instrument
+
 # Load environment variables from .env
 load_dotenv()
 
+# httpx logs every request at INFO; keep the server log readable
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 app = FastMCP(
     name="OdooMCP",
 )
 
-ODOO_URL = os.getenv("ODOO_URL")
-ODOO_DB = os.getenv("ODOO_DATABASE")
-ODOO_USERNAME = os.getenv("ODOO_USERNAME")
-ODOO_API_KEY = os.getenv("ODOO_API_KEY")
+# Time every tool below; adds the `metrics` tool and a Prometheus endpoint on port 9103
+tool_metrics = instrument(app, "odoo", metrics_port=9103)
 
-def execute_kw(model, method, args, kwargs=None):
-    """Executes a JSON-RPC call to Odoo."""
-    if kwargs is None:
-        kwargs = {}
-    
-    # 1. Authenticate
-    auth_payload = {
-        "jsonrpc": "2.0",
-        "method": "call",
-        "params": {
-            "service": "common",
-            "method": "authenticate",
-            "args": [ODOO_DB, ODOO_USERNAME, ODOO_API_KEY, {}]
-        },
-        "id": 1
-    }
-    
+# One authenticated, connection-pooled client shared by all tools; concurrent
+# tool calls share its ODOO_MAX_CONCURRENCY connections instead of blocking each other
+client = AsyncOdooClient.from_env()
+
+# Records per multi-record create call in the bulk tools
+BULK_CHUNK_SIZE = 100
+
+INVOICE_DOMAIN = [['move_type', '=', 'out_invoice']]
+DEFAULT_INVOICE_FIELDS = ['name', 'partner_id', 'amount_total', 'state', 'invoice_date']
+# "field [asc|desc]" terms, comma separated
+ORDER_PATTERN = re.compile(r'^\s*\w+(\s+(asc|desc))?(\s*,\s*\w+(\s+(asc|desc))?)*\s*$', re.IGNORECASE)
+EXPORT_DIR = os.getenv("ODOO_EXPORT_DIR", os.path.join("AI_Employee_Vault", "Exports"))
+
+def invoice_domain(domain):
+    """Customer-invoice domain plus caller filters, which must be [field, operator, value] triples."""
+    domain = domain or []
+    for term in domain:
+        if not (isinstance(term, (list, tuple)) and len(term) == 3 and isinstance(term[0], str)):
+            raise ValueError(f"Invalid domain term {term!r}; expected [field, operator, value]")
+    return INVOICE_DOMAIN + [list(term) for term in domain]
+
+async def execute_kw(model, method, args, kwargs=None, cache=False):
+    """Executes a JSON-RPC call to Odoo. Reads with cache=True may be served from the query cache."""
     try:
-        response = requests.post(f"{ODOO_URL}/jsonrpc", json=auth_payload, timeout=10)
-        response.raise_for_status()
-        uid = response.json().get("result")
-        
-        if not uid:
-            error = response.json().get("error")
-            raise Exception(f"Authentication failed: {error}")
-
-        # 2. Execute method
-        call_payload = {
-            "jsonrpc": "2.0",
-            "method": "call",
-            "params": {
-                "service": "object",
-                "method": "execute_kw",
-                "args": [ODOO_DB, uid, ODOO_API_KEY, model, method, args, kwargs]
-            },
-            "id": 2
-        }
-        response = requests.post(f"{ODOO_URL}/jsonrpc", json=call_payload, timeout=10)
-        response.raise_for_status()
-        return response.json().get("result")
-    except requests.exceptions.RequestException as e:
+        return await client.execute_kw(model, method, args, kwargs, cache=cache)
+    except httpx.HTTPError as e:
         raise Exception(f"Network error communicating with Odoo: {str(e)}")
+    except asyncio.TimeoutError:
+        raise Exception(f"Odoo call {model}.{method} exceeded its {client.deadline}s deadline")
 
 @app.tool()
-def create_invoice(partner_id: int, invoice_line_ids: list) -> str:
+async def create_invoice(partner_id: int, invoice_line_ids: list) -> str:
     """
     Creates an invoice (account.move) in Odoo.
     
@@ -71,7 +68,7 @@ def create_invoice(partner_id: int, invoice_line_ids: list) -> str:
                          Example: [[0, 0, {'product_id': 1, 'quantity': 1, 'price_unit': 100}]]
     """
     try:
-        invoice_id = execute_kw('account.move', 'create', [{
+        invoice_id = await execute_kw('account.move', 'create', [{
             'partner_id': partner_id,
             'move_type': 'out_invoice',
             'invoice_line_ids': invoice_line_ids
@@ -81,25 +78,96 @@ def create_invoice(partner_id: int, invoice_line_ids: list) -> str:
         return f"Error creating invoice: {str(e)}"
 
 @app.tool()
-def list_invoices(limit: int = 10) -> str:
+async def list_invoices(limit: int = 10, offset: int = 0, cursor: int = None, fields: list = None,
+                  domain: list = None, order: str = 'id desc') -> str:
     """
-    Lists recent customer invoices.
-    
+    Lists customer invoices, one page at a time. Identical queries within
+    ODOO_CACHE_TTL seconds are answered from cache; any write made through
+    this server clears the cache.
+
     Args:
         limit: Maximum number of invoices to retrieve.
+        offset: Number of matching invoices to skip (offset pagination).
+        cursor: The 'next_cursor' from a previous page. Only valid with order
+                'id desc' or 'id asc'; cheaper than offset for deep pages.
+        fields: Fields to return (default: name, partner_id, amount_total, state, invoice_date).
+        domain: Extra Odoo domain filters, e.g. [['state', '=', 'posted'], ['amount_total', '>', 1000]].
+        order: Sort order, e.g. 'invoice_date desc, id desc'.
+
+    Returns JSON with 'invoices' and 'next_cursor' (id order) or 'next_offset'
+    (other orders); these are null on the last page.
     """
     try:
-        invoices = execute_kw('account.move', 'search_read', [[['move_type', '=', 'out_invoice']]], {
-            'fields': ['name', 'partner_id', 'amount_total', 'state', 'invoice_date'],
+        if not ORDER_PATTERN.match(order or ''):
+            return f"Error listing invoices: invalid order {order!r}"
+        normalized_order = ' '.join(order.lower().split())
+        keyset = normalized_order in ('id desc', 'id asc', 'id')
+        if cursor is not None and not keyset:
+            return "Error listing invoices: cursor pagination requires order 'id desc' or 'id asc'"
+
+        search_domain = invoice_domain(domain)
+        if cursor is not None:
+            search_domain.append(['id', '<' if normalized_order == 'id desc' else '>', cursor])
+        fields = list(fields or DEFAULT_INVOICE_FIELDS)
+        if 'id' not in fields:
+            fields.append('id')
+
+        invoices = await execute_kw('account.move', 'search_read', [search_domain], {
+            'fields': fields,
             'limit': limit,
-            'order': 'id desc'
-        })
-        return json.dumps(invoices, indent=2)
+            'offset': 0 if cursor is not None else offset,
+            'order': order
+        }, cache=True)
+
+        full_page = len(invoices) == limit
+        return json.dumps({
+            'invoices': invoices,
+            'count': len(invoices),
+            'next_cursor': invoices[-1]['id'] if full_page and keyset else None,
+            'next_offset': offset + len(invoices) if full_page and not keyset else None
+        }, separators=(',', ':'))
     except Exception as e:
         return f"Error listing invoices: {str(e)}"
 
 @app.tool()
-def record_payment(invoice_id: int, amount: float, payment_date: str = None) -> str:
+async def export_invoices(fields: list = None, domain: list = None, page_size: int = 500,
+                    max_rows: int = None, filename: str = None) -> str:
+    """
+    Streams every matching customer invoice to an NDJSON file (one JSON object
+    per line), fetching pages by id so memory use stays at one page.
+
+    Args:
+        fields: Fields to export (default: name, partner_id, amount_total, state, invoice_date).
+        domain: Extra Odoo domain filters, as for list_invoices.
+        page_size: Invoices fetched per request.
+        max_rows: Stop after this many invoices.
+        filename: Output file name inside ODOO_EXPORT_DIR (default: timestamped).
+
+    Returns JSON with the output path, rows written and pages fetched.
+    """
+    try:
+        search_domain = invoice_domain(domain)
+        filename = os.path.basename(filename or f"invoices_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson")
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, filename)
+
+        rows = pages = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            async for page in client.iter_search_read('account.move', search_domain,
+                                                fields or DEFAULT_INVOICE_FIELDS, page_size=max(1, page_size)):
+                pages += 1
+                if max_rows is not None:
+                    page = page[:max_rows - rows]
+                f.writelines(json.dumps(record, separators=(',', ':')) + '\n' for record in page)
+                rows += len(page)
+                if max_rows is not None and rows >= max_rows:
+                    break
+        return json.dumps({'path': path, 'rows': rows, 'pages': pages})
+    except Exception as e:
+        return f"Error exporting invoices: {str(e)}"
+
+@app.tool()
+async def record_payment(invoice_id: int, amount: float, payment_date: str = None) -> str:
     """
     Records a payment for a specific invoice.
     
@@ -110,7 +178,7 @@ def record_payment(invoice_id: int, amount: float, payment_date: str = None) ->
     """
     try:
         # Get invoice details to identify journal and partner
-        invoice_data = execute_kw('account.move', 'read', [[invoice_id]], {'fields': ['journal_id', 'partner_id', 'name', 'currency_id']})
+        invoice_data = await execute_kw('account.move', 'read', [[invoice_id]], {'fields': ['journal_id', 'partner_id', 'name', 'currency_id']})
         if not invoice_data:
             return f"Invoice with ID {invoice_id} not found."
         
@@ -128,13 +196,176 @@ def record_payment(invoice_id: int, amount: float, payment_date: str = None) ->
             'ref': f"Payment for {invoice['name']}"
         }
         
-        payment_id = execute_kw('account.payment', 'create', [payment_vals])
-        execute_kw('account.payment', 'action_post', [[payment_id]])
+        payment_id = await execute_kw('account.payment', 'create', [payment_vals])
+        await execute_kw('account.payment', 'action_post', [[payment_id]])
         
         return f"Payment of {amount} recorded and posted for invoice {invoice_id}. Payment ID: {payment_id}"
     except Exception as e:
         return f"Error recording payment: {str(e)}"
 
+def chunked(items, size):
+    """Yields successive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+async def create_records(model, entries, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Creates records in multi-record `create` calls.
+    `entries` is a list of (result, vals) pairs; each result dict is updated
+    in place with the new record ID or an error. When Odoo rejects a batch,
+    its transaction is rolled back, so the batch is split in half and retried
+    until the failing records are isolated. A network error leaves the
+    outcome unknown, so those records are reported rather than retried.
+    Chunks are sent concurrently, up to the client's concurrency limit.
+    """
+    async def create_batch(batch):
+        try:
+            ids = await execute_kw(model, 'create', [[vals for _, vals in batch]])
+            ids = ids if isinstance(ids, list) else [ids]
+            for (result, _), record_id in zip(batch, ids):
+                result.update(ok=True, id=record_id)
+        except OdooError as e:
+            if len(batch) == 1:
+                batch[0][0].update(ok=False, error=str(e))
+            else:
+                middle = len(batch) // 2
+                await asyncio.gather(create_batch(batch[:middle]), create_batch(batch[middle:]))
+        except Exception as e:
+            for result, _ in batch:
+                result.update(ok=False, error=f"Outcome unknown, check Odoo before retrying: {str(e)}")
+
+    await asyncio.gather(*(create_batch(chunk) for chunk in chunked(entries, chunk_size)))
+
+def bulk_summary(results):
+    succeeded = sum(1 for result in results if result.get('ok'))
+    return json.dumps({
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results
+    }, indent=2)
+
+@app.tool()
+async def create_invoices_bulk(invoices: list, chunk_size: int = BULK_CHUNK_SIZE) -> str:
+    """
+    Creates many customer invoices using batched multi-record create calls.
+
+    Args:
+        invoices: A list of invoices, each a dict with 'partner_id' and 'invoice_line_ids'
+                  (Odoo command format, as for create_invoice) and optionally
+                  'invoice_date' (YYYY-MM-DD) and 'ref'.
+                  Example: [{'partner_id': 7, 'invoice_line_ids': [[0, 0, {'product_id': 1, 'quantity': 1, 'price_unit': 100}]]}]
+        chunk_size: Invoices per create call.
+
+    Returns a JSON summary with one result per input invoice, in order.
+    """
+    results = []
+    entries = []
+    for index, invoice in enumerate(invoices):
+        result = {'index': index}
+        results.append(result)
+        if not isinstance(invoice, dict) or 'partner_id' not in invoice or not invoice.get('invoice_line_ids'):
+            result.update(ok=False, error="Each invoice needs 'partner_id' and 'invoice_line_ids'")
+            continue
+        vals = {
+            'partner_id': invoice['partner_id'],
+            'move_type': 'out_invoice',
+            'invoice_line_ids': invoice['invoice_line_ids']
+        }
+        for optional in ('invoice_date', 'ref'):
+            if invoice.get(optional):
+                vals[optional] = invoice[optional]
+        entries.append((result, vals))
+
+    await create_records('account.move', entries, max(1, chunk_size))
+    for result in results:
+        if 'id' in result:
+            result['invoice_id'] = result.pop('id')
+    return bulk_summary(results)
+
+@app.tool()
+async def record_payments_bulk(payments: list, post: bool = True) -> str:
+    """
+    Records and posts payments for many invoices in a few batched calls:
+    one read for all invoices, multi-record creates, and one action_post.
+
+    Args:
+        payments: A list of dicts with 'invoice_id' and 'amount', and optionally
+                  'payment_date' (YYYY-MM-DD, defaults to today).
+        post: Whether to post the created payments.
+
+    Returns a JSON summary with one result per input payment, in order.
+    """
+    results = [{'index': index} for index in range(len(payments))]
+    invoice_ids = sorted({
+        payment['invoice_id'] for payment in payments
+        if isinstance(payment, dict) and isinstance(payment.get('invoice_id'), int)
+    })
+
+    try:
+        # Prefetch every invoice the batch refers to
+        invoices = await execute_kw('account.move', 'read', [invoice_ids], {
+            'fields': ['journal_id', 'partner_id', 'name', 'currency_id']
+        }) if invoice_ids else []
+    except Exception as e:
+        return f"Error reading invoices: {str(e)}"
+    invoices_by_id = {invoice['id']: invoice for invoice in invoices}
+
+    entries = []
+    today = datetime.date.today().isoformat()
+    for result, payment in zip(results, payments):
+        if not isinstance(payment, dict) or 'invoice_id' not in payment or 'amount' not in payment:
+            result.update(ok=False, error="Each payment needs 'invoice_id' and 'amount'")
+            continue
+        result['invoice_id'] = payment['invoice_id']
+        invoice = invoices_by_id.get(payment['invoice_id'])
+        if not invoice:
+            result.update(ok=False, error=f"Invoice with ID {payment['invoice_id']} not found.")
+            continue
+        entries.append((result, {
+            'payment_type': 'inbound',
+            'partner_type': 'customer',
+            'partner_id': invoice['partner_id'][0],
+            'amount': payment['amount'],
+            'journal_id': invoice['journal_id'][0],
+            'date': payment.get('payment_date') or today,
+            'ref': f"Payment for {invoice['name']}"
+        }))
+
+    await create_records('account.payment', entries)
+    created = [result for result, _ in entries if result.get('ok')]
+    for result in created:
+        result['payment_id'] = result.pop('id')
+
+    if post and created:
+        try:
+            await execute_kw('account.payment', 'action_post', [[result['payment_id'] for result in created]])
+            for result in created:
+                result['posted'] = True
+        except OdooError:
+            # One bad payment rolls back the whole post; post individually to find it
+            async def post_one(result):
+                try:
+                    await execute_kw('account.payment', 'action_post', [[result['payment_id']]])
+                    result['posted'] = True
+                except Exception as e:
+                    result.update(ok=False, posted=False, error=f"Created but not posted: {str(e)}")
+
+            await asyncio.gather(*(post_one(result) for result in created))
+        except Exception as e:
+            for result in created:
+                result.update(ok=False, posted=False, error=f"Created; posting outcome unknown: {str(e)}")
+
+    return bulk_summary(results)
+
+@app.tool()
+async def odoo_metrics() -> str:
+    """
+    Returns per-call Odoo latency statistics (calls, errors, avg/p50/p95/max ms)
+    and how many times the client has authenticated.
+    """
+    return json.dumps(client.metrics(), indent=2)
+
 if __name__ == "__main__":
     import uvicorn
     # Defaulting to 8001 to avoid conflict with business_mcp on 8000
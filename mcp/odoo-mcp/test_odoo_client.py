@@ -0,0 +1,110 @@
+"""
+Odoo client behaviour against the local JSON-RPC stand-in (fake_odoo.py).
+
+    python -m pytest mcp/odoo-mcp/test_odoo_client.py
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from odoo_client import AsyncOdooClient, OdooAuthError
+from fake_odoo import start_fake_odoo
+
+
+@pytest.fixture
+def odoo():
+    server = start_fake_odoo(partners=5, invoices=20)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **kwargs):
+    return AsyncOdooClient(server.url, "odoo", "admin", "admin", **kwargs)
+
+
+def run(client, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def test_uid_is_cached_across_calls(odoo):
+    client = make_client(odoo)
+
+    async def calls():
+        for _ in range(10):
+            await client.execute_kw("res.partner", "search_read", [[]], {"fields": ["name"]})
+
+    run(client, calls())
+    assert odoo.fake.calls["common.authenticate"] == 1
+    assert odoo.fake.calls["res.partner.search_read"] == 10
+    assert client.authentications == 1
+
+
+def test_reauthenticates_once_after_auth_error(odoo):
+    client = make_client(odoo)
+
+    async def calls():
+        await client.execute_kw("res.partner", "read", [[1]], {"fields": ["name"]})
+        # The server no longer accepts the cached uid, as after a session expiry
+        odoo.fake.uid = 7
+        return await client.execute_kw("res.partner", "read", [[1]], {"fields": ["name"]})
+
+    records = run(client, calls())
+    assert records == [{"id": 1, "name": "Partner 1"}]
+    assert client.authentications == 2
+    assert client._uid == 7
+    assert odoo.fake.calls["common.authenticate"] == 2
+
+
+def test_persistent_auth_error_is_raised_not_retried_forever(odoo):
+    odoo.fake.auth_error_rate = 1.0
+    client = make_client(odoo)
+
+    with pytest.raises(OdooAuthError):
+        run(client, client.execute_kw("res.partner", "read", [[1]], {"fields": ["name"]}))
+    # One call, one re-authentication, one retry
+    assert odoo.fake.calls["res.partner.read"] == 2
+    assert client.authentications == 2
+
+
+def test_wrong_credentials_fail_authentication(odoo):
+    client = AsyncOdooClient(odoo.url, "odoo", "admin", "wrong")
+
+    with pytest.raises(OdooAuthError):
+        run(client, client.execute_kw("res.partner", "read", [[1]], {"fields": ["name"]}))
+
+
+def test_sequential_calls_reuse_one_connection(odoo):
+    client = make_client(odoo)
+
+    async def calls():
+        for _ in range(20):
+            await client.execute_kw("account.move", "search_read", [[]], {"fields": ["name"], "limit": 5})
+
+    run(client, calls())
+    assert odoo.fake.stats["connections"] == 1
+
+
+def test_concurrent_calls_stay_within_the_pool(odoo):
+    odoo.fake.latency = 0.01
+    client = make_client(odoo, max_concurrency=4)
+
+    async def calls():
+        await asyncio.gather(*(
+            client.execute_kw("account.move", "search_read", [[]], {"fields": ["name"], "limit": 5})
+            for _ in range(40)
+        ))
+
+    run(client, calls())
+    assert odoo.fake.calls["account.move.search_read"] == 40
+    assert odoo.fake.stats["connections"] <= 4
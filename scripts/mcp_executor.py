@@ -5,6 +5,8 @@ import argparse
 import datetime
 import random # For simulating retry delays
 
+from social_scheduler import SocialScheduler, RateLimited
+
 # --- Configuration ---
 VAULT_ROOT = os.path.join(os.getcwd(), 'AI_Employee_Vault')
 LOGS_DIR = os.path.join(VAULT_ROOT, 'logs')
@@ -19,23 +21,24 @@ os.makedirs(NEED_APPROVAL_DIR, exist_ok=True)
 def log_action(message):
     timestamp = datetime.datetime.now().isoformat()
     with open(ACTIONS_LOG_FILE, 'a') as f:
-        f.write(f"[{timestamp}] {message}
-")
+        f.write(f"[{timestamp}] {message}\n")
     print(message) # Also print to console for immediate feedback
 
 # --- Retry Decorator ---
 def retry(max_attempts=3, delay_seconds=2, catch_exceptions=(Exception,)):
     def decorator(func):
         def wrapper(*args, **kwargs):
+            last_error = None
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
                 except catch_exceptions as e:
+                    last_error = e
                     log_action(f"WARNING: Attempt {attempt}/{max_attempts} failed for {func.__name__}: {e}")
                     if attempt < max_attempts:
                         time.sleep(delay_seconds + random.uniform(0, 1)) # Add some jitter
             log_action(f"ERROR: All {max_attempts} attempts failed for {func.__name__}.")
-            raise
+            raise last_error
         return wrapper
     return decorator
 
@@ -98,6 +101,8 @@ def main():
 
     # Arguments for post_linkedin
     parser.add_argument('--message', type=str, help="Message content for LinkedIn post.")
+    parser.add_argument('--max_wait', type=float, default=60,
+                        help="Longest wait in seconds for the LinkedIn rate limit before the post is queued instead.")
 
     args = parser.parse_args()
 
@@ -119,6 +124,16 @@ def main():
             if not args.message:
                 log_action("ERROR: Missing argument for post_linkedin: --message is required.")
                 sys.exit(1)
+            # Shares the LinkedIn rate limit with the Business MCP and the social post scheduler
+            scheduler = SocialScheduler()
+            try:
+                scheduler.acquire('linkedin', max_wait=args.max_wait)
+            except RateLimited as e:
+                post_id = scheduler.schedule('linkedin', args.message)
+                log_action(f"INFO: (Task ID: {args.task_id}) LinkedIn rate limit reached; post queued as "
+                           f"scheduled post ID {post_id}, due in about {e.retry_after:.0f}s.")
+                log_action(f"INFO: MCP Executor finished for Task ID: {args.task_id}")
+                return
             post_linkedin_message(args.message, args.task_id)
         else:
             log_action(f"ERROR: Unknown action: {args.action}")
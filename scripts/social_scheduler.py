@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+
+"""
+Social Post Scheduler for AI Employee System
+Coordinates outbound social posts across processes so bursts stay within
+platform rate limits instead of tripping 429s and retry storms.
+
+Every post needs a token from two buckets: one for the account it posts as
+and one for the whole platform. Bucket state lives in a small JSON file
+under flock, so the Business MCP, the social skills and the scheduler
+runner all draw from the same budget. Posts that cannot go out now, or that
+target a future time, wait in a priority queue in the same file; the `run`
+command posts them as soon as both their time and their buckets allow.
+
+    python scripts/social_scheduler.py schedule --platform linkedin --content "..." --at 2026-01-05T09:00
+    python scripts/social_scheduler.py run
+    python scripts/social_scheduler.py status
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import datetime
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_PATH = PROJECT_ROOT / "AI_Employee_Vault" / ".social_scheduler.json"
+
+# (posts, per seconds, burst) for each account, and for the whole app on the platform.
+# Override with SOCIAL_RATE_<PLATFORM> / SOCIAL_RATE_<PLATFORM>_PLATFORM="posts/seconds:burst".
+DEFAULT_LIMITS = {
+    "linkedin": {"account": (150, 86400, 5), "platform": (100, 60, 20)},
+    "facebook": {"account": (200, 3600, 10), "platform": (600, 3600, 50)},
+    "instagram": {"account": (25, 86400, 5), "platform": (200, 3600, 50)},
+}
+FALLBACK_LIMITS = {"account": (60, 3600, 5), "platform": (600, 3600, 50)}
+
+# Environment variable naming the account each platform posts as
+ACCOUNT_ENV = {
+    "linkedin": "LINKEDIN_ACCOUNT_ID",
+    "facebook": "FACEBOOK_PAGE_ID",
+    "instagram": "INSTAGRAM_ACCOUNT_ID",
+}
+
+MAX_ATTEMPTS = 3
+# A post still marked posting this long after it was claimed belongs to a
+# runner that died; it is queued again (or failed, if out of attempts)
+CLAIM_TIMEOUT = 600
+RETRY_BACKOFF = 60
+# Finished posts kept in the state file for `status`
+HISTORY_SIZE = 200
+
+
+class RateLimited(Exception):
+    """A post must wait `retry_after` seconds; raised by acquire() and by post functions on HTTP 429."""
+
+    def __init__(self, retry_after, message=None):
+        super().__init__(message or f"Rate limited; retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def default_account(platform):
+    return os.getenv(ACCOUNT_ENV.get(platform, ""), "") or "default"
+
+
+def parse_limit(value):
+    """'posts/seconds[:burst]' -> (posts, seconds, burst)"""
+    rate, _, burst = value.partition(":")
+    posts, _, seconds = rate.partition("/")
+    posts, seconds = float(posts), float(seconds or 1)
+    return posts, seconds, float(burst) if burst else max(1.0, posts)
+
+
+def limits_for(platform):
+    limits = dict(DEFAULT_LIMITS.get(platform, FALLBACK_LIMITS))
+    for scope, suffix in (("account", ""), ("platform", "_PLATFORM")):
+        override = os.getenv(f"SOCIAL_RATE_{platform.upper()}{suffix}")
+        if override:
+            try:
+                limits[scope] = parse_limit(override)
+            except ValueError:
+                print(f"Ignoring invalid SOCIAL_RATE_{platform.upper()}{suffix}={override!r}")
+    return limits
+
+
+def retry_after_seconds(response, default=60):
+    """Seconds to wait from a 429 response's Retry-After header"""
+    try:
+        return max(1.0, float(response.headers.get("Retry-After", default)))
+    except (TypeError, ValueError):
+        return float(default)
+
+
+class SocialScheduler:
+    """
+    Token buckets and the scheduled-post queue, persisted in one JSON file.
+    Every method takes the file lock for a few milliseconds; posting itself
+    happens outside the lock.
+
+    Buckets use reservations: taking a token may drive the balance negative,
+    and the caller waits until it would have refilled. Concurrent callers
+    therefore line up one refill interval apart rather than all retrying
+    at once.
+    """
+
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = Path(state_path)
+
+    @contextmanager
+    def _state(self):
+        """Load the state under an exclusive lock and write it back afterwards"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, "a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                raw = handle.read()
+                try:
+                    state = json.loads(raw) if raw.strip() else {}
+                except ValueError:
+                    print(f"Ignoring unreadable scheduler state {self.state_path}")
+                    state = {}
+                state.setdefault("buckets", {})
+                state.setdefault("queue", [])
+                state.setdefault("history", [])
+                state.setdefault("next_id", 1)
+                yield state
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    # --- Token buckets ---
+
+    @staticmethod
+    def _bucket_keys(platform, account):
+        return (("account", f"{platform}:{account}"), ("platform", platform))
+
+    @staticmethod
+    def _refill(state, key, limit, now):
+        posts, seconds, burst = limit
+        bucket = state["buckets"].setdefault(key, {"tokens": burst, "updated": now, "blocked_until": 0})
+        bucket["tokens"] = min(burst, bucket["tokens"] + (now - bucket["updated"]) * posts / seconds)
+        bucket["updated"] = now
+        return bucket
+
+    def _reserve(self, state, platform, account, now):
+        """Take a token from both buckets; returns seconds until the post may go out"""
+        limits = limits_for(platform)
+        wait = 0.0
+        for scope, key in self._bucket_keys(platform, account):
+            posts, seconds, _ = limits[scope]
+            bucket = self._refill(state, key, limits[scope], now)
+            bucket["tokens"] -= 1
+            if bucket["tokens"] < 0:
+                wait = max(wait, -bucket["tokens"] * seconds / posts)
+            wait = max(wait, bucket.get("blocked_until", 0) - now)
+        return wait
+
+    def _refund(self, state, platform, account, now):
+        limits = limits_for(platform)
+        for scope, key in self._bucket_keys(platform, account):
+            bucket = self._refill(state, key, limits[scope], now)
+            bucket["tokens"] = min(limits[scope][2], bucket["tokens"] + 1)
+
+    def reserve(self, platform, account=None):
+        """Reserve a slot; returns how many seconds to wait before posting (0 = post now)"""
+        with self._state() as state:
+            return self._reserve(state, platform, account or default_account(platform), time.time())
+
+    def refund(self, platform, account=None):
+        """Give back a reserved slot that will not be used"""
+        with self._state() as state:
+            self._refund(state, platform, account or default_account(platform), time.time())
+
+    def acquire(self, platform, account=None, max_wait=None):
+        """
+        Block until a post may go out. Raises RateLimited, without using the
+        slot, if that would take longer than `max_wait` seconds.
+        """
+        wait = self.reserve(platform, account)
+        if max_wait is not None and wait > max_wait:
+            self.refund(platform, account)
+            raise RateLimited(wait)
+        if wait > 0:
+            print(f"Rate limit: waiting {wait:.1f}s before posting to {platform}")
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, platform, account=None, retry_after=60):
+        """
+        Record a 429 from the platform: nothing posts to this account until
+        retry_after has passed, and its bucket is emptied so posting resumes
+        at the sustained rate rather than with a burst.
+        """
+        with self._state() as state:
+            now = time.time()
+            key = f"{platform}:{account or default_account(platform)}"
+            bucket = self._refill(state, key, limits_for(platform)["account"], now)
+            bucket["blocked_until"] = max(bucket.get("blocked_until", 0), now + retry_after)
+            bucket["tokens"] = min(bucket["tokens"], 0)
+
+    # --- Scheduled posts ---
+
+    def schedule(self, platform, content, account=None, at=None, priority=0, **extra):
+        """
+        Queue a post for `at` (a datetime or timestamp; default now). Among
+        due posts, higher priority goes first. Returns the post ID.
+        """
+        if isinstance(at, datetime.datetime):
+            at = at.timestamp()
+        with self._state() as state:
+            post_id = state["next_id"]
+            state["next_id"] += 1
+            state["queue"].append({
+                "id": post_id,
+                "platform": platform,
+                "account": account or default_account(platform),
+                "content": content,
+                "extra": extra,
+                "priority": priority,
+                "not_before": at or time.time(),
+                "attempts": 0,
+                "status": "queued",
+                "created_at": time.time(),
+            })
+        return post_id
+
+    def cancel(self, post_id):
+        """Remove a queued post; returns True if it was still queued"""
+        with self._state() as state:
+            for post in state["queue"]:
+                if post["id"] == post_id and post["status"] == "queued":
+                    state["queue"].remove(post)
+                    return True
+        return False
+
+    def claim_due(self, now=None):
+        """
+        Mark the posts that may go out now as posting and return them,
+        highest priority first. Due posts whose buckets are empty are moved
+        to the time their token refills, which spreads a burst out.
+        """
+        now = now or time.time()
+        claimed = []
+        with self._state() as state:
+            for post in list(state["queue"]):
+                if post["status"] == "posting" and post.get("claimed_at", 0) + CLAIM_TIMEOUT <= now:
+                    error = "Runner stopped while posting"
+                    if post["attempts"] < MAX_ATTEMPTS:
+                        post.update(status="queued", not_before=now, last_error=error)
+                    else:
+                        post.update(status="failed", finished_at=now, last_error=error)
+                        state["queue"].remove(post)
+                        state["history"] = (state["history"] + [post])[-HISTORY_SIZE:]
+            due = [post for post in state["queue"] if post["status"] == "queued" and post["not_before"] <= now]
+            for post in sorted(due, key=lambda p: (-p["priority"], p["not_before"], p["id"])):
+                wait = self._reserve(state, post["platform"], post["account"], now)
+                if wait > 0:
+                    self._refund(state, post["platform"], post["account"], now)
+                    post["not_before"] = now + wait
+                    continue
+                post["status"] = "posting"
+                post["claimed_at"] = now
+                post["attempts"] += 1
+                claimed.append(dict(post))
+        return claimed
+
+    def finish(self, post_id, result=None, error=None, retry_after=None):
+        """Record the outcome of a claimed post; retry_after requeues it"""
+        now = time.time()
+        with self._state() as state:
+            post = next((p for p in state["queue"] if p["id"] == post_id), None)
+            if post is None:
+                return
+            if retry_after is not None and post["attempts"] < MAX_ATTEMPTS:
+                post.update(status="queued", not_before=now + retry_after, last_error=error)
+                return
+            post.update(status="failed" if error else "posted", finished_at=now, result=result, last_error=error)
+            state["queue"].remove(post)
+            state["history"] = (state["history"] + [post])[-HISTORY_SIZE:]
+
+    def next_wakeup(self):
+        """Seconds until the next queued post is due, or None"""
+        with self._state() as state:
+            times = [post["not_before"] for post in state["queue"] if post["status"] == "queued"]
+        return max(0.0, min(times) - time.time()) if times else None
+
+    def status(self):
+        now = time.time()
+        with self._state() as state:
+            buckets = {}
+            for key, bucket in sorted(state["buckets"].items()):
+                platform = key.split(":", 1)[0]
+                scope = "account" if ":" in key else "platform"
+                self._refill(state, key, limits_for(platform)[scope], now)
+                buckets[key] = {
+                    "tokens": round(bucket["tokens"], 2),
+                    "blocked_for": round(max(0, bucket.get("blocked_until", 0) - now), 1),
+                }
+            return {
+                "buckets": buckets,
+                "queue": [{k: post[k] for k in ("id", "platform", "account", "priority", "status", "attempts")}
+                          | {"due_in": round(post["not_before"] - now, 1)}
+                          for post in sorted(state["queue"], key=lambda p: p["not_before"])],
+                "recent": [{k: post.get(k) for k in ("id", "platform", "status", "result", "last_error")}
+                           for post in state["history"][-10:]],
+            }
+
+    def run_due(self, handlers):
+        """Post everything that is due now; returns the number of posts attempted"""
+        posts = self.claim_due()
+        for post in posts:
+            handler = handlers.get(post["platform"])
+            if handler is None:
+                self.finish(post["id"], error=f"No handler for platform {post['platform']}")
+                continue
+            try:
+                result = handler(post)
+            except Exception as e:
+                # Matched by attribute: when this file runs as a script, the post
+                # functions raise the RateLimited of their own import of it
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None:
+                    self.penalize(post["platform"], post["account"], retry_after)
+                    self.finish(post["id"], error=str(e), retry_after=retry_after)
+                else:
+                    self.finish(post["id"], error=f"{type(e).__name__}: {e}",
+                                retry_after=RETRY_BACKOFF * 2 ** (post["attempts"] - 1))
+                continue
+            if isinstance(result, str) and result.startswith("Error"):
+                self.finish(post["id"], error=result)
+            else:
+                self.finish(post["id"], result=str(result))
+                print(f"Posted scheduled {post['platform']} post {post['id']}")
+        return len(posts)
+
+    def run(self, handlers=None, once=False, poll_interval=5.0):
+        """Post scheduled posts as they come due; polls so posts queued by other processes are picked up"""
+        handlers = handlers or default_handlers()
+        while True:
+            self.run_due(handlers)
+            if once:
+                return
+            wakeup = self.next_wakeup()
+            time.sleep(min(poll_interval, wakeup) if wakeup is not None else poll_interval)
+
+
+# --- Platform handlers for the runner ---
+
+def default_handlers():
+    """Post functions per platform. Each takes a queued post and returns a result string."""
+    sys.path.insert(0, str(PROJECT_ROOT / "claude" / "skills" / "social.meta" / "scripts"))
+    sys.path.insert(0, str(PROJECT_ROOT / "social-summary" / "scripts"))
+    import post_meta
+    import social_post
+    from log_social_post import write_entries
+
+    def logged(platform, post, result):
+        write_entries(
+            [{"platform": platform, "content": post["content"], "date": datetime.datetime.now().isoformat()}],
+            str(PROJECT_ROOT / "AI_Employee_Vault" / "Reports" / "Social_Log.md"),
+            str(PROJECT_ROOT / "AI_Employee_Vault" / "Reports" / "Social_Log.jsonl"),
+        )
+        return result
+
+    def post_linkedin(post):
+        from mcp_executor import post_linkedin_message
+        post_linkedin_message(post["content"], task_id=f"scheduled_post_{post['id']}")
+        return logged("LinkedIn", post, "LinkedIn post created.")
+
+    def post_facebook(post):
+        # Without Graph API credentials, fall back to the simulated poster
+        if os.getenv("FACEBOOK_PAGE_ID") and os.getenv("FACEBOOK_PAGE_ACCESS_TOKEN"):
+            result = post_meta.post_facebook(post["content"])
+        else:
+            result = social_post.post_facebook(post["content"])
+        return result if result.startswith("Error") else logged("Facebook", post, result)
+
+    def post_instagram(post):
+        image_url = post["extra"].get("image_url")
+        if os.getenv("INSTAGRAM_ACCOUNT_ID") and os.getenv("INSTAGRAM_ACCESS_TOKEN") and image_url:
+            result = post_meta.post_instagram(post["content"], image_url)
+        else:
+            result = social_post.post_instagram(post["content"])
+        return result if result.startswith("Error") else logged("Instagram", post, result)
+
+    return {"linkedin": post_linkedin, "facebook": post_facebook, "instagram": post_instagram}
+
+
+def parse_time(value):
+    """ISO date/time (local) -> timestamp"""
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rate-limited social post scheduler")
+    parser.add_argument("--state", default=str(STATE_PATH), help="Scheduler state file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    schedule = commands.add_parser("schedule", help="Queue a post")
+    schedule.add_argument("--platform", required=True, choices=sorted(DEFAULT_LIMITS), help="Target platform")
+    schedule.add_argument("--content", required=True, help="Post content")
+    schedule.add_argument("--account", help="Account to post as (default from the platform's env variable)")
+    schedule.add_argument("--at", help="Earliest time to post, ISO format (default now)")
+    schedule.add_argument("--priority", type=int, default=0, help="Higher priority posts go first")
+    schedule.add_argument("--image-url", help="Image URL (Instagram)")
+
+    run = commands.add_parser("run", help="Post queued posts as they come due")
+    run.add_argument("--once", action="store_true", help="Post what is due now and exit")
+    run.add_argument("--poll", type=float, default=5.0, help="Seconds between checks for new posts")
+
+    commands.add_parser("status", help="Show buckets and queued posts")
+
+    cancel = commands.add_parser("cancel", help="Remove a queued post")
+    cancel.add_argument("post_id", type=int)
+
+    args = parser.parse_args()
+    scheduler = SocialScheduler(args.state)
+
+    if args.command == "schedule":
+        extra = {"image_url": args.image_url} if args.image_url else {}
+        post_id = scheduler.schedule(args.platform, args.content, args.account,
+                                     at=parse_time(args.at) if args.at else None, priority=args.priority, **extra)
+        print(f"Scheduled {args.platform} post {post_id}")
+    elif args.command == "run":
+        try:
+            scheduler.run(once=args.once, poll_interval=args.poll)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "status":
+        print(json.dumps(scheduler.status(), indent=2))
+    elif args.command == "cancel":
+        print("Cancelled" if scheduler.cancel(args.post_id) else f"Post {args.post_id} is not queued")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,20 @@
 import os
 import sys
+import json
+import queue
+import atexit
 import datetime
+import threading
 
 SOCIAL_LOG_FILE = os.path.join("AI_Employee_Vault", "Reports", "Social_Log.md")
+# One JSON object per post, for tools that need the entries without parsing Markdown
+SOCIAL_JSONL_FILE = os.path.join("AI_Employee_Vault", "Reports", "Social_Log.jsonl")
 
-def log_social_post(platform: str, content: str, post_date: str):
+def format_entry(platform: str, content: str, post_date: str) -> str:
     """
-    Logs a social media post summary to a Markdown file.
-
-    Args:
-        platform: The social media platform (e.g., "LinkedIn", "X").
-        content: The content of the post.
-        post_date: The date and time of the post (ISO format recommended).
+    Formats one post as a Social_Log.md entry.
     """
-    # Ensure the Reports directory exists
-    os.makedirs(os.path.dirname(SOCIAL_LOG_FILE), exist_ok=True)
-
-    log_entry = f"""
+    return f"""
 ---
 Platform: {platform}
 Date: {post_date}
@@ -24,18 +22,124 @@ Content:
   {content}
 ---
 """
-    with open(SOCIAL_LOG_FILE, "a") as f:
-        f.write(log_entry)
-    
+
+def write_entries(entries, log_file=SOCIAL_LOG_FILE, jsonl_file=SOCIAL_JSONL_FILE):
+    """
+    Appends entries (dicts with platform, content and date) to the Markdown
+    log and the JSONL store, one write per file.
+    """
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("".join(format_entry(e["platform"], e["content"], e["date"]) for e in entries))
+    if jsonl_file:
+        os.makedirs(os.path.dirname(jsonl_file) or ".", exist_ok=True)
+        with open(jsonl_file, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+
+def log_social_post(platform: str, content: str, post_date: str):
+    """
+    Logs a social media post summary to a Markdown file.
+
+    Args:
+        platform: The social media platform (e.g., "LinkedIn", "X").
+        content: The content of the post.
+        post_date: The date and time of the post (ISO format recommended).
+    """
+    write_entries([{"platform": platform, "content": content, "date": post_date}])
     print(f"Social media post summary logged to {SOCIAL_LOG_FILE}")
 
+class SocialLogSink:
+    """
+    In-process social post logger. `log()` only enqueues the entry; a
+    background thread writes queued entries to the Markdown log and JSONL
+    store in batches. Entries still queued at interpreter exit are flushed.
+    """
+
+    def __init__(self, log_file=SOCIAL_LOG_FILE, jsonl_file=SOCIAL_JSONL_FILE,
+                 batch_size=100, max_queue=10000):
+        self.log_file = log_file
+        self.jsonl_file = jsonl_file
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        atexit.register(self.close)
+
+    def log(self, platform: str, content: str, post_date: str = None, **extra):
+        """
+        Queues a post for logging and returns immediately. If the queue is
+        full the entry is written synchronously rather than dropped.
+        """
+        entry = {"platform": platform, "content": content,
+                 "date": post_date or datetime.datetime.now().isoformat(), **extra}
+        self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._write([entry])
+
+    def flush(self):
+        """Blocks until every entry queued so far has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Writes the remaining entries and stops the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "written": self.written,
+                "failed": self.failed, "batches": self.batches}
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="social-log-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            # Whatever queued up while the last batch was being written goes out together
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            self._write([entry for entry in batch if entry is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, entries):
+        if not entries:
+            return
+        try:
+            write_entries(entries, self.log_file, self.jsonl_file)
+            self.written += len(entries)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(entries)
+            print(f"Error writing {len(entries)} social log entries: {e}")
+
 if __name__ == "__main__":
     if len(sys.argv) < 4:
         print("Usage: python log_social_post.py <platform> <content> <date>")
         sys.exit(1)
-    
+
     platform = sys.argv[1]
     content = sys.argv[2]
     post_date = sys.argv[3]
-    
+
     log_social_post(platform, content, post_date)
@@ -0,0 +1,114 @@
+"""
+Vault scanner collectors against temporary vault folders, logs and stores.
+
+    python -m pytest test_vault_scanner.py
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import vault_scanner
+from health_history import HealthHistoryStore
+from vault_scanner import BriefingManifest, briefing_window, read_communications, read_issues, read_tasks
+
+
+def make_vault(tmp_path, monkeypatch):
+    inbox = tmp_path / "Inbox"
+    done = tmp_path / "Done"
+    inbox.mkdir()
+    done.mkdir()
+    monkeypatch.setattr(vault_scanner, "TASK_FOLDERS", (str(done),))
+    return inbox, done
+
+
+def write_old_note(path, days_old):
+    path.write_text("# Task\n\nFinished.\n", encoding="utf-8")
+    old = time.time() - days_old * 86400
+    os.utime(path, (old, old))
+
+
+def test_old_file_moved_into_done_is_in_this_weeks_window(tmp_path, monkeypatch):
+    inbox, done = make_vault(tmp_path, monkeypatch)
+    write_old_note(inbox / "task_old.md", days_old=30)
+    os.rename(inbox / "task_old.md", done / "task_old.md")
+
+    since, until = briefing_window(now=datetime.datetime.now() + datetime.timedelta(minutes=1))
+    tasks = read_tasks(since, until, manifest=BriefingManifest(tmp_path / "manifest.json"))
+
+    assert [task.filename for task in tasks] == ["task_old.md"]
+    assert tasks[0].modified > since
+
+
+def test_first_seen_time_survives_later_runs_and_edits(tmp_path, monkeypatch):
+    inbox, done = make_vault(tmp_path, monkeypatch)
+    write_old_note(done / "task.md", days_old=30)
+    manifest_path = tmp_path / "manifest.json"
+
+    since, until = briefing_window(now=datetime.datetime.now() + datetime.timedelta(minutes=1))
+    first = read_tasks(since, until, manifest=BriefingManifest(manifest_path))
+
+    # Editing the note afterwards doesn't make it count as newly completed
+    (done / "task.md").write_text("# Task\n\nFinished, with notes.\n", encoding="utf-8")
+    second = read_tasks(since, until, manifest=BriefingManifest(manifest_path))
+
+    assert [task.modified for task in second] == [task.modified for task in first]
+    assert second[0].summary.endswith("with notes.\n")
+
+
+def test_communications_count_social_log_posts_and_sent_emails(tmp_path, monkeypatch):
+    now = datetime.datetime.now()
+    social_log = tmp_path / "Social_Log.jsonl"
+    with open(social_log, "w", encoding="utf-8") as f:
+        for days_ago in (1, 2, 20):
+            f.write(json.dumps({"platform": "LinkedIn", "content": f"Post {days_ago}",
+                                "date": (now - datetime.timedelta(days=days_ago)).isoformat()}) + "\n")
+    outbox = tmp_path / "outbox.db"
+    with sqlite3.connect(outbox) as conn:
+        conn.execute("CREATE TABLE outbox (recipient TEXT, subject TEXT, status TEXT, sent_at REAL)")
+        conn.executemany("INSERT INTO outbox VALUES (?, ?, ?, ?)", [
+            ("a@example.com", "Sent", "sent", time.time() - 3600),
+            ("b@example.com", "Old", "sent", time.time() - 30 * 86400),
+            ("c@example.com", "Waiting", "queued", None),
+        ])
+    conn.close()
+    monkeypatch.setattr(vault_scanner, "SOCIAL_LOG_PATH", social_log)
+    monkeypatch.setattr(vault_scanner, "EMAIL_OUTBOX_PATH", outbox)
+
+    communications = read_communications(*briefing_window(now=now))
+
+    assert communications.social_posts == 2
+    assert communications.emails_sent == 1
+    assert [line for _, kind, line in communications.entries] == [
+        "LinkedIn: Post 2", "LinkedIn: Post 1", "To a@example.com: Sent"
+    ]
+
+
+def test_issue_count_covers_every_error_and_failed_check(tmp_path, monkeypatch):
+    now = datetime.datetime.now()
+    error_log = tmp_path / "errors.log"
+    with open(error_log, "w", encoding="utf-8") as f:
+        for i in range(50):
+            stamp = (now - datetime.timedelta(minutes=60 - i)).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"{stamp} ERROR Connection refused on port {8000 + i}\n")
+        f.write(f"{now.strftime('%Y-%m-%d %H:%M:%S')} ERROR Disk full\n")
+    health_db = tmp_path / "health_history.db"
+    store = HealthHistoryStore(health_db)
+    for minutes_ago in (30, 20, 10):
+        store.record({
+            "timestamp": now - datetime.timedelta(minutes=minutes_ago),
+            "processes": {"gmail": {"name": "Gmail Watcher", "running": False}},
+        })
+    monkeypatch.setattr(vault_scanner, "ERROR_LOG_PATH", error_log)
+    monkeypatch.setattr(vault_scanner, "HEALTH_DB_PATH", health_db)
+
+    issues = read_issues(*briefing_window(now=now + datetime.timedelta(minutes=1)))
+
+    # Two error signatures and one process, but 51 errors and 3 failed checks
+    assert len(issues.lines) == 3
+    assert issues.count == 54
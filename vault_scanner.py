@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+
+"""
+Vault Scanner for AI Employee System
+Collects everything the briefings report on -- tasks, approvals,
+communications, financials and issues -- in one concurrent pass over the
+vault and returns it as a typed snapshot. The briefing generators only
+render that snapshot.
+"""
+
+import os
+import re
+import abc
+import json
+import html
+import sqlite3
+import time
+import bisect
+import datetime
+import threading
+from dataclasses import dataclass, field, asdict
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+from typing import Optional
+
+from financial_ledger import load_ledgers
+from health_history import HealthHistoryStore
+from log_tail import summarize_errors
+
+
+MANIFEST_PATH = Path("AI_Employee_Vault/.briefing_manifest.json")
+BUSINESS_LOG_PATH = Path("AI_Employee_Vault/logs/business.log")
+BUSINESS_LOG_ROLLUP_PATH = Path("AI_Employee_Vault/.business_log_rollup.json")
+SOCIAL_LOG_PATH = Path("AI_Employee_Vault/Reports/Social_Log.jsonl")
+# Same override as the Business MCP's email queue
+EMAIL_OUTBOX_PATH = Path(os.getenv("EMAIL_OUTBOX_DB", "AI_Employee_Vault/.email_outbox.db"))
+ERROR_LOG_PATH = Path("logs/errors.log")
+HEALTH_DB_PATH = Path("AI_Employee_Vault/logs/health_history.db")
+BRIEFING_WINDOW_DAYS = 7
+TASK_FOLDERS = ("AI_Employee_Vault/Done", "Bronze/Done")
+APPROVAL_FOLDER = "AI_Employee_Vault/Need_Approval"
+ACCOUNTING_PATHS = (
+    Path("AI_Employee_Vault/Accounting"),
+    Path("AI_Employee_Vault/Finance"),
+    Path("AI_Employee_Vault/Revenue")
+)
+# Emails/social posts listed per day in the communications section
+COMMUNICATION_ENTRIES_PER_DAY = 50
+# Upper bound on error log lines scanned, for logs without usable timestamps
+ISSUE_SCAN_MAX_LINES = 2_000_000
+# Seconds each collector may take before the briefing is written without it
+COLLECTOR_TIMEOUT = 60
+
+
+class BriefingManifest:
+    """
+    Persistent cache of per-file summaries for the briefing collectors.
+    Entries are keyed by file name and validated by (size, mtime_ns), so only
+    new or changed files are opened on each run. Each entry also records
+    when the file first showed up in its folder (first_seen_ns), since a
+    move into Done keeps the file's old mtime. Safe to share between
+    collector threads.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = Path(path)
+        self.folders = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                self.folders = json.loads(self.path.read_text(encoding='utf-8')).get('folders', {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable briefing manifest {self.path}: {e}")
+
+    def refresh(self, folder, summary_chars):
+        """
+        Sync the manifest with a folder and return its entries ordered by
+        the time they first appeared there. Unchanged files are served from
+        the manifest.
+        """
+        folder = Path(folder)
+        with self._lock:
+            cached = self.folders.get(str(folder), {})
+        current = {}
+        changed = False
+
+        if folder.exists():
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError as e:
+                        print(f"Error reading {entry.path}: {e}")
+                        continue
+
+                    previous = cached.get(entry.name)
+                    if (previous and previous['size'] == st.st_size and previous['mtime_ns'] == st.st_mtime_ns
+                            and previous['chars'] == summary_chars and 'first_seen_ns' in previous):
+                        current[entry.name] = previous
+                        continue
+
+                    if previous and 'first_seen_ns' in previous:
+                        first_seen_ns = previous['first_seen_ns']
+                    else:
+                        # A rename updates ctime, so this is no earlier than the move
+                        first_seen_ns = max(st.st_mtime_ns, st.st_ctime_ns)
+
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8', errors='ignore') as f:
+                            summary = f.read(summary_chars)
+                    except OSError as e:
+                        print(f"Error reading {entry.path}: {e}")
+                        continue
+                    current[entry.name] = {
+                        'size': st.st_size,
+                        'mtime_ns': st.st_mtime_ns,
+                        'first_seen_ns': first_seen_ns,
+                        'chars': summary_chars,
+                        'summary': summary
+                    }
+                    changed = True
+
+        with self._lock:
+            if changed or current.keys() != cached.keys():
+                self._dirty = True
+            self.folders[str(folder)] = current
+
+        # Time-ordered index over the folder
+        return sorted(
+            ({'filename': name, **info} for name, info in current.items()),
+            key=lambda item: (item['first_seen_ns'], item['filename'])
+        )
+
+    def save(self):
+        """Write the manifest back if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'folders': self.folders}), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+AMOUNT_PATTERN = re.compile(r'\$(\d+\.?\d*)')
+SOURCE_PATTERN = re.compile(r'(Payment|Revenue|Sale|Invoice) .* \$(\d+\.?\d*)')
+LINE_DATE_PATTERN = re.compile(r'^\[?(\d{4}-\d{2}-\d{2})')
+
+
+def to_cents(amount):
+    """Convert a decimal amount string to integer cents without float rounding"""
+    return int((Decimal(amount) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+class BusinessLogRollup:
+    """
+    Streaming, checkpointed parser for business.log.
+    Only lines appended since the last run are read; they are folded into
+    per-day aggregates (revenue, transactions and sources) that are
+    persisted next to a byte-offset checkpoint. The log's inode is kept
+    with the offset so rotation or truncation restarts from the beginning.
+    """
+
+    # Bump when the per-day aggregates change so the log is re-parsed once
+    VERSION = 4
+    _lock = threading.Lock()
+
+    def __init__(self, log_path=BUSINESS_LOG_PATH, rollup_path=BUSINESS_LOG_ROLLUP_PATH):
+        self.log_path = Path(log_path)
+        self.rollup_path = Path(rollup_path)
+        self.load()
+
+    def load(self):
+        self.state = {'version': self.VERSION, 'inode': None, 'offset': 0, 'days': {}}
+        if self.rollup_path.exists():
+            try:
+                state = json.loads(self.rollup_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable business log rollup {self.rollup_path}: {e}")
+                return
+            if state.get('version') == self.VERSION:
+                self.state.update(state)
+
+    def _day_bucket(self, day):
+        return self.state['days'].setdefault(day, {
+            'revenue_cents': 0,
+            'transactions': 0,
+            'lines': 0,
+            'sources': {}
+        })
+
+    def ingest_line(self, line, default_day):
+        """Fold one log line into the per-day aggregates"""
+        date_match = LINE_DATE_PATTERN.match(line)
+        bucket = self._day_bucket(date_match.group(1) if date_match else default_day)
+        bucket['lines'] += 1
+
+        amounts = AMOUNT_PATTERN.findall(line)
+        for amount in amounts:
+            bucket['revenue_cents'] += to_cents(amount)
+        bucket['transactions'] += len(amounts)
+
+        source_match = SOURCE_PATTERN.search(line)
+        if source_match:
+            source, amount = source_match.groups()
+            bucket['sources'][source] = bucket['sources'].get(source, 0) + to_cents(amount)
+
+    def update(self):
+        """Parse lines appended since the checkpoint and persist the new state"""
+        # Collectors may update concurrently; reload so each line is parsed once
+        with self._lock:
+            self.load()
+            self._update()
+
+    def _update(self):
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return
+
+        if st.st_ino != self.state['inode'] or st.st_size < self.state['offset']:
+            # New or rotated/truncated log: start from the beginning
+            self.state['inode'] = st.st_ino
+            self.state['offset'] = 0
+
+        if st.st_size == self.state['offset']:
+            return
+
+        # Lines without their own date are attributed to the day they were first seen
+        today = datetime.date.today().isoformat()
+        offset = self.state['offset']
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            for raw_line in f:
+                if not raw_line.endswith(b'\n'):
+                    # Partial line still being written; pick it up next run
+                    break
+                offset += len(raw_line)
+                self.ingest_line(raw_line.decode('utf-8', errors='ignore'), today)
+
+        self.state['offset'] = offset
+        self.save()
+
+    def save(self):
+        self.rollup_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.rollup_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.state), encoding='utf-8')
+        os.replace(tmp_path, self.rollup_path)
+
+    def totals(self, since=None, until=None):
+        """Sum the per-day aggregates for days within [since, until]"""
+        first_day = since.date().isoformat() if since else None
+        last_day = until.date().isoformat() if until else None
+
+        totals = {'revenue_cents': 0, 'transactions': 0, 'lines': 0, 'sources': {}}
+        for day, bucket in sorted(self.state['days'].items()):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            for key in ('revenue_cents', 'transactions', 'lines'):
+                totals[key] += bucket.get(key, 0)
+            for source, cents in bucket['sources'].items():
+                totals['sources'][source] = totals['sources'].get(source, 0) + cents
+        return totals
+
+
+def briefing_window(now=None, days=BRIEFING_WINDOW_DAYS):
+    """Return the (start, end) datetimes covered by the briefing"""
+    end = now or datetime.datetime.now()
+    return end - datetime.timedelta(days=days), end
+
+
+def select_window(entries, since=None, until=None):
+    """Slice a time-ordered list of manifest entries to [since, until]"""
+    keys = [entry['first_seen_ns'] for entry in entries]
+    start = bisect.bisect_left(keys, int(since.timestamp() * 1e9)) if since else 0
+    end = bisect.bisect_right(keys, int(until.timestamp() * 1e9)) if until else len(entries)
+    return entries[start:end]
+
+
+@dataclass
+class VaultItem:
+    """A note in one of the vault's task or approval folders"""
+    filename: str
+    folder: str
+    summary: str
+    size: int
+    modified: datetime.datetime
+
+
+@dataclass
+class Communications:
+    """Emails sent from the outbox and social posts logged within the window"""
+    emails_sent: int = 0
+    social_posts: int = 0
+    entries: list = field(default_factory=list)  # (day, kind, log line), oldest first
+
+
+@dataclass
+class Issues:
+    """Errors logged and health checks failed within the window"""
+    count: int = 0  # individual errors plus failed checks
+    lines: list = field(default_factory=list)  # grouped summaries for display
+
+
+@dataclass
+class Financials:
+    """Revenue and expenses within the window, in integer cents"""
+    revenue_cents: int = 0
+    expense_cents: int = 0
+    transaction_count: int = 0
+    revenue_sources: list = field(default_factory=list)  # (source, cents), largest first
+    expense_sources: list = field(default_factory=list)
+    data_source: Optional[str] = None
+
+    @property
+    def net_cents(self):
+        return self.revenue_cents - self.expense_cents
+
+
+@dataclass
+class VaultSnapshot:
+    """Everything the briefings report on, collected in one scan"""
+    window_start: datetime.datetime
+    window_end: datetime.datetime
+    tasks: list = field(default_factory=list)  # VaultItem, newest first
+    approvals: list = field(default_factory=list)  # VaultItem, oldest first
+    communications: Communications = field(default_factory=Communications)
+    financials: Financials = field(default_factory=Financials)
+    issues: Issues = field(default_factory=Issues)
+    warnings: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """Plain JSON-serializable form of the snapshot"""
+        def convert(value):
+            if isinstance(value, (datetime.datetime, datetime.date)):
+                return value.isoformat()
+            if isinstance(value, dict):
+                return {key: convert(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [convert(item) for item in value]
+            return value
+
+        data = convert(asdict(self))
+        data['financials']['net_cents'] = self.financials.net_cents
+        return data
+
+
+def to_vault_item(entry, folder):
+    """Convert a manifest entry into a VaultItem"""
+    return VaultItem(
+        filename=entry['filename'],
+        folder=str(folder),
+        summary=entry['summary'],
+        size=entry['size'],
+        modified=datetime.datetime.fromtimestamp(entry['first_seen_ns'] / 1e9)
+    )
+
+
+def read_tasks(since=None, until=None, manifest=None):
+    """Notes moved into any Done folder within [since, until], newest first"""
+    manifest = manifest or BriefingManifest()
+    tasks = []
+    for folder in TASK_FOLDERS:
+        entries = manifest.refresh(folder, summary_chars=500)  # First 500 chars for summary
+        tasks.extend(to_vault_item(entry, folder) for entry in select_window(entries, since, until))
+    manifest.save()
+    return sorted(tasks, key=lambda task: (task.modified, task.filename), reverse=True)
+
+
+def read_pending_approvals(manifest=None):
+    """Notes waiting in the Need_Approval folder, oldest first"""
+    manifest = manifest or BriefingManifest()
+    entries = manifest.refresh(APPROVAL_FOLDER, summary_chars=300)  # First 300 chars for summary
+    manifest.save()
+    return [to_vault_item(entry, APPROVAL_FOLDER) for entry in entries]
+
+
+def read_financials(since=None, until=None):
+    """Revenue and expenses from the ledgers, or from business.log when there are none"""
+    # Structured CSV/JSON ledgers are authoritative when they hold any rows
+    try:
+        ledger = load_ledgers(ACCOUNTING_PATHS)
+        if len(ledger):
+            summary = ledger.summary(since, until)
+            return Financials(
+                revenue_cents=summary['revenue_cents'],
+                expense_cents=summary['expense_cents'],
+                transaction_count=summary['transaction_count'],
+                revenue_sources=summary['top_revenue_sources'],
+                expense_sources=summary['top_expense_sources'],
+                data_source=f"{ledger.files_loaded} ledger file(s)"
+            )
+    except Exception as e:
+        print(f"Error reading ledgers: {e}")
+
+    # Otherwise fall back to the business log (only new lines are parsed)
+    rollup = BusinessLogRollup()
+    rollup.update()
+    totals = rollup.totals(since, until)
+    return Financials(
+        revenue_cents=totals['revenue_cents'],
+        transaction_count=totals['transactions'],
+        revenue_sources=sorted(totals['sources'].items(), key=lambda item: item[1], reverse=True),
+        data_source="business log"
+    )
+
+
+def read_social_posts(since=None, until=None):
+    """(time, line) for each post in the social log within [since, until]"""
+    posts = []
+    if not SOCIAL_LOG_PATH.exists():
+        return posts
+    with open(SOCIAL_LOG_PATH, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                posted = datetime.datetime.fromisoformat(entry['date'])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if posted.tzinfo is not None:
+                posted = posted.astimezone().replace(tzinfo=None)
+            if (since is None or posted >= since) and (until is None or posted <= until):
+                content = str(entry.get('content', '')).strip().split('\n')[0][:100]
+                posts.append((posted, f"{entry.get('platform', 'Social')}: {content}"))
+    return posts
+
+
+def read_sent_emails(since=None, until=None):
+    """(time, line) for each message the email outbox delivered within [since, until]"""
+    if not EMAIL_OUTBOX_PATH.exists():
+        return []
+    conn = sqlite3.connect(f"file:{EMAIL_OUTBOX_PATH}?mode=ro", uri=True, timeout=10)
+    try:
+        rows = conn.execute(
+            "SELECT sent_at, recipient, subject FROM outbox WHERE status = 'sent' AND sent_at >= ? AND sent_at <= ?"
+            " ORDER BY sent_at",
+            (since.timestamp() if since else 0, until.timestamp() if until else time.time())
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(datetime.datetime.fromtimestamp(sent_at), f"To {recipient}: {subject}") for sent_at, recipient, subject in rows]
+
+
+def read_communications(since=None, until=None):
+    """Emails sent through the outbox and posts in the social log within [since, until]"""
+    activity = {}
+    for kind, reader in (('email', read_sent_emails), ('social', read_social_posts)):
+        try:
+            activity[kind] = reader(since, until)
+        except Exception as e:
+            print(f"Error reading {kind} activity: {e}")
+            activity[kind] = []
+
+    # Listing: oldest first, capped per day
+    entries, per_day = [], {}
+    for moment, kind, line in sorted(
+            ((moment, kind, line) for kind, items in activity.items() for moment, line in items),
+            key=lambda item: item[0]):
+        day = moment.date().isoformat()
+        per_day[day] = per_day.get(day, 0) + 1
+        if per_day[day] <= COMMUNICATION_ENTRIES_PER_DAY:
+            entries.append((day, kind, line))
+
+    return Communications(
+        emails_sent=len(activity['email']),
+        social_posts=len(activity['social']),
+        entries=entries
+    )
+
+
+def read_issues(since=None, until=None):
+    """Summarize errors and health check failures within the briefing window"""
+    if since is None:
+        since, until = briefing_window()
+    issues = Issues()
+
+    # Error log: read backwards from EOF, stopping once entries predate the window
+    if ERROR_LOG_PATH.exists():
+        try:
+            total, groups = summarize_errors(ERROR_LOG_PATH, since, until, max_lines=ISSUE_SCAN_MAX_LINES)
+            issues.count += total
+            for signature, count, last_seen in groups[:10]:
+                issues.lines.append(f"Error ({count}x, last {last_seen.strftime('%Y-%m-%d %H:%M')}): {signature}")
+            if len(groups) > 10:
+                issues.lines.append(f"...and {sum(count for _, count, _ in groups[10:])} more errors of {len(groups) - 10} other kinds")
+        except Exception as e:
+            print(f"Error reading error log: {e}")
+
+    # Health history: failed checks per process from the watchdog's store
+    if HEALTH_DB_PATH.exists():
+        try:
+            store = HealthHistoryStore(HEALTH_DB_PATH)
+            for failure in store.failures(since.timestamp(), until.timestamp() if until else None):
+                issues.count += failure['failed_checks']
+                details = []
+                if failure['down_checks']:
+                    details.append(f"down in {failure['down_checks']} checks")
+                if failure['probe_failures']:
+                    details.append(f"{failure['probe_failures']} failed probes")
+                issues.lines.append(f"Health: {failure['name']} {', '.join(details)} (last {failure['last_failure'][:16]})")
+        except Exception as e:
+            print(f"Error reading health history: {e}")
+
+    return issues
+
+
+class Collector(abc.ABC):
+    """
+    A snapshot data source. Subclasses set `name` (the snapshot field it
+    fills), implement collect(since, until), and override empty() when the
+    value used on failure is not an empty list.
+    """
+
+    name = "source"
+    timeout = COLLECTOR_TIMEOUT
+
+    def empty(self):
+        return []
+
+    @abc.abstractmethod
+    def collect(self, since, until):
+        """Return this source's data for [since, until]"""
+
+
+class TasksCollector(Collector):
+    name = "tasks"
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+
+    def collect(self, since, until):
+        return read_tasks(since, until, manifest=self.manifest)
+
+
+class ApprovalsCollector(Collector):
+    name = "approvals"
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+
+    def collect(self, since, until):
+        return read_pending_approvals(manifest=self.manifest)
+
+
+class FinancialsCollector(Collector):
+    name = "financials"
+
+    def empty(self):
+        return Financials()
+
+    def collect(self, since, until):
+        return read_financials(since, until)
+
+
+class CommunicationsCollector(Collector):
+    name = "communications"
+
+    def empty(self):
+        return Communications()
+
+    def collect(self, since, until):
+        return read_communications(since, until)
+
+
+class IssuesCollector(Collector):
+    name = "issues"
+
+    def empty(self):
+        return Issues()
+
+    def collect(self, since, until):
+        return read_issues(since, until)
+
+
+def run_collectors(collectors, since, until):
+    """
+    Run collectors concurrently, each bounded by its own timeout.
+    Returns (results, timings, warnings): results maps collector name to
+    its data (or its empty value if it failed or timed out), timings maps
+    name to seconds taken, and warnings lists the sources left out.
+    """
+    results, timings, warnings = {}, {}, []
+    # name -> (data, seconds) or exception; filled in by the collector threads
+    outcomes = {}
+
+    def timed(collector):
+        started = time.perf_counter()
+        try:
+            outcomes[collector.name] = (collector.collect(since, until), time.perf_counter() - started)
+        except Exception as e:
+            outcomes[collector.name] = e
+
+    # Daemon threads rather than an executor: concurrent.futures joins its
+    # workers at exit, so a hung collector would still hold up the process
+    started = time.monotonic()
+    threads = []
+    for collector in collectors:
+        thread = threading.Thread(target=timed, args=(collector,), name=f"briefing-{collector.name}", daemon=True)
+        thread.start()
+        threads.append((collector, thread))
+
+    for collector, thread in threads:
+        thread.join(max(0, collector.timeout - (time.monotonic() - started)))
+        outcome = outcomes.get(collector.name)
+        if thread.is_alive() or outcome is None:
+            warnings.append(f"{collector.name}: timed out after {collector.timeout}s, data omitted")
+            results[collector.name] = collector.empty()
+        elif isinstance(outcome, Exception):
+            warnings.append(f"{collector.name}: failed ({outcome}), data omitted")
+            results[collector.name] = collector.empty()
+        else:
+            results[collector.name], timings[collector.name] = outcome
+
+    return results, timings, warnings
+
+
+def scan_vault(since=None, until=None, manifest=None):
+    """
+    Collect a VaultSnapshot for [since, until] (default: the briefing
+    window). Sources are read concurrently; a failing source leaves its
+    field empty and adds a warning instead of failing the scan.
+    """
+    if since is None:
+        since, until = briefing_window()
+    manifest = manifest or BriefingManifest()
+    collectors = [
+        TasksCollector(manifest),
+        ApprovalsCollector(manifest),
+        FinancialsCollector(),
+        CommunicationsCollector(),
+        IssuesCollector()
+    ]
+    results, timings, warnings = run_collectors(collectors, since, until)
+    return VaultSnapshot(window_start=since, window_end=until, warnings=warnings, timings=timings, **results)
+
+
+def markdown_to_html(markdown, title):
+    """
+    Render the Markdown subset the briefings use (headings, lists, tables,
+    bold/italic/code spans, rules) as a standalone HTML page.
+    """
+    def inline(text):
+        text = html.escape(text)
+        text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+        text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
+        return re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
+
+    body = []
+    open_list = False
+    table_rows = []
+
+    def flush():
+        nonlocal open_list, table_rows
+        if open_list:
+            body.append("</ul>")
+            open_list = False
+        if table_rows:
+            header, *rows = table_rows
+            body.append("<table>")
+            body.append("<tr>" + "".join(f"<th>{inline(cell)}</th>" for cell in header) + "</tr>")
+            for row in rows:
+                body.append("<tr>" + "".join(f"<td>{inline(cell)}</td>" for cell in row) + "</tr>")
+            body.append("</table>")
+            table_rows = []
+
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("|") and stripped.endswith("|"):
+            cells = [cell.strip() for cell in stripped.strip("|").split("|")]
+            if not all(re.fullmatch(r':?-+:?', cell) for cell in cells):
+                table_rows.append(cells)
+            continue
+        if stripped.startswith(("- ", "* ")):
+            if table_rows:
+                flush()
+            if not open_list:
+                body.append("<ul>")
+                open_list = True
+            body.append(f"<li>{inline(stripped[2:])}</li>")
+            continue
+
+        flush()
+        heading = re.match(r'(#{1,6})\s+(.*)', stripped)
+        if heading:
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{inline(heading.group(2))}</h{level}>")
+        elif re.fullmatch(r'[=\-]{3,}', stripped):
+            body.append("<hr>")
+        elif stripped:
+            body.append(f"<p>{inline(stripped)}</p>")
+    flush()
+
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n"
+        "<style>body{font-family:sans-serif;max-width:60em;margin:2em auto}"
+        "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:.2em .6em}</style>\n"
+        "</head>\n<body>\n" + "\n".join(body) + "\n</body>\n</html>\n"
+    )
+
+
+def render_output(markdown, snapshot, output_format, title, extra=None):
+    """
+    Produce the final document for a generator: its Markdown as-is, the
+    same content as HTML, or the snapshot (plus `extra` fields) as JSON.
+    """
+    if output_format == "json":
+        data = snapshot.to_dict()
+        data.update(extra or {})
+        return json.dumps(data, indent=2)
+    if output_format == "html":
+        return markdown_to_html(markdown, title)
+    return markdown
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scan the vault and print the briefing snapshot as JSON')
+    parser.add_argument('--days', type=int, default=BRIEFING_WINDOW_DAYS, help='Window length in days')
+    args = parser.parse_args()
+
+    snapshot = scan_vault(*briefing_window(days=args.days))
+    print(json.dumps(snapshot.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,41 +9,808 @@ import os
 import sys
 import time
 import datetime
+import json
+import math
+import signal
+import asyncio
+import selectors
+import threading
 import subprocess
+import collections
 import psutil
 import logging
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from health_history import HealthHistoryStore
+
+
+class SystemStatsSampler:
+    """
+    Samples CPU, memory, disk and load on a background thread into a
+    fixed-size ring buffer, so health checks can read window averages and
+    peaks without blocking.
+    """
+
+    def __init__(self, interval=5.0, window=300.0, disk_path='/'):
+        self.interval = interval
+        self.window = window
+        self.disk_path = disk_path
+        self.samples = collections.deque(maxlen=max(1, math.ceil(window / interval)))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def take_sample(self):
+        """Take one non-blocking sample and append it to the ring buffer"""
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        try:
+            load = os.getloadavg()
+        except (AttributeError, OSError):
+            load = (0.0, 0.0, 0.0)
+
+        sample = {
+            "time": time.time(),
+            "cpu_percent": sum(per_core) / len(per_core) if per_core else 0.0,
+            "per_core_percent": per_core,
+            "memory_percent": memory.percent,
+            "disk_percent": (disk.used / disk.total) * 100,
+            "load_avg": load
+        }
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def _run(self):
+        # cpu_percent(interval=None) measures since the previous call, so the
+        # first call only primes the counters
+        psutil.cpu_percent(interval=None, percpu=True)
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.take_sample()
+            except Exception:
+                # Keep sampling; a single failed sample just leaves a gap
+                pass
+
+    def start(self):
+        """Start the background sampling thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="SystemStatsSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background sampling thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def summary(self):
+        """Averages and peaks over the buffered window, or None if nothing was sampled yet"""
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return None
+
+        def avg(key):
+            return sum(sample[key] for sample in samples) / len(samples)
+
+        def peak(key):
+            return max(sample[key] for sample in samples)
+
+        cores = len(samples[-1]["per_core_percent"])
+        core_samples = [sample["per_core_percent"] for sample in samples if len(sample["per_core_percent"]) == cores]
+        per_core = [sum(values[i] for values in core_samples) / len(core_samples) for i in range(cores)]
+
+        return {
+            "cpu_percent": avg("cpu_percent"),
+            "cpu_peak": peak("cpu_percent"),
+            "memory_percent": avg("memory_percent"),
+            "memory_peak": peak("memory_percent"),
+            "disk_percent": samples[-1]["disk_percent"],
+            "disk_peak": peak("disk_percent"),
+            "load_avg": samples[-1]["load_avg"],
+            "per_core_percent": per_core,
+            "sample_count": len(samples),
+            "window_seconds": samples[-1]["time"] - samples[0]["time"],
+            "timestamp": datetime.datetime.fromtimestamp(samples[-1]["time"]).isoformat()
+        }
+
+
+def parse_size(value):
+    """Parse a pm2-style size such as '512M' or '1G' into bytes"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    value = str(value).strip().upper()
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+class ResourceTelemetry:
+    """
+    Per-process resource samples (RSS, CPU time, threads, open files, I/O)
+    kept in a bounded in-memory time series per monitored process.
+    """
+
+    def __init__(self, max_samples=720):
+        self.series = collections.defaultdict(lambda: collections.deque(maxlen=max_samples))
+        self.restarts = collections.Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def collect(pid):
+        """Read resource usage for one PID with a single oneshot() pass"""
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            cpu_times = proc.cpu_times()
+            sample = {
+                "time": time.time(),
+                "pid": pid,
+                "rss_bytes": proc.memory_info().rss,
+                "cpu_seconds": cpu_times.user + cpu_times.system,
+                "threads": proc.num_threads(),
+                "open_fds": None,
+                "io_read_bytes": None,
+                "io_write_bytes": None,
+            }
+            try:
+                sample["open_fds"] = proc.num_fds()
+            except (AttributeError, psutil.AccessDenied):
+                pass
+            try:
+                io = proc.io_counters()
+                sample["io_read_bytes"] = io.read_bytes
+                sample["io_write_bytes"] = io.write_bytes
+            except (AttributeError, psutil.AccessDenied):
+                pass
+        return sample
+
+    def record(self, process_name, sample):
+        with self._lock:
+            self.series[process_name].append(sample)
+
+    def record_restart(self, process_name):
+        with self._lock:
+            self.restarts[process_name] += 1
+
+    def latest(self, process_name):
+        with self._lock:
+            series = self.series.get(process_name)
+            return series[-1] if series else None
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps({
+                "series": {name: list(samples) for name, samples in self.series.items()},
+                "restarts": dict(self.restarts)
+            })
+
+    def to_prometheus(self, processes, status=None, system_stats=None, probes=None):
+        """Render the latest samples in Prometheus text exposition format"""
+        gauges = (
+            ("rss_bytes", "watchdog_process_resident_memory_bytes", "gauge"),
+            ("cpu_seconds", "watchdog_process_cpu_seconds_total", "counter"),
+            ("threads", "watchdog_process_threads", "gauge"),
+            ("open_fds", "watchdog_process_open_fds", "gauge"),
+            ("io_read_bytes", "watchdog_process_io_read_bytes_total", "counter"),
+            ("io_write_bytes", "watchdog_process_io_write_bytes_total", "counter"),
+        )
+        with self._lock:
+            latest = {name: series[-1] for name, series in self.series.items() if series}
+            restarts = dict(self.restarts)
+
+        lines = ["# TYPE watchdog_process_up gauge"]
+        for name in processes:
+            up = 1 if status and status.get(name, {}).get("running") else 0
+            lines.append(f'watchdog_process_up{{process="{name}"}} {up}')
+
+        for key, metric, metric_type in gauges:
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, sample in sorted(latest.items()):
+                if sample.get(key) is not None:
+                    lines.append(f'{metric}{{process="{name}"}} {sample[key]}')
+
+        lines.append("# TYPE watchdog_process_restarts_total counter")
+        for name in processes:
+            lines.append(f'watchdog_process_restarts_total{{process="{name}"}} {restarts.get(name, 0)}')
+
+        if probes:
+            lines.append("# TYPE watchdog_probe_success gauge")
+            for name, result in sorted(probes.items()):
+                lines.append(f'watchdog_probe_success{{process="{name}"}} {1 if result["ok"] else 0}')
+            lines.append("# TYPE watchdog_probe_latency_seconds summary")
+            for name, result in sorted(probes.items()):
+                for quantile in ("p50", "p95", "p99"):
+                    if result.get(quantile) is not None:
+                        lines.append(
+                            f'watchdog_probe_latency_seconds{{process="{name}",quantile="0.{quantile[1:]}"}} {result[quantile]}'
+                        )
+            lines.append("# TYPE watchdog_probe_consecutive_failures gauge")
+            for name, result in sorted(probes.items()):
+                lines.append(f'watchdog_probe_consecutive_failures{{process="{name}"}} {result["consecutive_failures"]}')
+
+        if system_stats:
+            for key in ("cpu_percent", "memory_percent", "disk_percent"):
+                lines.append(f"# TYPE watchdog_system_{key} gauge")
+                lines.append(f"watchdog_system_{key} {system_stats[key]}")
+
+        return "\n".join(lines) + "\n"
+
+
+class ProbeRunner:
+    """
+    Active liveness probes for monitored services: a TCP connect, an HTTP
+    request, or an MCP tools/list call. Probes run concurrently on asyncio,
+    each with its own timeout; latency history and consecutive failures are
+    tracked per process.
+    """
+
+    def __init__(self, history_size=500):
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=history_size))
+        self.consecutive_failures = collections.Counter()
+        self.last_results = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    async def _http_request(host, port, method, path, headers=None, body=b""):
+        """Minimal HTTP/1.1 request over asyncio streams; returns (status, headers, body)"""
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            request_headers = {
+                "Host": f"{host}:{port}",
+                "Connection": "close",
+                "Content-Length": str(len(body)),
+            }
+            request_headers.update(headers or {})
+            head = f"{method} {path} HTTP/1.1\r\n" + "".join(
+                f"{name}: {value}\r\n" for name, value in request_headers.items()
+            ) + "\r\n"
+            writer.write(head.encode("latin-1") + body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            parts = status_line.decode("latin-1").split()
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise ConnectionError(f"Invalid HTTP response: {status_line[:80]!r}")
+            status = int(parts[1])
+
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+            if "content-length" in response_headers:
+                response_body = await reader.readexactly(int(response_headers["content-length"]))
+            else:
+                response_body = await reader.read()
+            return status, response_headers, response_body
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _probe_tcp(self, config):
+        reader, writer = await asyncio.open_connection(config.get("host", "127.0.0.1"), config["port"])
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    async def _probe_http(self, config):
+        status, _, _ = await self._http_request(
+            config.get("host", "127.0.0.1"), config["port"], "GET", config.get("path", "/")
+        )
+        expected = config.get("expect_status")
+        if (expected and status != expected) or (not expected and not 200 <= status < 400):
+            raise ConnectionError(f"HTTP {status}")
+
+    async def _probe_mcp(self, config):
+        """Initialize a streamable HTTP MCP session and list its tools"""
+        host, port, path = config.get("host", "127.0.0.1"), config["port"], config.get("path", "/mcp")
+        headers = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+
+        initialize = {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-03-26",
+                "capabilities": {},
+                "clientInfo": {"name": "ai-employee-watchdog", "version": "1.0"}
+            }
+        }
+        status, response_headers, body = await self._http_request(
+            host, port, "POST", path, headers, json.dumps(initialize).encode("utf-8")
+        )
+        if status != 200:
+            raise ConnectionError(f"MCP initialize returned HTTP {status}")
+
+        session_id = response_headers.get("mcp-session-id")
+        if session_id:
+            headers["Mcp-Session-Id"] = session_id
+        notification = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+        await self._http_request(host, port, "POST", path, headers, json.dumps(notification).encode("utf-8"))
+
+        list_tools = {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}}
+        status, _, body = await self._http_request(
+            host, port, "POST", path, headers, json.dumps(list_tools).encode("utf-8")
+        )
+        if status != 200 or b'"tools"' not in body:
+            raise ConnectionError(f"MCP tools/list failed (HTTP {status})")
+
+    async def _run_probe(self, process_name, config):
+        probe = {"tcp": self._probe_tcp, "http": self._probe_http, "mcp": self._probe_mcp}[config.get("type", "tcp")]
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(config), timeout=config.get("timeout", 2.0))
+            return process_name, {"ok": True, "latency": time.perf_counter() - started, "error": None}
+        except asyncio.TimeoutError:
+            return process_name, {"ok": False, "latency": None, "error": f"timed out after {config.get('timeout', 2.0)}s"}
+        except Exception as e:
+            return process_name, {"ok": False, "latency": None, "error": str(e) or type(e).__name__}
+
+    async def _run_all(self, targets):
+        return await asyncio.gather(*(self._run_probe(name, config) for name, config in targets.items()))
+
+    def run(self, targets):
+        """Probe every target concurrently; targets maps process name -> probe config"""
+        if not targets:
+            return {}
+
+        results = dict(asyncio.run(self._run_all(targets)))
+        with self._lock:
+            for process_name, result in results.items():
+                if result["ok"]:
+                    self.latencies[process_name].append(result["latency"])
+                    self.consecutive_failures[process_name] = 0
+                else:
+                    self.consecutive_failures[process_name] += 1
+                result["consecutive_failures"] = self.consecutive_failures[process_name]
+                result.update(self._percentiles(self.latencies[process_name]))
+                self.last_results[process_name] = result
+        return results
+
+    def reset(self, process_name):
+        """Forget consecutive failures, e.g. after the process was restarted"""
+        with self._lock:
+            self.consecutive_failures[process_name] = 0
+
+    @staticmethod
+    def _percentiles(latencies):
+        if not latencies:
+            return {"p50": None, "p95": None, "p99": None}
+        ordered = sorted(latencies)
+
+        def pick(q):
+            return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(result) for name, result in self.last_results.items()}
+
+
+class MetricsServer:
+    """Serves /metrics (Prometheus text) and /telemetry (JSON time series) on a background thread"""
+
+    def __init__(self, monitor, host="127.0.0.1", port=9101):
+        self.monitor = monitor
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        monitor = self.monitor
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    last = monitor.last_status_report or {}
+                    body = monitor.telemetry.to_prometheus(
+                        monitor.processes, last.get("processes"), last.get("system_stats"),
+                        monitor.probes.snapshot()
+                    )
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/telemetry":
+                    body = monitor.telemetry.to_json()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        except OSError as e:
+            # Monitoring must keep running without the endpoint (e.g. port already taken)
+            self.monitor.logger.error(f"Error starting metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+        thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        thread.start()
+        self.monitor.logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class ProcessSupervisor:
+    """
+    Event-driven supervision of the monitored processes.
+    Keeps the Popen handle of every child, wakes up on child exit through a
+    pidfd (or SIGCHLD where pidfds are unavailable), restarts with
+    exponential backoff, suspends restarts for a cool-down period when a
+    process exceeds its restart budget, and captures child output into
+    rotating per-process logs.
+    """
+
+    def __init__(self, monitor, backoff_initial=1.0, backoff_max=60.0, restart_budget=5,
+                 budget_window=300.0, stable_after=30.0, log_max_bytes=5*1024*1024, log_backup_count=5,
+                 crash_loop_cooldown=600.0):
+        self.monitor = monitor
+        self.logger = monitor.logger
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.restart_budget = restart_budget
+        self.budget_window = budget_window
+        self.stable_after = stable_after
+        self.crash_loop_cooldown = crash_loop_cooldown
+        self.log_max_bytes = log_max_bytes
+        self.log_backup_count = log_backup_count
+
+        self.output_path = monitor.logs_path / "processes"
+        self.output_path.mkdir(parents=True, exist_ok=True)
+
+        self.selector = selectors.DefaultSelector()
+        self.use_pidfd = hasattr(os, "pidfd_open")
+        self.states = {
+            name: {
+                "state": "stopped",
+                "backoff": backoff_initial,
+                "next_start": None,
+                "started_at": None,
+                "restarts": collections.deque(),
+                "exit_code": None,
+                "pidfd": None,
+            }
+            for name in monitor.processes
+        }
+        self._output_loggers = {}
+        self._partial_lines = {}
+        self._stopping = False
+
+        # Self-pipe used for SIGCHLD and shutdown wakeups
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, ("wakeup", None))
+
+    def manages(self, process_name):
+        """True if the supervisor owns restarts for this process right now"""
+        return self.states[process_name]["state"] in ("running", "backoff", "crash_loop")
+
+    def state_of(self, process_name):
+        return self.states[process_name]["state"]
+
+    def _output_logger(self, process_name, stream):
+        key = (process_name, stream)
+        if key not in self._output_loggers:
+            logger = logging.getLogger(f"SystemHealthMonitor.{process_name}.{stream}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(
+                self.output_path / f"{process_name}.{stream}.log",
+                maxBytes=self.log_max_bytes,
+                backupCount=self.log_backup_count
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            logger.addHandler(handler)
+            self._output_loggers[key] = logger
+        return self._output_loggers[key]
+
+    def spawn(self, process_name):
+        """Start a supervised child with captured output"""
+        process_info = self.monitor.processes[process_name]
+        state = self.states[process_name]
+        command = process_info["command"]
+
+        try:
+            child = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except Exception as e:
+            self.logger.error(f"Failed to start {process_info['name']}: {e}")
+            self._schedule_restart(process_name)
+            return False
+
+        for stream, pipe in (("out", child.stdout), ("err", child.stderr)):
+            os.set_blocking(pipe.fileno(), False)
+            self._partial_lines[(process_name, stream)] = b""
+            self.selector.register(pipe, selectors.EVENT_READ, (stream, process_name))
+
+        if self.use_pidfd:
+            try:
+                state["pidfd"] = os.pidfd_open(child.pid)
+                self.selector.register(state["pidfd"], selectors.EVENT_READ, ("exit", process_name))
+            except OSError:
+                # Kernel without pidfd support: rely on SIGCHLD instead
+                self.use_pidfd = False
+                self._install_sigchld_handler()
+
+        self.monitor.children[process_name] = child
+        self.monitor.known_pids[process_name] = child.pid
+        self.monitor.save_known_pids()
+
+        state["state"] = "running"
+        state["started_at"] = time.monotonic()
+        state["next_start"] = None
+        self.logger.info(f"Started {process_info['name']} under supervision (PID: {child.pid}, Process: {command})")
+        return True
+
+    def _read_output(self, pipe, stream, process_name):
+        key = (process_name, stream)
+        try:
+            data = os.read(pipe.fileno(), 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+
+        logger = self._output_logger(process_name, stream)
+        if not data:
+            # EOF: flush any trailing partial line and stop watching the pipe
+            if self._partial_lines.get(key):
+                logger.info(self._partial_lines[key].decode("utf-8", errors="replace"))
+            self._partial_lines.pop(key, None)
+            self.selector.unregister(pipe)
+            pipe.close()
+            return
+
+        lines = (self._partial_lines.get(key, b"") + data).split(b"\n")
+        self._partial_lines[key] = lines.pop()
+        for line in lines:
+            logger.info(line.decode("utf-8", errors="replace").rstrip("\r"))
+
+    def _close_pidfd(self, state):
+        if state["pidfd"] is not None:
+            try:
+                self.selector.unregister(state["pidfd"])
+            except (KeyError, ValueError):
+                pass
+            os.close(state["pidfd"])
+            state["pidfd"] = None
+
+    def handle_exit(self, process_name):
+        """React to a child exit: record it and schedule a restart or declare a crash loop"""
+        state = self.states[process_name]
+        child = self.monitor.children.get(process_name)
+        if state["state"] != "running" or child is None:
+            return
+        exit_code = child.poll()
+        if exit_code is None:
+            return
+
+        self._close_pidfd(state)
+        del self.monitor.children[process_name]
+        state["exit_code"] = exit_code
+        process_info = self.monitor.processes[process_name]
+
+        uptime = time.monotonic() - state["started_at"]
+        if uptime >= self.stable_after:
+            state["backoff"] = self.backoff_initial
+
+        self.logger.warning(f"{process_info['name']} exited with code {exit_code} after {uptime:.1f}s")
+        if not self._stopping:
+            self._schedule_restart(process_name)
+
+    def _schedule_restart(self, process_name):
+        state = self.states[process_name]
+        process_info = self.monitor.processes[process_name]
+        now = time.monotonic()
+
+        restarts = state["restarts"]
+        while restarts and now - restarts[0] > self.budget_window:
+            restarts.popleft()
+        if len(restarts) >= self.restart_budget:
+            state["state"] = "crash_loop"
+            state["next_start"] = now + self.crash_loop_cooldown
+            self.logger.error(
+                f"{process_info['name']} is crash-looping ({len(restarts)} restarts in "
+                f"{self.budget_window:.0f}s); restarts suspended for {self.crash_loop_cooldown:.0f}s"
+            )
+            return
+
+        restarts.append(now)
+        state["state"] = "backoff"
+        state["next_start"] = now + state["backoff"]
+        self.logger.info(f"Restarting {process_info['name']} in {state['backoff']:.1f}s")
+        state["backoff"] = min(state["backoff"] * 2, self.backoff_max)
+
+    def reap(self):
+        """Process any child exits not yet delivered through the selector"""
+        for process_name in list(self.monitor.children):
+            self.handle_exit(process_name)
+
+    def _install_sigchld_handler(self):
+        signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+        try:
+            os.write(self._wakeup_w, b"\0")
+        except OSError:
+            pass
+
+    def start_all(self):
+        """Spawn every monitored process that is not already running"""
+        for process_name, process_info in self.monitor.processes.items():
+            pid = self.monitor.find_process_pid(process_name)
+            if pid is not None and process_name not in self.monitor.children:
+                # Started outside the supervisor; the periodic check keeps an eye on it
+                self.states[process_name]["state"] = "external"
+                self.logger.info(f"{process_info['name']} already running (PID: {pid}); not supervised")
+                continue
+            self.spawn(process_name)
+
+    def stop_all(self, timeout=5.0):
+        """Terminate supervised children"""
+        for process_name, child in list(self.monitor.children.items()):
+            if child.poll() is None:
+                child.terminate()
+        deadline = time.monotonic() + timeout
+        for process_name, child in list(self.monitor.children.items()):
+            try:
+                child.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                child.kill()
+                child.wait()
+            self.states[process_name]["state"] = "stopped"
+            self._close_pidfd(self.states[process_name])
+        self.monitor.children.clear()
+
+    def run(self, interval=300):
+        """Supervise children until stopped, running a health check every interval"""
+        if not self.use_pidfd:
+            self._install_sigchld_handler()
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        self.start_all()
+        next_check = time.monotonic()
+
+        while not self._stopping:
+            now = time.monotonic()
+            if now >= next_check:
+                try:
+                    self.monitor.run_once()
+                except Exception as e:
+                    self.logger.error(f"Error in monitoring loop: {e}")
+                next_check = now + interval
+
+            for process_name, state in self.states.items():
+                if state["state"] == "crash_loop" and state["next_start"] <= now:
+                    # Cool-down over: try again with a fresh budget and the initial backoff
+                    self.logger.info(f"{self.monitor.processes[process_name]['name']}: crash-loop cool-down over, restarting")
+                    state["state"] = "backoff"
+                    state["backoff"] = self.backoff_initial
+                    state["restarts"].clear()
+                if state["state"] == "backoff" and state["next_start"] <= now:
+                    self.monitor.telemetry.record_restart(process_name)
+                    self.spawn(process_name)
+
+            deadlines = [next_check] + [
+                state["next_start"] for state in self.states.values() if state["state"] in ("backoff", "crash_loop")
+            ]
+            timeout = max(0.0, min(deadlines) - time.monotonic())
+
+            for key, _ in self.selector.select(timeout):
+                kind, process_name = key.data
+                if kind == "wakeup":
+                    try:
+                        while os.read(self._wakeup_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    self.reap()
+                elif kind == "exit":
+                    self.handle_exit(process_name)
+                else:
+                    self._read_output(key.fileobj, kind, process_name)
+
+        self.logger.info("Supervisor stopping; terminating children")
+        self.stop_all()
 
 
 class SystemHealthMonitor:
-    def __init__(self, vault_path="AI_Employee_Vault"):
+    def __init__(self, vault_path="AI_Employee_Vault", sampler=None, retention_days=30, include_odoo_mcp=False):
         self.vault_path = Path(vault_path)
         self.logs_path = self.vault_path / "logs"
         self.health_log_path = self.logs_path / "system_health.md"
         self.status_log_path = self.logs_path / "system_status.log"
+        self.pid_file_path = self.logs_path / "watchdog_pids.json"
 
         # Create logs directory if it doesn't exist
         self.logs_path.mkdir(parents=True, exist_ok=True)
 
+        # Structured health history; system_health.md shows the latest entries
+        self.history = HealthHistoryStore(self.logs_path / "health_history.db", retention_days=retention_days)
+        self.report_history_limit = 10
+
         # Define the processes to monitor
+        # "pattern" is matched against whole command-line arguments (or their
+        # trailing path components), not as a loose substring of the command line.
+        # Optional "max_memory_restart" (e.g. "1G", as in ecosystem.config.js) and
+        # "max_open_files" restart a process that exceeds them; none are set by default.
+        # Optional "probe" actively checks liveness: {"type": "tcp" | "http" | "mcp",
+        # "port", "host", "path", "timeout", "failure_threshold"}; the process is
+        # restarted after failure_threshold consecutive failed probes.
         self.processes = {
             "ai_employee_mcp_server": {
                 "command": [sys.executable, "mcp/business_mcp/server.py"],
-                "pattern": "server.py",
-                "name": "Business MCP Server"
+                "pattern": "mcp/business_mcp/server.py",
+                "name": "Business MCP Server",
+                "probe": {"type": "tcp", "port": 8000, "timeout": 2.0, "failure_threshold": 3}
             },
             "ai_employee_file_watcher": {
                 "command": [sys.executable, "Bronze/file_watcher.py"],
-                "pattern": "file_watcher.py",
+                "pattern": "Bronze/file_watcher.py",
                 "name": "File Watcher"
             },
             "ai_employee_scheduler": {
                 "command": [sys.executable, "scripts/run_ai_employee", "daemon", "--interval", "300"],
-                "pattern": "run_ai_employee",
+                "pattern": "scripts/run_ai_employee",
                 "name": "AI Employee Scheduler"
             }
         }
+        if include_odoo_mcp:
+            # Opt-in (--odoo-mcp): the Odoo MCP is usually started on demand by the MCP client
+            self.processes["ai_employee_odoo_mcp"] = {
+                "command": [sys.executable, "mcp/odoo-mcp/server.py"],
+                "pattern": "mcp/odoo-mcp/server.py",
+                "name": "Odoo MCP Server",
+                "probe": {"type": "tcp", "port": 8001, "timeout": 2.0, "failure_threshold": 3}
+            }
+
+        # Children spawned by this watchdog (Popen handles) and the last known
+        # PID of every monitored process, persisted so `once` runs can verify
+        # them directly instead of scanning the process table
+        self.children = {}
+        self.known_pids = self.load_known_pids()
+
+        # Pattern -> PIDs index, built lazily by a single process table scan per cycle
+        self._process_index = None
+
+        # Optional background sampler; without one, stats are sampled on demand
+        self.sampler = sampler
+
+        # Set when running under ProcessSupervisor, which then owns restarts
+        self.supervisor = None
+
+        # Per-process resource time series, served by MetricsServer
+        self.telemetry = ResourceTelemetry()
+        self.last_status_report = None
+
+        # Active liveness probes and their latency history
+        self.probes = ProbeRunner()
 
         # Set up logging
         self.setup_logging()
@@ -71,21 +838,126 @@ class SystemHealthMonitor:
         # Prevent duplicate logs
         self.logger.propagate = False
 
+    @staticmethod
+    def cmdline_matches(cmdline, pattern):
+        """Check whether any command-line argument is, or ends with, the pattern path"""
+        pattern = os.path.normpath(pattern)
+        suffix = os.sep + pattern
+        for arg in cmdline:
+            arg = os.path.normpath(arg)
+            if arg == pattern or arg.endswith(suffix):
+                return True
+        return False
+
+    def build_process_index(self):
+        """Scan the process table once and map every monitored pattern to matching PIDs"""
+        patterns = {info["pattern"] for info in self.processes.values()}
+        index = {pattern: [] for pattern in patterns}
+        own_pid = os.getpid()
+
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    if proc.pid == own_pid or proc.status() == psutil.STATUS_ZOMBIE:
+                        continue
+                    cmdline = proc.cmdline()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if not cmdline:
+                continue
+            for pattern in patterns:
+                if self.cmdline_matches(cmdline, pattern):
+                    index[pattern].append(proc.pid)
+
+        self._process_index = index
+        return index
+
+    def get_process_index(self):
+        """Return this cycle's process index, scanning the process table on first use"""
+        if self._process_index is None:
+            self.build_process_index()
+        return self._process_index
+
     def find_process_by_pattern(self, pattern):
         """Find a process by command pattern"""
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        pids = self.get_process_index().get(pattern)
+        if pids is None:
+            # Pattern not monitored: fall back to a direct scan
+            for proc in psutil.process_iter(['pid', 'cmdline']):
+                try:
+                    if proc.info['cmdline'] and self.cmdline_matches(proc.info['cmdline'], pattern):
+                        return proc
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+            return None
+
+        for pid in pids:
             try:
-                if pattern in ' '.join(proc.info['cmdline']):
-                    return proc
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+                return psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                continue
+        return None
+
+    def load_known_pids(self):
+        """Load the PIDs recorded for monitored processes"""
+        try:
+            return {name: int(pid) for name, pid in json.loads(self.pid_file_path.read_text()).items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def save_known_pids(self):
+        """Persist the PIDs recorded for monitored processes"""
+        try:
+            self.pid_file_path.write_text(json.dumps(self.known_pids))
+        except OSError as e:
+            self.logger.error(f"Error saving watchdog PID file: {e}")
+
+    def verify_pid(self, pid, pattern):
+        """Check in O(1) that a PID is alive and still runs the expected command"""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                if proc.status() == psutil.STATUS_ZOMBIE:
+                    return False
+                return self.cmdline_matches(proc.cmdline(), pattern)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return False
+
+    def find_process_pid(self, process_name):
+        """
+        Return the PID of a monitored process, or None if it is not running.
+        Children we spawned and previously seen PIDs are checked directly;
+        the process table is only scanned when both are stale.
+        """
+        pattern = self.processes[process_name]["pattern"]
+
+        child = self.children.get(process_name)
+        if child is not None:
+            if child.poll() is None:
+                return child.pid
+            # Child exited; poll() has reaped it
+            if self.supervisor is not None:
+                self.supervisor.handle_exit(process_name)
+            else:
+                del self.children[process_name]
+
+        pid = self.known_pids.get(process_name)
+        if pid is not None and self.verify_pid(pid, pattern):
+            return pid
+
+        pids = self.get_process_index().get(pattern, [])
+        if pids:
+            self.known_pids[process_name] = pids[0]
+            self.save_known_pids()
+            return pids[0]
+
+        if self.known_pids.pop(process_name, None) is not None:
+            self.save_known_pids()
         return None
 
     def is_process_running(self, process_name):
         """Check if a process is running"""
-        process_info = self.processes[process_name]
-        pattern = process_info["pattern"]
-        return self.find_process_by_pattern(pattern) is not None
+        return self.find_process_pid(process_name) is not None
 
     def start_process(self, process_name):
         """Start a process"""
@@ -94,8 +966,11 @@ class SystemHealthMonitor:
 
         try:
             # Start the process in the background
-            subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.logger.info(f"Started {process_info['name']} (Process: {command})")
+            child = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.children[process_name] = child
+            self.known_pids[process_name] = child.pid
+            self.save_known_pids()
+            self.logger.info(f"Started {process_info['name']} (PID: {child.pid}, Process: {command})")
             return True
         except Exception as e:
             self.logger.error(f"Failed to start {process_info['name']}: {e}")
@@ -105,12 +980,64 @@ class SystemHealthMonitor:
         """Restart a process"""
         process_info = self.processes[process_name]
         self.logger.info(f"Restarting {process_info['name']}")
+        self.telemetry.record_restart(process_name)
 
         # Try to start the process
+        if self.supervisor is not None:
+            return self.supervisor.spawn(process_name)
         return self.start_process(process_name)
 
+    def collect_process_telemetry(self, process_name, pid):
+        """Sample resource usage for a running process and record it"""
+        try:
+            sample = self.telemetry.collect(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+            self.logger.warning(f"Could not collect telemetry for {self.processes[process_name]['name']}: {e}")
+            return None
+        self.telemetry.record(process_name, sample)
+        return sample
+
+    def threshold_exceeded(self, process_name, sample):
+        """Return a description of the first resource threshold the sample exceeds, if any"""
+        process_info = self.processes[process_name]
+        max_memory = parse_size(process_info.get("max_memory_restart"))
+        if max_memory and sample["rss_bytes"] > max_memory:
+            return f"RSS {sample['rss_bytes'] / 1024**2:.0f} MB exceeds {process_info['max_memory_restart']}"
+        max_fds = process_info.get("max_open_files")
+        if max_fds and sample["open_fds"] is not None and sample["open_fds"] > max_fds:
+            return f"{sample['open_fds']} open files exceed {max_fds}"
+        return None
+
+    def terminate_process(self, process_name, pid, timeout=5.0):
+        """Terminate a monitored process, escalating to SIGKILL after the timeout"""
+        child = self.children.get(process_name)
+        if child is not None and child.pid == pid:
+            child.terminate()
+            try:
+                child.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                child.kill()
+                child.wait()
+            return
+
+        try:
+            proc = psutil.Process(pid)
+            proc.terminate()
+            try:
+                proc.wait(timeout=timeout)
+            except psutil.TimeoutExpired:
+                proc.kill()
+                proc.wait(timeout=timeout)
+        except psutil.NoSuchProcess:
+            pass
+
     def get_system_stats(self):
         """Get system statistics"""
+        if self.sampler is not None:
+            summary = self.sampler.summary()
+            if summary is not None:
+                return summary
+
         try:
             cpu_percent = psutil.cpu_percent(interval=1)
             memory = psutil.virtual_memory()
@@ -128,20 +1055,46 @@ class SystemHealthMonitor:
 
     def check_all_processes(self):
         """Check the status of all monitored processes"""
+        # Invalidate last cycle's process index; it is rebuilt at most once, on demand
+        self._process_index = None
+
+        if self.supervisor is not None:
+            self.supervisor.reap()
+
         status_report = {
             "timestamp": datetime.datetime.now(),
             "processes": {},
             "system_stats": self.get_system_stats(),
             "actions_taken": []
         }
+        probe_targets = {}
 
         for process_name, process_info in self.processes.items():
-            is_running = self.is_process_running(process_name)
+            pid = self.find_process_pid(process_name)
+            is_running = pid is not None
             status_report["processes"][process_name] = {
                 "name": process_info["name"],
-                "running": is_running
+                "running": is_running,
+                "pid": pid
             }
 
+            if self.supervisor is not None:
+                state = self.supervisor.state_of(process_name)
+                status_report["processes"][process_name]["state"] = state
+                if not is_running and state in ("backoff", "crash_loop"):
+                    # Supervisor is already handling this process
+                    self.logger.warning(f"{process_info['name']} is not running (supervisor state: {state})")
+                    continue
+
+            if is_running:
+                sample = self.collect_process_telemetry(process_name, pid)
+                if sample is not None:
+                    status_report["processes"][process_name]["resources"] = sample
+                    reason = self.threshold_exceeded(process_name, sample)
+                    if reason:
+                        self.restart_unhealthy(process_name, pid, reason, status_report)
+                        continue
+
             if not is_running:
                 self.logger.warning(f"{process_info['name']} is not running. Attempting to restart...")
                 success = self.restart_process(process_name)
@@ -153,62 +1106,51 @@ class SystemHealthMonitor:
                     self.logger.error(f"Failed to restart {process_info['name']}")
             else:
                 self.logger.info(f"{process_info['name']} is running")
+                if "probe" in process_info:
+                    probe_targets[process_name] = process_info["probe"]
+
+        # Probe all running services concurrently
+        for process_name, result in self.probes.run(probe_targets).items():
+            process_info = self.processes[process_name]
+            status_report["processes"][process_name]["probe"] = result
+            if result["ok"]:
+                continue
+
+            failures = result["consecutive_failures"]
+            threshold = process_info["probe"].get("failure_threshold", 3)
+            self.logger.warning(
+                f"{process_info['name']} probe failed ({failures}/{threshold}): {result['error']}"
+            )
+            if failures >= threshold:
+                pid = status_report["processes"][process_name]["pid"]
+                self.restart_unhealthy(process_name, pid, f"{failures} consecutive probe failures", status_report)
+                self.probes.reset(process_name)
 
         return status_report
 
+    def restart_unhealthy(self, process_name, pid, reason, status_report):
+        """Terminate a running but unhealthy process and start it again"""
+        process_info = self.processes[process_name]
+        self.logger.warning(f"{process_info['name']}: {reason}. Restarting...")
+        self.terminate_process(process_name, pid)
+        if self.supervisor is not None and self.supervisor.manages(process_name):
+            # The supervisor sees the exit and restarts it with backoff
+            self.supervisor.handle_exit(process_name)
+            success = True
+        else:
+            success = self.restart_process(process_name)
+        outcome = "Restarted" if success else "Failed to restart"
+        status_report["actions_taken"].append(f"{outcome} {process_info['name']} ({reason})")
+        return success
+
     def write_health_report(self, status_report):
-        """Write health report to system_health.md"""
+        """Record the health check and re-render system_health.md from recent history"""
         try:
-            # Read existing content if it exists
-            if self.health_log_path.exists():
-                existing_content = self.health_log_path.read_text()
-            else:
-                existing_content = "# System Health Report\n\n"
-
-            # Create new report section
-            timestamp = status_report["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-
-            new_report = f"\n## Health Check - {timestamp}\n\n"
-
-            # Add process status
-            new_report += "### Process Status\n\n"
-            for process_name, info in status_report["processes"].items():
-                status = "✅ Running" if info["running"] else "❌ Stopped"
-                new_report += f"- **{info['name']}**: {status}\n"
-
-            # Add system stats if available
-            if status_report["system_stats"]:
-                stats = status_report["system_stats"]
-                new_report += f"\n### System Stats\n\n"
-                new_report += f"- CPU Usage: {stats['cpu_percent']:.1f}%\n"
-                new_report += f"- Memory Usage: {stats['memory_percent']:.1f}%\n"
-                new_report += f"- Disk Usage: {stats['disk_percent']:.1f}%\n"
-
-            # Add actions taken
-            if status_report["actions_taken"]:
-                new_report += f"\n### Actions Taken\n\n"
-                for action in status_report["actions_taken"]:
-                    new_report += f"- {action}\n"
-
-            new_report += "\n" + "-"*50 + "\n"  # Separator
-
-            # Write combined content (keep recent entries, limit size)
-            combined_content = existing_content + new_report
-
-            # Keep only recent entries to prevent file from growing too large
-            lines = combined_content.split('\n')
-            if len(lines) > 200:  # Keep only last ~200 lines
-                # Find the last 5 health check sections
-                check_indices = []
-                for i, line in enumerate(lines):
-                    if line.startswith('## Health Check -'):
-                        check_indices.append(i)
-
-                if len(check_indices) > 10:  # Keep last 10 checks
-                    start_idx = check_indices[-10]
-                    combined_content = '# System Health Report\n\n' + '\n'.join(lines[start_idx:])
-
-            self.health_log_path.write_text(combined_content)
+            self.history.record(status_report)
+
+            # The Markdown view only ever holds the latest entries, so it is
+            # rendered from the store instead of being read back and trimmed
+            self.health_log_path.write_text(self.history.render_markdown(self.report_history_limit))
             self.logger.info("Health report written to system_health.md")
 
         except Exception as e:
@@ -223,6 +1165,7 @@ class SystemHealthMonitor:
 
         # Write report
         self.write_health_report(status_report)
+        self.last_status_report = status_report
 
         self.logger.info("Health check completed")
         return status_report
@@ -231,6 +1174,9 @@ class SystemHealthMonitor:
         """Run the health check in daemon mode"""
         self.logger.info(f"Starting system health monitoring daemon (interval: {interval}s)")
 
+        if self.sampler is not None:
+            self.sampler.start()
+
         while True:
             try:
                 self.run_once()
@@ -247,17 +1193,63 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='System Health Monitor for AI Employee')
-    parser.add_argument('mode', choices=['once', 'daemon'], help='Run mode: once or daemon')
+    parser.add_argument('mode', choices=['once', 'daemon', 'supervise'],
+                        help='Run mode: once, daemon, or supervise (daemon that owns and restarts its children)')
     parser.add_argument('--interval', type=int, default=300, help='Interval in seconds for daemon mode (default: 300)')
+    parser.add_argument('--metrics-port', type=int, default=9101,
+                        help='Daemon/supervise mode: port for the local /metrics endpoint, 0 to disable (default: 9101)')
+    parser.add_argument('--restart-budget', type=int, default=5,
+                        help='Supervise mode: restarts allowed per budget window before a crash loop is declared (default: 5)')
+    parser.add_argument('--budget-window', type=float, default=300.0,
+                        help='Supervise mode: restart budget window in seconds (default: 300)')
+    parser.add_argument('--crash-loop-cooldown', type=float, default=600.0,
+                        help='Supervise mode: seconds restarts stay suspended after a crash loop (default: 600)')
+    parser.add_argument('--odoo-mcp', action='store_true',
+                        help='Also monitor and restart the Odoo MCP server')
+    parser.add_argument('--backoff-max', type=float, default=60.0,
+                        help='Supervise mode: maximum restart backoff in seconds (default: 60)')
+    parser.add_argument('--retention-days', type=int, default=30,
+                        help='Days of health history kept in health_history.db (default: 30)')
+    parser.add_argument('--sample-interval', type=float, default=5.0,
+                        help='Seconds between background system stats samples in daemon mode (default: 5)')
+    parser.add_argument('--sample-window', type=float, default=None,
+                        help='Seconds of samples kept for averages and peaks (default: the check interval)')
 
     args = parser.parse_args()
 
-    monitor = SystemHealthMonitor()
+    sampler = None
+    if args.mode in ('daemon', 'supervise'):
+        window = args.sample_window if args.sample_window else args.interval
+        sampler = SystemStatsSampler(interval=args.sample_interval, window=window)
+
+    monitor = SystemHealthMonitor(sampler=sampler, retention_days=args.retention_days,
+                                  include_odoo_mcp=args.odoo_mcp)
+
+    metrics_server = None
+    if args.mode in ('daemon', 'supervise') and args.metrics_port:
+        metrics_server = MetricsServer(monitor, port=args.metrics_port)
+        metrics_server.start()
 
     if args.mode == 'once':
         monitor.run_once()
     elif args.mode == 'daemon':
         monitor.run_daemon(args.interval)
+    elif args.mode == 'supervise':
+        supervisor = ProcessSupervisor(
+            monitor,
+            backoff_max=args.backoff_max,
+            restart_budget=args.restart_budget,
+            budget_window=args.budget_window,
+            crash_loop_cooldown=args.crash_loop_cooldown
+        )
+        monitor.supervisor = supervisor
+        if sampler is not None:
+            sampler.start()
+        monitor.logger.info(f"Starting process supervisor (check interval: {args.interval}s)")
+        supervisor.run(args.interval)
+
+    if metrics_server is not None:
+        metrics_server.stop()
 
 
 if __name__ == "__main__":